@@ -0,0 +1,70 @@
+"""Compare a delta copy with a full copy when a large file changes a little.
+
+Usage: python benchmarks/bench_delta.py [size_mb] [changes]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.delta import delta_copy
+
+
+def make_files(root, size_mb, changes, insert=False, seed=1):
+    """An old image plus a new one with a few scattered 4 KiB rewrites (and optionally an insertion)"""
+    rng = random.Random(seed)
+    old = os.path.join(root, "old.img")
+    new = os.path.join(root, "new.img")
+    with open(old, "wb") as f:
+        for _ in range(size_mb):
+            f.write(rng.randbytes(1024 * 1024))
+    shutil.copyfile(old, new)
+    with open(new, "r+b") as f:
+        for _ in range(changes):
+            f.seek(rng.randrange(size_mb * 1024 * 1024 - 4096))
+            f.write(rng.randbytes(4096))
+    if insert:
+        with open(new, "rb") as f:
+            data = f.read()
+        cut = len(data) // 2
+        with open(new, "wb") as f:
+            f.write(data[:cut] + rng.randbytes(777) + data[cut:])
+    return old, new
+
+
+def run(label, root, size_mb, changes, insert):
+    old, new = make_files(root, size_mb, changes, insert)
+    full = os.path.join(root, "full.img")
+    shutil.copyfile(old, full)
+    start = time.perf_counter()
+    shutil.copyfile(new, full)
+    full_time = time.perf_counter() - start
+
+    for in_place in (True, False):
+        target = os.path.join(root, "target.img")
+        shutil.copyfile(old, target)
+        start = time.perf_counter()
+        result = delta_copy(new, target, in_place=in_place)
+        elapsed = time.perf_counter() - start
+        mode = "in place" if in_place else "temp+replace"
+        print(f"{label:<18} {mode:<13} {elapsed:7.2f}s (full copy {full_time:.2f}s)  "
+              f"block {result.block_size // 1024} KiB, matched {result.matched_bytes / result.size:.1%}, "
+              f"written {result.written_bytes / 1024 / 1024:.1f} MiB")
+    for name in ("old.img", "new.img", "full.img", "target.img"):
+        os.remove(os.path.join(root, name))
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as root:
+        run("scattered writes", root, size_mb, changes, insert=False)
+        run("plus insertion", root, size_mb, changes, insert=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Measure how much data the duplicate finder reads on a synthetic tree.
+
+Usage: python benchmarks/bench_duplicates.py [files] [dup_fraction]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.duplicates import DuplicateFinder
+from core.hash_cache import HashCache
+
+
+def build_tree(root, files, dup_fraction, seed=1):
+    """Mostly distinct sizes (like real trees) with a share of exact copies"""
+    rng = random.Random(seed)
+    originals = []
+    for i in range(files):
+        sub = os.path.join(root, f"d{i % 50}", f"s{i % 7}")
+        os.makedirs(sub, exist_ok=True)
+        path = os.path.join(sub, f"f{i}.bin")
+        if originals and rng.random() < dup_fraction:
+            data = rng.choice(originals)
+        else:
+            data = rng.randbytes(rng.choice([rng.randint(100, 8000), rng.randint(100000, 2000000)]))
+            originals.append(data)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    dup_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, files, dup_fraction)
+        start = time.perf_counter()
+        report = DuplicateFinder(hash_cache=HashCache()).find(root)
+        elapsed = time.perf_counter() - start
+    print(f"files scanned:   {report.files_scanned}")
+    print(f"total bytes:     {report.total_bytes}")
+    print(f"bytes read:      {report.bytes_read} ({report.read_fraction:.1%})")
+    print(f"partial hashed:  {report.partial_hashed}  full hashed: {report.full_hashed}")
+    print(f"groups:          {len(report.groups)}  wasted: {report.wasted_bytes}")
+    print(f"elapsed:         {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
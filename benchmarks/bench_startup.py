@@ -0,0 +1,106 @@
+"""Cold-start budget check for the CLI and the GUI.
+
+Runs each entry point in a fresh interpreter several times and keeps the best
+wall time, lists the slowest imports from -X importtime, and, when PyQt5 is
+installed, times the GUI's first paint in both deferred and eager startup
+(offscreen). Exits with status 1 if a budget is exceeded.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds
+BUDGETS = {
+    'cli': 100,
+    'gui_first_paint': 600,
+}
+
+
+def best_wall_ms(argv, runs, env=None):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=REPO_ROOT, capture_output=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def slowest_imports(statement, top=8):
+    """(self ms, cumulative ms, module) from -X importtime, slowest cumulative first"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+            rows.append((int(self_us) / 1000, int(cumulative_us) / 1000, name))
+        except ValueError:
+            continue
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return rows[:top]
+
+
+def gui_timings(eager):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    argv = [sys.executable, "main.py", "--startup-benchmark"] + (["--eager-startup"] if eager else [])
+    proc = subprocess.run(argv, cwd=REPO_ROOT, capture_output=True, text=True, env=env, timeout=60)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return None
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = os.path.join(tmpdir, "index.db")
+        baseline = best_wall_ms([sys.executable, "-c", "pass"], runs)
+        cli_ms = best_wall_ms([sys.executable, "cli.py", "index", "status", "--db", db], runs)
+    print(f"interpreter          {baseline:7.1f} ms")
+    print(f"cli (index status)   {cli_ms:7.1f} ms   budget {BUDGETS['cli']} ms")
+    if cli_ms > BUDGETS['cli']:
+        failures.append('cli')
+
+    print("\nslowest imports for the CLI (cumulative / self):")
+    for self_ms, cumulative_ms, name in slowest_imports("import cli, core.file_ops, core.file_index"):
+        print(f"  {cumulative_ms:7.1f} {self_ms:7.1f}  {name}")
+
+    try:
+        import PyQt5  # noqa: F401
+    except ImportError:
+        print("\nPyQt5 not installed; skipping GUI startup")
+    else:
+        print("\nslowest imports for the GUI (cumulative / self):")
+        for self_ms, cumulative_ms, name in slowest_imports("import gui.window"):
+            print(f"  {cumulative_ms:7.1f} {self_ms:7.1f}  {name}")
+        for eager in (False, True):
+            timings = gui_timings(eager)
+            label = "eager" if eager else "deferred"
+            if timings is None:
+                print(f"gui {label}: no timings reported")
+                failures.append(f"gui_{label}")
+                continue
+            print(f"gui {label:<9} imports {timings['imports_done']:7.1f} ms  first paint {timings['first_paint']:7.1f} ms"
+                  f"  ready {timings['ready']:7.1f} ms")
+            if not eager and timings['first_paint'] > BUDGETS['gui_first_paint']:
+                failures.append('gui_first_paint')
+
+    if failures:
+        print(f"\nover budget: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
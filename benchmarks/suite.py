@@ -0,0 +1,331 @@
+"""Benchmark suite: core operations timed on synthetic trees, with stored results.
+
+Every case runs against each tree shape from synthetic.py. Setup work (building
+a tree to delete, an archive to extract, ...) is not timed. Each case is
+repeated and the minimum and median wall times are kept. Results are written
+to benchmarks/results/<time>-<commit>.json, and --compare reports the change
+against an earlier run with the same scale.
+
+Usage: python benchmarks/suite.py [--scale 0.25] [--repeat 3] [--only copy,search]
+                                  [--shapes deep,wide] [--compare latest|FILE]
+                                  [--threshold 1.25] [--no-save] [--fail-on-regression]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import SHAPES  # noqa: E402
+
+
+class Case(NamedTuple):
+    """A timed operation. setup(tree, scratch) runs untimed before every repetition and
+    returns the argument passed to run(arg, scratch)."""
+    name: str
+    run: Callable[[object, str], object]
+    setup: Optional[Callable[[str, str], object]] = None
+
+
+def _fresh(path: str) -> str:
+    if os.path.lexists(path):
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    return path
+
+
+def _all_dirs(tree: str) -> List[str]:
+    return [root for root, _, _ in os.walk(tree)]
+
+
+# ---- cases ----
+def _search_scan(tree, scratch):
+    from core.scanner import ParallelScanner
+    return sum(1 for e in ParallelScanner().walk(tree) if "7" in os.path.basename(e.path))
+
+
+def _index_build(tree, scratch):
+    from core.file_index import FileIndex
+    index = FileIndex(_fresh(os.path.join(scratch, "index.db")))
+    index.build(tree)
+    index.close()
+
+
+def _index_ready(tree, scratch):
+    _index_build(tree, scratch)
+    return tree
+
+
+def _index_query(tree, scratch):
+    from core.file_index import FileIndex
+    index = FileIndex(os.path.join(scratch, "index.db"))
+    for term in ("1", "log", "entry_0001", "mod_00"):
+        index.search(name_contains=term)
+    index.search(exts=["log", "txt"], min_size=1024)
+    index.close()
+
+
+def _listing_scan(dirs, scratch):
+    from core.listing_cache import scan_directory
+    for d in dirs:
+        scan_directory(d)
+
+
+def _listing_cached(dirs, scratch):
+    from core.listing_cache import DirectoryListingCache
+    cache = DirectoryListingCache()
+    for _ in range(2):
+        for d in dirs:
+            cache.revalidate(d)
+
+
+def _copy_setup(tree, scratch):
+    _fresh(os.path.join(scratch, "copy_dest"))
+    return tree
+
+
+def _copy(tree, scratch):
+    from core.file_ops import run_batch
+    result = run_batch([('copy', tree, os.path.join(scratch, "copy_dest"))], journal_dir=os.path.join(scratch, "journals"))
+    assert not result.errors, result.errors
+
+
+def _clone_setup(tree, scratch):
+    dest = _fresh(os.path.join(scratch, "clone"))
+    shutil.copytree(tree, dest)
+    _fresh(os.path.join(scratch, "moved"))
+    return dest
+
+
+def _move(src, scratch):
+    from core.file_ops import run_batch
+    result = run_batch([('move', src, os.path.join(scratch, "moved"))], journal_dir=os.path.join(scratch, "journals"))
+    assert not result.errors, result.errors
+
+
+def _delete(src, scratch):
+    from core.file_ops import delete_tree
+    result = delete_tree(src)
+    assert not result.errors, result.errors
+
+
+def _compress_setup(tree, scratch):
+    _fresh(os.path.join(scratch, "archive.zip"))
+    return tree
+
+
+def _compress(tree, scratch):
+    from core.compress import zip_folder
+    zip_folder(tree, os.path.join(scratch, "archive.zip"))
+
+
+def _extract_setup(tree, scratch):
+    archive = os.path.join(scratch, "archive.zip")
+    if not os.path.exists(archive):
+        _compress(tree, scratch)
+    _fresh(os.path.join(scratch, "extracted"))
+    return archive
+
+
+def _extract(archive, scratch):
+    from core.compress import unzip_file
+    unzip_file(archive, os.path.join(scratch, "extracted"))
+
+
+def _favorites_setup(tree, scratch):
+    from core.stat_cache import get_stat_cache
+    # run_suite points HOME at the sandbox, so this is the sandboxed favorites store
+    _fresh(os.path.join(os.path.expanduser("~"), "AppData"))
+    get_stat_cache().clear()
+    paths = []
+    for root, dirs, files in os.walk(tree):
+        paths.extend(os.path.join(root, name) for name in dirs + files)
+        if len(paths) >= 200:
+            break
+    return paths[:200]
+
+
+def _favorites(paths, scratch):
+    from core.favorites import FavoritesManager
+    manager = FavoritesManager()
+    for path in paths:
+        manager.add_favorite(path)
+    manager.get_favorites()
+    for path in paths[::2]:
+        manager.remove_favorite(path)
+
+
+CASES = [
+    Case("search.scan", _search_scan),
+    Case("search.index_build", _index_build),
+    Case("search.index_query", _index_query, _index_ready),
+    Case("listing.scandir", _listing_scan, lambda tree, scratch: _all_dirs(tree)),
+    Case("listing.cached", _listing_cached, lambda tree, scratch: _all_dirs(tree)),
+    Case("copy", _copy, _copy_setup),
+    Case("move", _move, _clone_setup),
+    Case("delete", _delete, _clone_setup),
+    Case("compress", _compress, _compress_setup),
+    Case("extract", _extract, _extract_setup),
+    Case("favorites", _favorites, _favorites_setup),
+]
+
+
+# ---- running ----
+def time_case(case: Case, tree: str, scratch: str, repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        arg = case.setup(tree, scratch) if case.setup else tree
+        start = time.perf_counter()
+        case.run(arg, scratch)
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times), 'repeat': repeat}
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(scale: float, repeat: int, only: Optional[List[str]] = None, shapes: Optional[List[str]] = None,
+              progress: Optional[Callable[[str], None]] = None) -> dict:
+    cases = [c for c in CASES if not only or any(c.name.startswith(o) for o in only)]
+    results: Dict[str, dict] = {}
+    trees: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bb-bench-") as workdir:
+        # Favorites and other per-user state live under the home directory; keep them in the sandbox
+        saved_env = {k: os.environ.get(k) for k in ("HOME", "USERPROFILE")}
+        os.environ["HOME"] = os.environ["USERPROFILE"] = os.path.join(workdir, "home")
+        try:
+            for shape, generate in SHAPES.items():
+                if shapes and shape not in shapes:
+                    continue
+                tree = os.path.join(workdir, shape)
+                start = time.perf_counter()
+                stats = generate(tree, scale)
+                trees[shape] = dict(stats._asdict(), generate_s=time.perf_counter() - start)
+                scratch = os.path.join(workdir, f"{shape}-scratch")
+                os.makedirs(scratch)
+                for case in cases:
+                    key = f"{case.name}[{shape}]"
+                    if progress:
+                        progress(key)
+                    results[key] = time_case(case, tree, scratch, repeat)
+                shutil.rmtree(scratch)
+                shutil.rmtree(tree)
+        finally:
+            for k, v in saved_env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+    return {
+        'commit': git_commit(),
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'scale': scale,
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'trees': trees,
+        'results': results,
+    }
+
+
+def save_run(run: dict, results_dir: str = RESULTS_DIR) -> str:
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(results_dir, f"{stamp}-{run['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=1, sort_keys=True)
+    return path
+
+
+def find_baseline(spec: str, scale: float, results_dir: str = RESULTS_DIR) -> Optional[dict]:
+    """'latest' picks the newest stored run with the same scale; anything else is a file path"""
+    if spec != "latest":
+        with open(spec, encoding="utf-8") as f:
+            return json.load(f)
+    for path in sorted(glob.glob(os.path.join(results_dir, "*.json")), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            run = json.load(f)
+        if run.get('scale') == scale:
+            return run
+    return None
+
+
+def compare(run: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print current vs baseline medians; returns the cases slower than threshold x baseline"""
+    regressions = []
+    print(f"\nvs {baseline['commit']} ({baseline['created']})")
+    for key, current in run['results'].items():
+        old = baseline['results'].get(key)
+        if old is None or not old['median']:
+            continue
+        ratio = current['median'] / old['median']
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"  {key:<34} {old['median'] * 1000:9.1f} -> {current['median'] * 1000:9.1f} ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=0.25)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', help="comma-separated case name prefixes")
+    parser.add_argument('--shapes', help=f"comma-separated subset of {', '.join(SHAPES)}")
+    parser.add_argument('--compare', help="'latest' or a results file")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    baseline = find_baseline(args.compare, args.scale, args.results_dir) if args.compare else None
+    run = run_suite(args.scale, args.repeat,
+                    only=args.only.split(',') if args.only else None,
+                    shapes=args.shapes.split(',') if args.shapes else None,
+                    progress=lambda key: print(f"  running {key}", file=sys.stderr))
+
+    for shape, stats in run['trees'].items():
+        print(f"{shape:<11} {stats['files']:7d} files {stats['dirs']:6d} dirs {stats['bytes'] / 1024 / 1024:8.1f} MiB")
+    print()
+    for key, result in run['results'].items():
+        print(f"{key:<34} min {result['min'] * 1000:9.1f} ms  median {result['median'] * 1000:9.1f} ms")
+
+    regressions = []
+    if args.compare:
+        if baseline is None:
+            print(f"\nno stored run with scale {args.scale} to compare against")
+        else:
+            regressions = compare(run, baseline, args.threshold)
+    if not args.no_save:
+        print(f"\nsaved {save_run(run, args.results_dir)}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
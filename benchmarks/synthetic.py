@@ -0,0 +1,110 @@
+"""Deterministic synthetic directory trees for benchmarks.
+
+Each generator takes a root and a scale (1.0 is the full benchmark size) and
+returns TreeStats. The same seed always produces the same names and sizes,
+so results from different commits are comparable.
+"""
+import os
+import random
+from typing import Callable, Dict, NamedTuple
+
+BLOCK = 1024 * 1024
+
+
+class TreeStats(NamedTuple):
+    """What a generator wrote"""
+    files: int
+    dirs: int
+    bytes: int
+
+
+def _payload(rng: random.Random, size: int, pool: bytes) -> bytes:
+    """size bytes cut from a shared random pool, so generation is not dominated by the RNG"""
+    if size <= 0:
+        return b""
+    start = rng.randrange(len(pool) - min(size, len(pool)) + 1)
+    data = pool[start:start + size]
+    while len(data) < size:
+        data += pool[:size - len(data)]
+    return data
+
+
+def _write(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def deep_tree(root: str, scale: float = 1.0, seed: int = 1) -> TreeStats:
+    """A single chain of nested folders with a few small files at every level"""
+    rng = random.Random(seed)
+    pool = rng.randbytes(BLOCK)
+    depth = max(2, int(60 * scale))
+    files = total = 0
+    path = root
+    for level in range(depth):
+        path = os.path.join(path, f"level_{level:03d}")
+        os.makedirs(path, exist_ok=True)
+        for i in range(5):
+            data = _payload(rng, rng.randint(100, 8192), pool)
+            _write(os.path.join(path, f"item_{i}.{rng.choice(['txt', 'log', 'py'])}"), data)
+            files += 1
+            total += len(data)
+    return TreeStats(files, depth, total)
+
+
+def wide_tree(root: str, scale: float = 1.0, seed: int = 2) -> TreeStats:
+    """One folder holding a very large number of entries"""
+    rng = random.Random(seed)
+    pool = rng.randbytes(BLOCK)
+    count = max(10, int(20000 * scale))
+    os.makedirs(root, exist_ok=True)
+    total = 0
+    for i in range(count):
+        data = _payload(rng, rng.randint(0, 2048), pool)
+        _write(os.path.join(root, f"entry_{i:06d}.{rng.choice(['jpg', 'txt', 'dat', 'log'])}"), data)
+        total += len(data)
+    return TreeStats(count, 1, total)
+
+
+def many_small(root: str, scale: float = 1.0, seed: int = 3) -> TreeStats:
+    """Many small files spread over a two-level hierarchy, like a source checkout"""
+    rng = random.Random(seed)
+    pool = rng.randbytes(BLOCK)
+    count = max(20, int(30000 * scale))
+    fanout = max(2, int(count ** 0.5) // 4)
+    dirs = set()
+    total = 0
+    for i in range(count):
+        sub = os.path.join(root, f"pkg_{i % fanout:03d}", f"mod_{(i // fanout) % fanout:03d}")
+        if sub not in dirs:
+            os.makedirs(sub, exist_ok=True)
+            dirs.add(sub)
+        data = _payload(rng, rng.randint(0, 16384), pool)
+        _write(os.path.join(sub, f"file_{i:06d}.{rng.choice(['py', 'json', 'md', 'log', 'c'])}"), data)
+        total += len(data)
+    return TreeStats(count, len(dirs), total)
+
+
+def few_huge(root: str, scale: float = 1.0, seed: int = 4) -> TreeStats:
+    """A handful of large files, as in a folder of disk images or videos"""
+    rng = random.Random(seed)
+    pool = rng.randbytes(BLOCK)
+    size = max(1, int(64 * scale)) * BLOCK
+    os.makedirs(root, exist_ok=True)
+    for i in range(4):
+        with open(os.path.join(root, f"image_{i}.bin"), "wb") as f:
+            written = 0
+            while written < size:
+                chunk = pool[rng.randrange(BLOCK // 2):]
+                chunk = chunk[:size - written]
+                f.write(chunk)
+                written += len(chunk)
+    return TreeStats(4, 1, 4 * size)
+
+
+SHAPES: Dict[str, Callable[..., TreeStats]] = {
+    'deep': deep_tree,
+    'wide': wide_tree,
+    'many_small': many_small,
+    'few_huge': few_huge,
+}
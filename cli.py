@@ -0,0 +1,321 @@
+"""Headless command line interface to the core file operations.
+
+Every command writes JSON lines to stdout: zero or more records followed by a
+final {"type": "result", ...} record. Errors are reported as
+{"type": "error", "message": ...} records. Nothing here imports Qt, and each
+command imports only the core modules it needs, so the CLI starts quickly
+enough to be called once per file from batch jobs.
+
+Exit codes: 0 success, 1 the command failed or finished with errors,
+2 bad usage, 130 interrupted.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+SIZE_UNITS = {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2,
+              'g': 1024 ** 3, 'gb': 1024 ** 3, 't': 1024 ** 4, 'tb': 1024 ** 4}
+
+
+def emit(record_type, **fields):
+    """Write one JSON record to stdout and flush so consumers see it immediately"""
+    fields = {'type': record_type, **fields}
+    sys.stdout.write(json.dumps(fields, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def parse_size(text):
+    """'1.5MB' -> bytes"""
+    value = text.strip().lower()
+    number = value.rstrip('kmgtb')
+    unit = value[len(number):]
+    if unit not in SIZE_UNITS:
+        raise argparse.ArgumentTypeError(f"Unknown size unit: {text}")
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {text}")
+
+
+def _file_record(path, size, mtime_ns, is_dir=False):
+    return {'path': path, 'size': size, 'mtime': mtime_ns / 1e9, 'is_dir': is_dir}
+
+
+# ---- commands ----
+def cmd_search(args):
+    exts = [e.lower().lstrip('.') for e in args.ext] if args.ext else None
+    has_wildcard = any(c in args.pattern for c in '*?[')
+    count = 0
+    skipped = 0
+    if args.index:
+        from core.file_index import FileIndex
+        index = FileIndex(args.db)
+        matches = index.search(
+            name_contains=None if has_wildcard else args.pattern,
+            name_glob=args.pattern if has_wildcard else None,
+            exts=exts, min_size=args.min_size, max_size=args.max_size,
+            under=args.root, limit=args.limit)
+        for match in matches:
+            emit('match', **_file_record(match.path, match.size, match.mtime_ns, match.is_dir))
+            count += 1
+        index.close()
+    else:
+        import fnmatch
+        from core.excludes import get_exclude_engine
+        from core.scanner import ParallelScanner
+        pattern = args.pattern.lower()
+        scanner = ParallelScanner(excludes=None if args.no_excludes else get_exclude_engine())
+        for entry in scanner.walk(args.root):
+            name = os.path.basename(entry.path).lower()
+            if has_wildcard:
+                if not fnmatch.fnmatchcase(name, pattern):
+                    continue
+            elif pattern not in name:
+                continue
+            if exts and os.path.splitext(name)[1][1:] not in exts:
+                continue
+            if args.min_size is not None and entry.size < args.min_size:
+                continue
+            if args.max_size is not None and entry.size > args.max_size:
+                continue
+            emit('match', **_file_record(entry.path, entry.size, entry.mtime_ns))
+            count += 1
+            if args.limit and count >= args.limit:
+                break
+        skipped = scanner.skipped
+    emit('result', matches=count, skipped=skipped)
+    return EXIT_OK
+
+
+def cmd_query(args):
+    from core.query import QueryError, parse_query, run_query
+    try:
+        query = parse_query(args.query)
+    except QueryError as e:
+        emit('error', message=str(e))
+        return EXIT_USAGE
+    index = None
+    if args.index:
+        from core.file_index import FileIndex
+        index = FileIndex(args.db)
+    try:
+        result = run_query(query, args.root, index=index, limit=args.limit, use_excludes=not args.no_excludes)
+    finally:
+        if index is not None:
+            index.close()
+    if args.explain:
+        for step in result.plan:
+            emit('plan', step=step)
+    for hit in result.hits:
+        emit('match', score=hit.score, **_file_record(hit.path, hit.size, hit.mtime_ns))
+    emit('result', matches=len(result.hits), candidates=result.stats['candidates'],
+         content_reads=result.stats['content_reads'], skipped=result.stats['skipped'])
+    return EXIT_OK
+
+
+def _transfer(op, args):
+    from core.file_ops import run_batch
+    dest_is_dir = os.path.isdir(args.dest) or len(args.sources) > 1
+    if dest_is_dir and not os.path.isdir(args.dest):
+        emit('error', message=f"Destination is not a directory: {args.dest}")
+        return EXIT_FAILED
+    steps = []
+    for src in args.sources:
+        if not os.path.lexists(src):
+            emit('error', message=f"Source not found: {src}")
+            return EXIT_FAILED
+        dst = os.path.join(args.dest, os.path.basename(os.path.normpath(src))) if dest_is_dir else args.dest
+        steps.append((op, os.path.abspath(src), os.path.abspath(dst)))
+
+    def progress(done, total):
+        emit('progress', done=done, total=total)
+
+    result = run_batch(steps, journal_dir=args.journal_dir, progress=progress)
+    for message in result.errors:
+        emit('error', message=message)
+    emit('result', completed=result.completed, errors=len(result.errors))
+    return EXIT_FAILED if result.errors else EXIT_OK
+
+
+def cmd_copy(args):
+    return _transfer('copy', args)
+
+
+def cmd_move(args):
+    return _transfer('move', args)
+
+
+def cmd_delete(args):
+    errors = 0
+    deleted = 0
+    for path in args.paths:
+        try:
+            if args.permanent:
+                from core.file_ops import delete_tree
+                outcome = delete_tree(path)
+                for message in outcome.errors:
+                    emit('error', message=message)
+                errors += len(outcome.errors)
+                emit('deleted', path=path, files=outcome.files_deleted, dirs=outcome.dirs_deleted)
+            else:
+                from core.trash import get_trash_store
+                if not os.path.lexists(path):
+                    raise FileNotFoundError(f"File not found: {path}")
+                item = get_trash_store().trash(path)
+                emit('trashed', path=item.original_path, id=item.item_id)
+            deleted += 1
+        except OSError as e:
+            emit('error', message=f"Failed to delete '{path}': {e}")
+            errors += 1
+    emit('result', deleted=deleted, errors=errors)
+    return EXIT_FAILED if errors else EXIT_OK
+
+
+def cmd_compress(args):
+    from subprocess import CalledProcessError
+    from core.compress import zip_folder
+    try:
+        zip_folder(args.source, args.archive)
+    except CalledProcessError as e:
+        emit('error', message=f"Compress-Archive failed with exit code {e.returncode}")
+        return EXIT_FAILED
+    emit('result', archive=os.path.abspath(args.archive), size=os.path.getsize(args.archive))
+    return EXIT_OK
+
+
+def cmd_extract(args):
+    from subprocess import CalledProcessError
+    from core.compress import unzip_file
+    try:
+        unzip_file(args.archive, args.dest)
+    except CalledProcessError as e:
+        emit('error', message=f"Expand-Archive failed with exit code {e.returncode}")
+        return EXIT_FAILED
+    emit('result', dest=os.path.abspath(args.dest))
+    return EXIT_OK
+
+
+def cmd_dedupe(args):
+    from core.duplicates import DuplicateFinder
+    hash_cache = None
+    if args.hash_cache:
+        from core.hash_cache import HashCache
+        hash_cache = HashCache(args.hash_cache)
+    report = DuplicateFinder(min_size=args.min_size, hash_cache=hash_cache).find(args.roots)
+    for group in report.groups:
+        emit('duplicates', size=group.size, digest=group.digest, paths=group.paths, wasted=group.wasted_bytes)
+    emit('result', groups=len(report.groups), files_scanned=report.files_scanned,
+         wasted_bytes=report.wasted_bytes, bytes_read=report.bytes_read)
+    return EXIT_OK
+
+
+def cmd_index(args):
+    from core.file_index import FileIndex
+    index = FileIndex(args.db)
+    try:
+        if args.action == 'build':
+            if not args.roots:
+                emit('error', message="index build needs at least one root")
+                return EXIT_USAGE
+            for root in args.roots:
+                started = time.perf_counter()
+                skipped_before = index.scanner.skipped
+                count = index.build(root, progress=lambda n: emit('progress', root=root, indexed=n))
+                emit('indexed', root=os.path.abspath(root), entries=count,
+                     skipped=index.scanner.skipped - skipped_before,
+                     seconds=round(time.perf_counter() - started, 3))
+        elif args.action == 'refresh':
+            for root in args.roots or [None]:
+                emit('refreshed', root=root, directories=index.refresh(root))
+        emit('result', roots=index.roots(), entries=index.count())
+    finally:
+        index.close()
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="brontobase", description="BrontoBase file operations without the GUI")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('search', help="find files by name")
+    p.add_argument('root')
+    p.add_argument('pattern', help="substring, or a glob if it contains * ? or [")
+    p.add_argument('--ext', action='append', help="only this extension (repeatable)")
+    p.add_argument('--min-size', type=parse_size)
+    p.add_argument('--max-size', type=parse_size)
+    p.add_argument('--limit', type=int)
+    p.add_argument('--index', action='store_true', help="query the filename index instead of crawling")
+    p.add_argument('--db', help="index database for --index (default: the app data index)")
+    p.add_argument('--no-excludes', action='store_true', help="also crawl .git, node_modules and .gitignore'd paths")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser('query', help="search with combined predicates, e.g. 'ext:log size:>100MB \"timeout\"'")
+    p.add_argument('root')
+    p.add_argument('query')
+    p.add_argument('--limit', type=int)
+    p.add_argument('--index', action='store_true', help="use the filename index where it covers root")
+    p.add_argument('--db', help="index database for --index (default: the app data index)")
+    p.add_argument('--explain', action='store_true', help="also print the evaluation plan")
+    p.add_argument('--no-excludes', action='store_true', help="also crawl .git, node_modules and .gitignore'd paths")
+    p.set_defaults(func=cmd_query)
+
+    for name, func in (('copy', cmd_copy), ('move', cmd_move)):
+        p = sub.add_parser(name, help=f"{name} files or folders (journaled)")
+        p.add_argument('sources', nargs='+')
+        p.add_argument('dest')
+        p.add_argument('--journal-dir', help="where to keep the batch journal (default: the app data journals)")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser('delete', help="move to the trash, or delete permanently")
+    p.add_argument('paths', nargs='+')
+    p.add_argument('--permanent', action='store_true')
+    p.set_defaults(func=cmd_delete)
+
+    p = sub.add_parser('compress', help="zip a file or folder")
+    p.add_argument('source')
+    p.add_argument('archive')
+    p.set_defaults(func=cmd_compress)
+
+    p = sub.add_parser('extract', help="unzip an archive")
+    p.add_argument('archive')
+    p.add_argument('dest')
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser('dedupe', help="find duplicate files")
+    p.add_argument('roots', nargs='+')
+    p.add_argument('--min-size', type=parse_size, default=1)
+    p.add_argument('--hash-cache', help="content hash store (default: the app data hash cache)")
+    p.set_defaults(func=cmd_dedupe)
+
+    p = sub.add_parser('index', help="build or refresh the filename index")
+    p.add_argument('action', choices=['build', 'refresh', 'status'])
+    p.add_argument('roots', nargs='*')
+    p.add_argument('--db', help="index database (default: the app data index)")
+    p.set_defaults(func=cmd_index)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        emit('error', message="interrupted")
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # Consumer went away (e.g. piped into head); nothing left to report to
+        return EXIT_OK
+    except (OSError, ValueError) as e:
+        emit('error', message=str(e))
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
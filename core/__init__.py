@@ -1,5 +1,47 @@
-from .navigation import NavigationHistory
-from .favorites import FavoritesManager
-from .search import FileSearcher, search_files
+"""Core services.
 
-__all__ = ['NavigationHistory', 'FavoritesManager', 'FileSearcher', 'search_files']
+Names listed here are imported from their submodules on first access, so
+``import core.scanner`` (or the CLI) only pays for the modules it uses.
+"""
+import importlib
+
+_EXPORTS = {
+    'NavigationHistory': 'navigation',
+    'FavoritesManager': 'favorites',
+    'FileSearcher': 'search', 'search_files': 'search',
+    'DirectoryListingCache': 'listing_cache', 'DirectorySnapshot': 'listing_cache',
+    'DirectoryPrefetcher': 'prefetch',
+    'ParallelScanner': 'scanner',
+    'HashCache': 'hash_cache', 'get_hash_cache': 'hash_cache',
+    'DuplicateFinder': 'duplicates', 'find_duplicates': 'duplicates',
+    'UsageTree': 'disk_usage', 'squarify': 'disk_usage',
+    'build_names': 'batch_rename', 'plan_renames': 'batch_rename',
+    'apply_plan': 'batch_rename', 'batch_rename': 'batch_rename',
+    'TrashStore': 'trash', 'get_trash_store': 'trash',
+    'FolderSync': 'sync', 'sync_folders': 'sync',
+    'StatCache': 'stat_cache', 'get_stat_cache': 'stat_cache',
+    'MetadataService': 'metadata', 'get_metadata_service': 'metadata', 'register_extractor': 'metadata',
+    'FileIndex': 'file_index', 'get_file_index': 'file_index',
+    'MountService': 'mounts', 'get_mount_service': 'mounts',
+    'Tracer': 'tracing', 'get_tracer': 'tracing',
+    'EventLoopWatchdog': 'watchdog',
+    'SavedSearch': 'smart_folders', 'SmartFolderManager': 'smart_folders',
+    'parse_query': 'query', 'run_query': 'query',
+    'ExcludeEngine': 'excludes', 'get_exclude_engine': 'excludes',
+    'ResultColumns': 'results',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
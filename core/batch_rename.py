@@ -0,0 +1,222 @@
+import os
+import re
+import string
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+TEMPLATE_FIELDS = ('name', 'ext', 'n', 'index', 'parent')
+
+
+class RenameConflict(NamedTuple):
+    """A planned rename that cannot be carried out"""
+    src: str
+    dst: str
+    reason: str
+
+
+class RenamePlan:
+    """Ordered rename steps for a batch, including temporary hops that break cycles"""
+
+    def __init__(self):
+        self.pairs: List[Tuple[str, str]] = []
+        self.steps: List[Tuple[str, str]] = []
+        self.conflicts: List[RenameConflict] = []
+        self.unchanged = 0
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.conflicts
+
+    def preview(self) -> List[Tuple[str, str, str]]:
+        """(old name, new name, status) rows for display"""
+        bad = {c.src: c.reason for c in self.conflicts}
+        return [(os.path.basename(src), os.path.basename(dst), bad.get(src, "OK")) for src, dst in self.pairs]
+
+
+class RenameResult:
+    """Outcome of applying a plan"""
+
+    def __init__(self):
+        self.renamed = 0
+        self.errors: List[str] = []
+        self.rolled_back = False
+
+
+def build_names(paths: Sequence[str], mode: str, pattern: str, replacement: str = "",
+                start: int = 1, step: int = 1) -> List[str]:
+    """Compute new names for paths.
+
+    mode 'template': pattern is a str.format template with {name}, {ext},
+    {n} (counter), {index} and {parent}, e.g. "{name}_{n:03}{ext}".
+    mode 'regex': pattern is applied to the full name with re.sub(pattern,
+    replacement); {n} in the replacement is expanded to the counter.
+    Any problem with the pattern is raised as ValueError.
+    """
+    names = []
+    if mode == 'regex':
+        try:
+            regex = re.compile(pattern)
+            for i, path in enumerate(paths):
+                name = os.path.basename(path)
+                n = start + i * step
+                names.append(regex.sub(replacement.replace("{n}", str(n)), name))
+        except re.error as e:
+            raise ValueError(str(e))
+    elif mode == 'template':
+        _check_template(pattern)
+        for i, path in enumerate(paths):
+            name = os.path.basename(path)
+            stem, ext = os.path.splitext(name)
+            try:
+                names.append(pattern.format(name=stem, ext=ext, n=start + i * step, index=i,
+                                            parent=os.path.basename(os.path.dirname(path))))
+            except (KeyError, IndexError, ValueError) as e:
+                # e.g. a format spec that does not suit the field, such as {name:03d}
+                raise ValueError(f"{e.__class__.__name__}: {e}")
+    else:
+        raise ValueError(f"Unknown rename mode: {mode}")
+    return names
+
+
+def _check_template(pattern: str) -> None:
+    """Allow only the plain template fields; attribute or index access such as {name.upper} is rejected"""
+    try:
+        fields = [field for _, field, _, _ in string.Formatter().parse(pattern) if field is not None]
+    except ValueError as e:
+        raise ValueError(f"Invalid template: {e}")
+    for field in fields:
+        if field not in TEMPLATE_FIELDS:
+            raise ValueError(f"Unknown field {{{field}}}; use " + ", ".join(f"{{{f}}}" for f in TEMPLATE_FIELDS))
+
+
+def _invalid_name(name: str) -> Optional[str]:
+    if not name or name in ('.', '..'):
+        return "empty name"
+    if '/' in name or (os.sep in name) or (os.altsep and os.altsep in name):
+        return "name contains a path separator"
+    if os.name == 'nt' and (re.search(r'[<>:"|?*\x00-\x1f]', name) or name.endswith((' ', '.'))):
+        return "name not allowed on Windows"
+    return None
+
+
+def plan_renames(paths: Sequence[str], new_names: Sequence[str]) -> RenamePlan:
+    """Plan renaming each path to the matching new name within its own folder"""
+    key = os.path.normcase
+    plan = RenamePlan()
+    listings: Dict[str, Set[str]] = {}
+
+    def exists(path: str) -> bool:
+        # One listdir per folder instead of an exists() call per target
+        folder = os.path.dirname(path)
+        if folder not in listings:
+            try:
+                listings[folder] = {key(n) for n in os.listdir(folder or '.')}
+            except OSError:
+                listings[folder] = set()
+        return key(os.path.basename(path)) in listings[folder]
+
+    moves: List[List[str]] = []
+    for src, new_name in zip(paths, new_names):
+        dst = os.path.join(os.path.dirname(src), new_name)
+        if dst == src:
+            plan.unchanged += 1
+            continue
+        plan.pairs.append((src, dst))
+        reason = _invalid_name(new_name)
+        if reason:
+            plan.conflicts.append(RenameConflict(src, dst, reason))
+        moves.append([src, dst])
+
+    sources = {key(src) for src, _ in moves}
+    targets: Dict[str, str] = {}
+    for src, dst in moves:
+        k = key(dst)
+        if k in targets:
+            plan.conflicts.append(RenameConflict(src, dst, f"same new name as {os.path.basename(targets[k])}"))
+            continue
+        targets[k] = src
+        if k not in sources and exists(dst):
+            plan.conflicts.append(RenameConflict(src, dst, "target already exists"))
+    if plan.conflicts:
+        return plan
+
+    # Order the moves: a move waits for the source currently sitting on its target
+    pending = set(sources)
+    waiting: Dict[str, int] = {}
+    ready: List[int] = []
+    for i, (src, dst) in enumerate(moves):
+        blocker = key(dst)
+        if blocker in pending and blocker != key(src):
+            waiting[blocker] = i
+        else:
+            ready.append(i)
+    done = [False] * len(moves)
+
+    def release(src: str) -> None:
+        pending.discard(key(src))
+        j = waiting.pop(key(src), None)
+        if j is not None:
+            ready.append(j)
+
+    def drain() -> None:
+        while ready:
+            i = ready.pop()
+            src, dst = moves[i]
+            plan.steps.append((src, dst))
+            done[i] = True
+            release(src)
+
+    drain()
+    tmp_counter = 0
+    for i in range(len(moves)):
+        if done[i]:
+            continue
+        # Everything left is part of a cycle: park one member under a temporary name
+        src, dst = moves[i]
+        folder = os.path.dirname(src)
+        while True:
+            tmp = os.path.join(folder, f".{os.path.basename(src)}.bbrename{tmp_counter}")
+            tmp_counter += 1
+            if not exists(tmp):
+                break
+        plan.steps.append((src, tmp))
+        moves[i][0] = tmp
+        release(src)
+        drain()
+    return plan
+
+
+def apply_plan(plan: RenamePlan, progress: Optional[Callable[[int, int], None]] = None,
+               rollback_on_error: bool = True) -> RenameResult:
+    """Execute the plan with os.rename, undoing completed steps if one fails"""
+    result = RenameResult()
+    if not plan.is_valid:
+        result.errors = [f"{os.path.basename(c.src)}: {c.reason}" for c in plan.conflicts]
+        return result
+    completed: List[Tuple[str, str]] = []
+    total = len(plan.steps)
+    for n, (src, dst) in enumerate(plan.steps, 1):
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            result.errors.append(f"Failed to rename '{src}' to '{os.path.basename(dst)}': {e}")
+            if rollback_on_error:
+                for done_src, done_dst in reversed(completed):
+                    try:
+                        os.rename(done_dst, done_src)
+                    except OSError as undo_error:
+                        result.errors.append(f"Could not undo rename of '{done_src}': {undo_error}")
+                result.rolled_back = True
+                result.renamed = 0
+                return result
+            continue
+        completed.append((src, dst))
+        if progress and n % 500 == 0:
+            progress(n, total)
+    result.renamed = len(plan.pairs) - len(result.errors)
+    return result
+
+
+def batch_rename(paths: Sequence[str], mode: str, pattern: str, replacement: str = "",
+                 start: int = 1) -> RenameResult:
+    """Plan and apply a batch rename in one call"""
+    return apply_plan(plan_renames(paths, build_names(paths, mode, pattern, replacement, start)))
@@ -1,9 +1,14 @@
 import subprocess
 import os
+import shutil
+import zipfile
 
 def zip_folder(source, dest_zip):
     if not os.path.exists(source):
         raise FileNotFoundError(f"Source not found: {source}")
+    if shutil.which("powershell") is None:
+        _zip_native(source, dest_zip)
+        return
     subprocess.run([
         "powershell",
         "Compress-Archive",
@@ -14,6 +19,10 @@ def zip_folder(source, dest_zip):
 def unzip_file(zip_path, dest_folder):
     if not os.path.exists(zip_path):
         raise FileNotFoundError(f"Zip file not found: {zip_path}")
+    if shutil.which("powershell") is None:
+        with zipfile.ZipFile(zip_path) as zf:
+            zf.extractall(dest_folder)
+        return
     subprocess.run([
         "powershell",
         "Expand-Archive",
@@ -21,3 +30,16 @@ def unzip_file(zip_path, dest_folder):
         "-DestinationPath", dest_folder,
         "-Force"
     ], check=True)
+
+def _zip_native(source, dest_zip):
+    """zipfile equivalent of Compress-Archive: the source itself is the top-level entry"""
+    source = os.path.abspath(source)
+    base = os.path.dirname(source)
+    with zipfile.ZipFile(dest_zip, "w", zipfile.ZIP_DEFLATED) as zf:
+        if not os.path.isdir(source):
+            zf.write(source, os.path.basename(source))
+            return
+        for root, dirs, files in os.walk(source):
+            for name in files:
+                path = os.path.join(root, name)
+                zf.write(path, os.path.relpath(path, base))
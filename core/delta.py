@@ -0,0 +1,230 @@
+import hashlib
+import mmap
+import os
+import shutil
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+ADLER_MOD = 65521
+MIN_BLOCK = 4 * 1024
+MAX_BLOCK = 1024 * 1024
+IO_CHUNK = 8 * 1024 * 1024
+DELTA_PART_SUFFIX = ".bbdelta-part"
+
+
+class DeltaResult:
+    """How much of a delta copy was reused from the old file versus written"""
+
+    def __init__(self, size: int, block_size: int):
+        self.size = size
+        self.block_size = block_size
+        self.matched_bytes = 0
+        self.literal_bytes = 0
+        self.written_bytes = 0
+
+
+def choose_block_size(size: int) -> int:
+    """About sqrt(size), as rsync does, rounded to 1 KiB and clamped"""
+    block = int(size ** 0.5) // 1024 * 1024
+    return max(MIN_BLOCK, min(MAX_BLOCK, block))
+
+
+def _strong(data) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def roll(checksum: int, out_byte: int, in_byte: int, block_size: int) -> int:
+    """Slide an Adler-32 window by one byte (compute_delta inlines this)"""
+    a = checksum & 0xffff
+    b = checksum >> 16
+    a = (a - out_byte + in_byte) % ADLER_MOD
+    b = (b - block_size * out_byte + a - 1) % ADLER_MOD
+    return (b << 16) | a
+
+
+def signature(path: str, block_size: int) -> Dict[int, List[Tuple[int, bytes]]]:
+    """Weak checksum -> [(offset, strong hash)] for every full block of a file"""
+    table: Dict[int, List[Tuple[int, bytes]]] = {}
+    buf = bytearray(block_size)
+    view = memoryview(buf)
+    offset = 0
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if n < block_size:
+                break
+            table.setdefault(zlib.adler32(view), []).append((offset, _strong(view)))
+            offset += n
+    return table
+
+
+def compute_delta(src, table: Dict[int, List[Tuple[int, bytes]]], block_size: int,
+                  in_place: bool = False) -> List[Tuple[str, int, int, int]]:
+    """Instructions that rebuild src from the old file: ('copy', pos, old_offset, length) and
+    ('literal', pos, pos, length). A block found at its own offset is preferred.
+
+    With in_place the old file is the one being rewritten, so blocks are only
+    matched at old offsets at or after the current write position; everything
+    before it may already have been overwritten.
+    """
+    ops: List[Tuple[str, int, int, int]] = []
+    size = len(src)
+
+    def find(weak: int, pos: int) -> Optional[int]:
+        candidates = table.get(weak)
+        if not candidates:
+            return None
+        strong = _strong(src[pos:pos + block_size])
+        best = None
+        for offset, digest in candidates:
+            if digest == strong and (offset >= pos or not in_place):
+                if offset == pos:
+                    return offset
+                if best is None:
+                    best = offset
+        return best
+
+    def emit(kind: str, pos: int, offset: int, length: int) -> None:
+        if ops and ops[-1][0] == kind:
+            last = ops[-1]
+            if last[1] + last[3] == pos and last[2] + last[3] == offset:
+                ops[-1] = (kind, last[1], last[2], last[3] + length)
+                return
+        ops.append((kind, pos, offset, length))
+
+    pos = literal = 0
+    misses = 0
+    last_start = size - block_size
+    while pos <= last_start:
+        weak = zlib.adler32(src[pos:pos + block_size])
+        match = find(weak, pos)
+        if match is None:
+            end = min(last_start, pos + block_size)
+            # Rolling is a per-byte Python loop; inside long runs of new data only
+            # try it on every 2**k-th block instead of every block
+            if misses < 4 or not misses & (misses - 1):
+                a = weak & 0xffff
+                b = weak >> 16
+                i = pos
+                while i < end:
+                    out_byte = src[i]
+                    a = (a - out_byte + src[i + block_size]) % ADLER_MOD
+                    b = (b - block_size * out_byte + a - 1) % ADLER_MOD
+                    i += 1
+                    weak = (b << 16) | a
+                    if weak in table:
+                        match = find(weak, i)
+                        if match is not None:
+                            break
+            if match is None:
+                misses += 1
+                pos = end + 1
+                continue
+            pos = i
+        misses = 0
+        if pos > literal:
+            emit('literal', literal, literal, pos - literal)
+        emit('copy', pos, match, block_size)
+        pos += block_size
+        literal = pos
+    if size > literal:
+        emit('literal', literal, literal, size - literal)
+    return ops
+
+
+def _clone(src: str, dst: str) -> None:
+    """Copy a file kernel-side; copy_file_range shares extents on filesystems with reflinks"""
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copyfile(src, dst)
+        return
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        remaining = os.fstat(fin.fileno()).st_size
+        try:
+            while remaining > 0:
+                n = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                if n == 0:
+                    break
+                remaining -= n
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def delta_copy(src: str, dst: str, basis: Optional[str] = None, in_place: bool = False,
+               block_size: Optional[int] = None, temp_path: Optional[str] = None,
+               progress: Optional[Callable[[int, int], None]] = None) -> DeltaResult:
+    """Make dst a copy of src, reusing blocks of an older version (basis, default dst).
+
+    With in_place, dst is patched directly and unchanged blocks are not written
+    at all; an interruption leaves dst partly updated until the copy is rerun.
+    Otherwise the basis is first cloned to a temp file next to dst, the temp file
+    is patched (reading moved blocks from the untouched basis), and it is
+    swapped in with os.replace.
+    """
+    basis = basis or dst
+    if in_place and os.path.abspath(basis) != os.path.abspath(dst):
+        raise ValueError("in_place delta copy must use dst as its basis")
+    size = os.path.getsize(src)
+    block_size = block_size or choose_block_size(size)
+    has_basis = os.path.isfile(basis)
+    table = signature(basis, block_size) if has_basis else {}
+    result = DeltaResult(size, block_size)
+    target = dst if in_place else (temp_path or dst + DELTA_PART_SUFFIX)
+
+    with open(src, 'rb') as fin:
+        src_map = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            ops = compute_delta(src_map, table, block_size, in_place)
+            try:
+                if not in_place and has_basis:
+                    _clone(basis, target)
+                elif not in_place or not os.path.exists(target):
+                    open(target, 'wb').close()
+                with open(target, 'r+b') as fout, open(basis if has_basis else target, 'rb') as fbase:
+                    _apply(ops, src_map, fout if in_place else fbase, fout, result, progress)
+                    fout.truncate(size)
+                    fout.flush()
+                    os.fsync(fout.fileno())
+                shutil.copystat(src, target)
+                if not in_place:
+                    os.replace(target, dst)
+            except BaseException:
+                if not in_place and os.path.exists(target):
+                    os.remove(target)
+                raise
+        finally:
+            if size:
+                src_map.close()
+    return result
+
+
+def _apply(ops, src_map, fbase, fout, result: DeltaResult,
+           progress: Optional[Callable[[int, int], None]]) -> None:
+    """Patch fout in place from src and fbase (the old file); blocks already at the right offset are skipped"""
+    for kind, pos, offset, length in ops:
+        if kind == 'copy':
+            result.matched_bytes += length
+            if offset == pos:
+                continue
+        else:
+            result.literal_bytes += length
+        done = 0
+        while done < length:
+            n = min(IO_CHUNK, length - done)
+            if kind == 'copy':
+                fbase.seek(offset + done)
+                data = fbase.read(n)
+            else:
+                data = src_map[pos + done:pos + done + n]
+                # Literal runs are mostly changed data, but skip rewriting whatever is identical
+                fout.seek(pos + done)
+                if fout.read(n) == data:
+                    done += n
+                    continue
+            fout.seek(pos + done)
+            fout.write(data)
+            result.written_bytes += n
+            done += n
+        if progress:
+            progress(pos + length, result.size)
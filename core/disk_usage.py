@@ -0,0 +1,310 @@
+import os
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .scanner import ParallelScanner
+
+DEAD = -2
+
+
+class UsageTree:
+    """Array-backed directory tree with per-node sizes and file counts aggregated upwards.
+
+    Only directories become nodes; files are folded into their directory's own
+    totals, so memory grows with the number of directories, not files. Once
+    max_nodes is reached, deeper directories are folded into their nearest
+    ancestor node instead of getting a node of their own. Slots of folders
+    that rescan() found removed are reused by folders added later, so the
+    arrays stay the size of the largest tree seen rather than growing with
+    every rescan. Children are kept as sibling lists threaded through three
+    more arrays, so adding or removing a folder never rebuilds an index.
+    """
+
+    def __init__(self, root: str, max_nodes: int = 2000000, scanner: Optional[ParallelScanner] = None):
+        self.root = os.path.abspath(root)
+        self.max_nodes = max_nodes
+        self.scanner = scanner or ParallelScanner()
+        self.lock = threading.RLock()
+        self.names: List[str] = []
+        self.parent = array('i')
+        self.own_size = array('q')
+        self.own_files = array('q')
+        self.total_size = array('q')
+        self.total_files = array('q')
+        self.mtime_ns = array('q')
+        self.collapsed = bytearray()
+        # First child of each node and its neighbours among its siblings, -1 where there is none
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.prev_sibling = array('i')
+        self.scanning = False
+        self._free: List[int] = []
+        # Detached during the current rescan; only reusable once its list of stale nodes is done
+        self._released: List[int] = []
+        self._add_node(self.root, -1)
+
+    def __len__(self) -> int:
+        """Number of live nodes"""
+        return len(self.names) - len(self._free) - len(self._released)
+
+    def _add_node(self, name: str, parent: int) -> int:
+        if self._free:
+            node = self._free.pop()
+            self.names[node] = name
+            self.parent[node] = parent
+            for arr in (self.own_size, self.own_files, self.total_size, self.total_files, self.mtime_ns):
+                arr[node] = 0
+            self.collapsed[node] = 0
+        else:
+            node = len(self.names)
+            self.names.append(name)
+            self.parent.append(parent)
+            for arr in (self.own_size, self.own_files, self.total_size, self.total_files, self.mtime_ns):
+                arr.append(0)
+            self.collapsed.append(0)
+            for arr in (self.first_child, self.next_sibling, self.prev_sibling):
+                arr.append(-1)
+        self.first_child[node] = -1
+        self.prev_sibling[node] = -1
+        self.next_sibling[node] = -1
+        if parent >= 0:
+            head = self.first_child[parent]
+            self.next_sibling[node] = head
+            if head >= 0:
+                self.prev_sibling[head] = node
+            self.first_child[parent] = node
+        return node
+
+    def _unlink(self, node: int) -> None:
+        """Take a node out of its parent's list of children"""
+        prev, following = self.prev_sibling[node], self.next_sibling[node]
+        if prev >= 0:
+            self.next_sibling[prev] = following
+        else:
+            self.first_child[self.parent[node]] = following
+        if following >= 0:
+            self.prev_sibling[following] = prev
+
+    def _kids(self, node: int) -> List[int]:
+        kids = []
+        kid = self.first_child[node]
+        while kid >= 0:
+            kids.append(kid)
+            kid = self.next_sibling[kid]
+        return kids
+
+    def is_live(self, node: int) -> bool:
+        return 0 <= node < len(self.names) and (node == 0 or self.parent[node] >= 0)
+
+    def find(self, path: str) -> Optional[int]:
+        """Node of a directory below the root, or None if it has none (e.g. removed or folded)"""
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel.startswith(os.pardir):
+            return None
+        node = 0
+        with self.lock:
+            for name in ([] if rel == os.curdir else rel.split(os.sep)):
+                node = next((k for k in self._kids(node) if self.names[k] == name), None)
+                if node is None:
+                    return None
+        return node
+
+    def _propagate(self, node: int, size: int, files: int) -> None:
+        while node >= 0:
+            self.total_size[node] += size
+            self.total_files[node] += files
+            node = self.parent[node]
+
+    def path(self, node: int) -> str:
+        """Rebuild the absolute path of a node from the parent chain"""
+        parts = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = self.parent[node]
+        return os.path.join(self.root, *reversed(parts))
+
+    def children(self, node: int) -> List[int]:
+        """Live child nodes, largest first"""
+        with self.lock:
+            kids = self._kids(node)
+        kids.sort(key=lambda c: self.total_size[c], reverse=True)
+        return kids
+
+    def _scan_into(self, paths: Sequence[str], nodes: Sequence[int],
+                   progress: Optional[Callable[['UsageTree'], None]] = None) -> None:
+        """Crawl the given directories, attaching what is found below the given nodes"""
+        frontier: Dict[str, int] = dict(zip(paths, nodes))
+        for listing in self.scanner.walk_dirs(list(paths)):
+            with self.lock:
+                node = frontier.pop(listing.path)
+                size = sum(f.size for f in listing.files)
+                self.own_size[node] += size
+                self.own_files[node] += len(listing.files)
+                if not self.collapsed[node]:
+                    self.mtime_ns[node] = listing.mtime_ns
+                self._propagate(node, size, len(listing.files))
+                for sub in listing.subdirs:
+                    if len(self) < self.max_nodes:
+                        frontier[sub] = self._add_node(os.path.basename(sub), node)
+                    else:
+                        self.collapsed[node] = 1
+                        frontier[sub] = node
+            if progress:
+                progress(self)
+
+    def scan(self, progress: Optional[Callable[['UsageTree'], None]] = None) -> 'UsageTree':
+        """Full scan of the root; totals are consistent at every progress callback"""
+        self.scanning = True
+        try:
+            self._scan_into([self.root], [0], progress)
+        finally:
+            self.scanning = False
+        return self
+
+    def _detach(self, node: int) -> None:
+        """Remove a node's subtree from the totals and mark it dead"""
+        parent = self.parent[node]
+        self._propagate(parent, -self.total_size[node], -self.total_files[node])
+        self._unlink(node)
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            stack.extend(self._kids(n))
+            self.first_child[n] = -1
+            self.parent[n] = DEAD
+            self.names[n] = ""
+            self._released.append(n)
+
+    def rescan(self, workers: int = 8, progress: Optional[Callable[['UsageTree'], None]] = None) -> int:
+        """Re-list only directories whose mtime changed; returns how many were refreshed.
+
+        Dropping or adding a file changes its directory's mtime, so unchanged
+        directories keep their totals. Files rewritten in place are only picked
+        up by a full scan().
+        """
+        with self.lock:
+            live = [n for n in range(len(self.names)) if self.parent[n] != DEAD]
+            paths = [self.path(n) for n in live]
+
+        def changed(item):
+            node, path = item
+            try:
+                return self.collapsed[node] or os.stat(path).st_mtime_ns != self.mtime_ns[node]
+            except OSError:
+                return True
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bb-usage") as executor:
+            flags = list(executor.map(changed, zip(live, paths)))
+        stale = [(node, path) for (node, path), flag in zip(zip(live, paths), flags) if flag]
+
+        self.scanning = True
+        try:
+            refreshed = 0
+            for node, path in stale:
+                with self.lock:
+                    if self.parent[node] == DEAD:
+                        continue
+                    if not os.path.isdir(path):
+                        if node == 0:
+                            continue
+                        self._detach(node)
+                        continue
+                    if self.collapsed[node]:
+                        # Folded subtrees have no per-directory state to compare; start over
+                        for kid in self._kids(node):
+                            self._detach(kid)
+                        self._propagate(node, -self.own_size[node], -self.own_files[node])
+                        self.own_size[node] = 0
+                        self.own_files[node] = 0
+                        self.collapsed[node] = 0
+                        refresh = [path]
+                    else:
+                        refresh = self._refresh_directory(node, path)
+                refreshed += 1
+                for sub_path in refresh:
+                    with self.lock:
+                        sub_node = node if sub_path == path else self._add_node(os.path.basename(sub_path), node)
+                    self._scan_into([sub_path], [sub_node], progress)
+            return refreshed
+        finally:
+            with self.lock:
+                self._free.extend(self._released)
+                self._released = []
+            self.scanning = False
+
+    def _refresh_directory(self, node: int, path: str) -> List[str]:
+        """Re-read one directory's files; returns new subdirectories that still need scanning"""
+        size = files = 0
+        subdirs = set()
+        try:
+            self.mtime_ns[node] = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            size += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        self._propagate(node, size - self.own_size[node], files - self.own_files[node])
+        self.own_size[node] = size
+        self.own_files[node] = files
+        known = {}
+        for kid in self._kids(node):
+            known[self.names[kid]] = kid
+        for name, kid in known.items():
+            if name not in subdirs:
+                self._detach(kid)
+        return [os.path.join(path, name) for name in sorted(subdirs - set(known))]
+
+
+def squarify(sizes: Sequence[float], x: float, y: float, w: float, h: float) -> List[Tuple[float, float, float, float]]:
+    """Squarified treemap layout (Bruls et al.); sizes must be sorted largest first"""
+    total = float(sum(sizes))
+    if total <= 0 or w <= 0 or h <= 0:
+        return [(x, y, 0.0, 0.0) for _ in sizes]
+    scale = w * h / total
+    areas = [s * scale for s in sizes]
+    rects: List[Tuple[float, float, float, float]] = []
+
+    def worst(row: List[float], side: float) -> float:
+        s = sum(row)
+        if s <= 0:
+            return float('inf')
+        return max(max(side * side * r / (s * s), (s * s) / (side * side * r)) for r in row if r > 0)
+
+    i = 0
+    while i < len(areas):
+        side = min(w, h)
+        row = [areas[i]]
+        i += 1
+        while i < len(areas) and worst(row + [areas[i]], side) <= worst(row, side):
+            row.append(areas[i])
+            i += 1
+        row_total = sum(row)
+        if w >= h:
+            # Lay the row out as a column on the left
+            col_w = row_total / h if h else 0.0
+            cy = y
+            for area in row:
+                rh = area / col_w if col_w else 0.0
+                rects.append((x, cy, col_w, rh))
+                cy += rh
+            x += col_w
+            w -= col_w
+        else:
+            row_h = row_total / w if w else 0.0
+            cx = x
+            for area in row:
+                rw = area / row_h if row_h else 0.0
+                rects.append((cx, y, rw, row_h))
+                cx += rw
+            y += row_h
+            h -= row_h
+    return rects
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .hash_cache import HashCache, get_hash_cache
+from .scanner import ParallelScanner, ScanEntry
+
+PARTIAL_BYTES = 64 * 1024
+
+
+class DuplicateGroup(NamedTuple):
+    """Files with identical content"""
+    size: int
+    digest: str
+    paths: List[str]
+
+    @property
+    def wasted_bytes(self) -> int:
+        return self.size * (len(self.paths) - 1)
+
+
+class DuplicateReport:
+    """Outcome of a duplicate search plus I/O accounting for each stage"""
+
+    def __init__(self):
+        self.groups: List[DuplicateGroup] = []
+        self.files_scanned = 0
+        self.total_bytes = 0
+        self.bytes_read = 0
+        self.partial_hashed = 0
+        self.full_hashed = 0
+
+    @property
+    def wasted_bytes(self) -> int:
+        return sum(group.wasted_bytes for group in self.groups)
+
+    @property
+    def read_fraction(self) -> float:
+        return self.bytes_read / self.total_bytes if self.total_bytes else 0.0
+
+
+class DuplicateFinder:
+    """Finds duplicate files by size, then a head/tail hash, then a full BLAKE2 hash"""
+
+    def __init__(self, scanner: Optional[ParallelScanner] = None, hash_workers: int = 4, min_size: int = 1,
+                 hash_cache: Optional[HashCache] = None):
+        self.scanner = scanner or ParallelScanner()
+        self.hash_workers = hash_workers
+        self.min_size = min_size
+        # Full digests live in the shared content-hash cache; head/tail digests are only useful here
+        self.hash_cache = hash_cache if hash_cache is not None else get_hash_cache()
+        self.partial_cache: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+        self._bytes_read = 0
+
+    def _count(self, n: int) -> None:
+        with self._lock:
+            self._bytes_read += n
+
+    def partial_hash(self, entry: ScanEntry) -> Optional[str]:
+        """Hash the first and last PARTIAL_BYTES of a file"""
+        key = (entry.path, entry.size, entry.mtime_ns)
+        with self._lock:
+            digest = self.partial_cache.get(key)
+        if digest is not None:
+            return digest
+        h = hashlib.blake2b(digest_size=16)
+        try:
+            with open(entry.path, 'rb') as f:
+                head = f.read(PARTIAL_BYTES)
+                h.update(head)
+                read = len(head)
+                if entry.size > 2 * PARTIAL_BYTES:
+                    f.seek(-PARTIAL_BYTES, os.SEEK_END)
+                    tail = f.read(PARTIAL_BYTES)
+                    h.update(tail)
+                    read += len(tail)
+                elif entry.size > PARTIAL_BYTES:
+                    rest = f.read()
+                    h.update(rest)
+                    read += len(rest)
+        except OSError:
+            return None
+        self._count(read)
+        digest = h.hexdigest()
+        with self._lock:
+            self.partial_cache[key] = digest
+        return digest
+
+    def full_hash(self, entry: ScanEntry) -> Optional[str]:
+        """Full BLAKE2b digest from the shared hash cache"""
+        digest, cached = self.hash_cache.get_or_compute(entry.path)
+        if digest is not None and not cached:
+            self._count(entry.size)
+        return digest
+
+    def _refine(self, groups: Iterable[List[ScanEntry]], hasher: Callable[[ScanEntry], Optional[str]]
+                ) -> List[Tuple[str, List[ScanEntry]]]:
+        """Split candidate groups by hasher(), keeping only buckets with 2+ members"""
+        groups = list(groups)
+        flat = [entry for group in groups for entry in group]
+        with ThreadPoolExecutor(max_workers=self.hash_workers, thread_name_prefix="bb-hash") as executor:
+            digests = dict(zip((e.path for e in flat), executor.map(hasher, flat)))
+        refined = []
+        for group in groups:
+            buckets: Dict[str, List[ScanEntry]] = defaultdict(list)
+            for entry in group:
+                digest = digests[entry.path]
+                if digest is not None:
+                    buckets[digest].append(entry)
+            refined.extend((digest, bucket) for digest, bucket in buckets.items() if len(bucket) > 1)
+        return refined
+
+    def find(self, roots: Union[str, Iterable[str]], progress: Optional[Callable[[str, int], None]] = None
+             ) -> DuplicateReport:
+        """Return groups of identical files below the given roots"""
+        report = DuplicateReport()
+        self._bytes_read = 0
+
+        # Stage 1: group by size; hard links to the same inode are one file, not duplicates
+        by_size: Dict[int, List[ScanEntry]] = defaultdict(list)
+        seen_inodes = set()
+        for entry in self.scanner.walk(roots):
+            if entry.size < self.min_size:
+                continue
+            if entry.inode and (entry.dev, entry.inode) in seen_inodes:
+                continue
+            seen_inodes.add((entry.dev, entry.inode))
+            report.files_scanned += 1
+            report.total_bytes += entry.size
+            by_size[entry.size].append(entry)
+            if progress and report.files_scanned % 1000 == 0:
+                progress("scan", report.files_scanned)
+        candidates = [group for group in by_size.values() if len(group) > 1]
+
+        # Stage 2: head/tail hash
+        if progress:
+            progress("partial", sum(len(g) for g in candidates))
+        partial_groups = self._refine(candidates, self.partial_hash)
+        report.partial_hashed = sum(len(g) for g in candidates)
+
+        # Stage 3: full hash, skipped when the partial hash already covered the whole file
+        needs_full = []
+        for digest, group in partial_groups:
+            if group[0].size <= 2 * PARTIAL_BYTES:
+                report.groups.append(DuplicateGroup(group[0].size, digest, sorted(e.path for e in group)))
+            else:
+                needs_full.append(group)
+        if progress:
+            progress("full", sum(len(g) for g in needs_full))
+        for digest, group in self._refine(needs_full, self.full_hash):
+            report.groups.append(DuplicateGroup(group[0].size, digest, sorted(e.path for e in group)))
+        report.full_hashed = sum(len(g) for g in needs_full)
+
+        report.groups.sort(key=lambda g: g.wasted_bytes, reverse=True)
+        report.bytes_read = self._bytes_read
+        self.hash_cache.flush()
+        return report
+
+
+def find_duplicates(roots: Union[str, Iterable[str]], min_size: int = 1) -> DuplicateReport:
+    """Convenience wrapper around DuplicateFinder"""
+    return DuplicateFinder(min_size=min_size).find(roots)
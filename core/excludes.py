@@ -0,0 +1,241 @@
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Folders that are never worth searching: version control, dependency and cache trees
+DEFAULT_EXCLUDES = (
+    '.git/', '.hg/', '.svn/', 'node_modules/', '__pycache__/', '.venv/', 'venv/',
+    '.tox/', '.mypy_cache/', '.pytest_cache/', '.gradle/', '.idea/',
+)
+IGNORE_FILES = ('.gitignore', '.bbignore')
+
+
+def default_exclude_file(app_name: str = "BrontoBase") -> str:
+    """User-wide exclude patterns, one per line in .gitignore syntax"""
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "excludes")
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate one gitignore glob (already stripped of !, leading / and trailing /) to a regex"""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**' and i + 2 == n:
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2 if pattern[i + 1:i + 2] in ('!', ']') else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+class IgnoreRule:
+    """One compiled line of an ignore file"""
+    __slots__ = ('negate', 'dir_only', 'regex')
+
+    def __init__(self, negate: bool, dir_only: bool, regex):
+        self.negate = negate
+        self.dir_only = dir_only
+        self.regex = regex
+
+
+def compile_rules(lines: Iterable[str]) -> List[IgnoreRule]:
+    """Compile .gitignore lines; patterns are matched against '/'-separated paths relative to the file's folder"""
+    rules = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip('\r')
+        if not line.endswith('\\ '):
+            line = line.rstrip(' ')
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the ignore file's folder
+        anchored = '/' in line
+        line = line.lstrip('/')
+        body = _glob_to_regex(line)
+        if not anchored:
+            body = '(?:.*/)?' + body
+        rules.append(IgnoreRule(negate, dir_only, re.compile(body + r'\Z', re.IGNORECASE if os.name == 'nt' else 0)))
+    return rules
+
+
+class ExcludeContext:
+    """Rules in force inside one folder: the global patterns plus every ignore file from its ancestors"""
+    __slots__ = ('engine', 'layers')
+
+    def __init__(self, engine: "ExcludeEngine", layers: Tuple[Tuple[int, Sequence[IgnoreRule]], ...]):
+        self.engine = engine
+        self.layers = layers
+
+    def excluded(self, path: str, is_dir: bool) -> bool:
+        """Whether an entry of this folder should be skipped (for a folder: its whole subtree)"""
+        result = self.engine.excluded_globally(os.path.basename(path), is_dir)
+        # Deeper ignore files come later and override shallower ones, as in git
+        for prefix_len, rules in self.layers:
+            rel = path[prefix_len:].replace(os.sep, '/')
+            for rule in rules:
+                if (is_dir or not rule.dir_only) and rule.regex.match(rel):
+                    result = not rule.negate
+        return result
+
+    def enter(self, folder: str, names: Iterable[str]) -> "ExcludeContext":
+        """Context for a folder whose listing contains names; picks up its own ignore files"""
+        rules = self.engine.rules_in(folder, names)
+        if not rules:
+            return self
+        # Paths below the folder are matched relative to it, so keep the length of its prefix
+        return ExcludeContext(self.engine, self.layers + ((len(os.path.join(folder, '')), rules),))
+
+
+class ExcludeEngine:
+    """Compiles global exclude globs and per-folder .gitignore / .bbignore files for crawls.
+
+    Scanners ask an ExcludeContext about each entry while listing a folder and
+    never descend into excluded folders, so a pruned node_modules costs one
+    name check instead of a full crawl. Ignore files are compiled once and
+    cached until their mtime changes.
+    """
+
+    def __init__(self, patterns: Optional[Sequence[str]] = None, ignore_files: Sequence[str] = IGNORE_FILES,
+                 exclude_file: Optional[str] = None):
+        self.patterns = list(DEFAULT_EXCLUDES if patterns is None else patterns)
+        if exclude_file and os.path.exists(exclude_file):
+            with open(exclude_file, encoding='utf-8', errors='replace') as f:
+                self.patterns.extend(f.read().splitlines())
+        self.global_rules = compile_rules(self.patterns)
+        # Without negations the global rules collapse into one regex per entry kind
+        self._global_dir = self._global_file = None
+        if not any(rule.negate for rule in self.global_rules):
+            self._global_dir = self._combine(self.global_rules)
+            self._global_file = self._combine([r for r in self.global_rules if not r.dir_only])
+        self.ignore_files = tuple(ignore_files)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[int, List[IgnoreRule]]] = {}
+
+    @staticmethod
+    def _combine(rules: List[IgnoreRule]):
+        if not rules:
+            return re.compile(r'(?!)')
+        return re.compile('|'.join(f'(?:{r.regex.pattern})' for r in rules), rules[0].regex.flags)
+
+    def excluded_globally(self, name: str, is_dir: bool) -> bool:
+        combined = self._global_dir if is_dir else self._global_file
+        if combined is not None:
+            return combined.match(name) is not None
+        result = False
+        for rule in self.global_rules:
+            if (is_dir or not rule.dir_only) and rule.regex.match(name):
+                result = not rule.negate
+        return result
+
+    def _load(self, path: str) -> List[IgnoreRule]:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                rules = compile_rules(f)
+        except OSError:
+            rules = []
+        with self._lock:
+            self._cache[path] = (mtime_ns, rules)
+        return rules
+
+    def rules_in(self, folder: str, names: Iterable[str]) -> List[IgnoreRule]:
+        """Rules from the ignore files among a folder's entry names"""
+        present = set(names)
+        rules: List[IgnoreRule] = []
+        for ignore_file in self.ignore_files:
+            if ignore_file in present:
+                rules.extend(self._load(os.path.join(folder, ignore_file)))
+        return rules
+
+    def root_context(self) -> ExcludeContext:
+        return ExcludeContext(self, ())
+
+    def _contexts_down_to(self, folder: str):
+        """(folder, context inside it) for every folder from the filesystem root down to folder"""
+        chain = []
+        current = folder
+        while True:
+            chain.append(current)
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+        context = self.root_context()
+        for folder in reversed(chain):
+            context = context.enter(folder, [n for n in self.ignore_files if os.path.isfile(os.path.join(folder, n))])
+            yield folder, context
+
+    def context_for(self, folder: str) -> ExcludeContext:
+        """Context a crawl of folder starts from: the ignore files of its ancestors.
+
+        The folder's own ignore files are left out because a scanner picks
+        them up with enter() when it lists the folder.
+        """
+        folder = os.path.abspath(folder)
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return self.root_context()
+        return list(self._contexts_down_to(parent))[-1][1]
+
+    def is_excluded(self, path: str) -> bool:
+        """Whether path or any of its ancestors is excluded (for paths reached without a crawl)"""
+        path = os.path.abspath(path)
+        contexts = list(self._contexts_down_to(os.path.dirname(path)))
+        # Each folder's context decides about the next path component below it
+        for i, (folder, context) in enumerate(contexts):
+            child = contexts[i + 1][0] if i + 1 < len(contexts) else path
+            if context.excluded(child, is_dir=child != path or os.path.isdir(path)):
+                return True
+        return False
+
+
+_default_engine: Optional[ExcludeEngine] = None
+
+
+def get_exclude_engine() -> ExcludeEngine:
+    """Process-wide engine with the default excludes plus the user's exclude file"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = ExcludeEngine(exclude_file=default_exclude_file())
+    return _default_engine
@@ -0,0 +1,336 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .excludes import get_exclude_engine
+from .scanner import ParallelScanner
+from .tracing import traced
+
+
+class IndexedFile(NamedTuple):
+    """One row of the filename index"""
+    path: str
+    name: str
+    size: int
+    mtime_ns: int
+    is_dir: bool
+
+
+class ChangeSet(NamedTuple):
+    """Paths added, updated or removed by an index update, passed to listeners"""
+    added: List[str]
+    updated: List[str]
+    removed: List[str]
+
+
+# Rows written per transaction while building; the lock is released between batches
+BUILD_BATCH = 5000
+
+
+def default_index_path(app_name: str = "BrontoBase") -> str:
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "index.db")
+
+
+# path itself or anything below it, as a case-sensitive range the primary key index can answer
+# (LIKE ignores ASCII case, so it would also match sibling folders differing only in case)
+SUBTREE = "(path = ? OR (path >= ? AND path < ?))"
+
+
+def _subtree_args(path: str) -> Tuple[str, str, str]:
+    """Arguments for SUBTREE: the path, then the bounds of every string starting with path + separator"""
+    prefix = os.path.join(path, '')
+    return path, prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _ext(name: str) -> str:
+    return os.path.splitext(name)[1][1:].lower()
+
+
+class FileIndex:
+    """SQLite index of file and folder names under chosen roots.
+
+    build() crawls a root with the parallel scanner; refresh() re-lists only
+    directories whose mtime changed since they were indexed, and
+    update_directory() re-lists one directory on demand (e.g. from a file
+    system watcher). Every update is reported to listeners as a ChangeSet so
+    derived views can update incrementally. The default scanner prunes
+    excluded folders (.git, node_modules, .gitignore rules), so they are never
+    indexed.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, scanner: Optional[ParallelScanner] = None):
+        self.db_path = db_path or default_index_path()
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.scanner = scanner or ParallelScanner(excludes=get_exclude_engine())
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[ChangeSet], None]] = []
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                parent TEXT NOT NULL,
+                name TEXT NOT NULL,
+                name_lower TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                is_dir INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_parent ON files (parent);
+            CREATE INDEX IF NOT EXISTS files_ext ON files (ext);
+            CREATE INDEX IF NOT EXISTS files_size ON files (size);
+            CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime_ns);
+            CREATE TABLE IF NOT EXISTS roots (
+                path TEXT PRIMARY KEY,
+                indexed_at REAL NOT NULL
+            );
+        """)
+        self._db.commit()
+        # Replaced, never mutated, so readers can copy it without the lock
+        self._roots: List[str] = [r[0] for r in self._db.execute("SELECT path FROM roots ORDER BY path")]
+
+    # ---- listeners ----
+    def add_listener(self, callback: Callable[[ChangeSet], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[ChangeSet], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, changes: ChangeSet) -> None:
+        if changes.added or changes.updated or changes.removed:
+            for callback in list(self._listeners):
+                callback(changes)
+
+    # ---- writing ----
+    @staticmethod
+    def _dir_row(path: str, mtime_ns: int) -> tuple:
+        name = os.path.basename(path) or path
+        return (path, os.path.dirname(path), name, name.lower(), "", 0, mtime_ns, 1)
+
+    @staticmethod
+    def _file_rows(listing) -> List[tuple]:
+        rows = []
+        for f in listing.files:
+            name = os.path.basename(f.path)
+            rows.append((f.path, listing.path, name, name.lower(), _ext(name), f.size, f.mtime_ns, 0))
+        return rows
+
+    def _forget_tree(self, path: str) -> List[str]:
+        """Delete a path and everything below it; returns the deleted paths"""
+        rows = self._db.execute(f"SELECT path FROM files WHERE {SUBTREE}", _subtree_args(path)).fetchall()
+        self._db.execute(f"DELETE FROM files WHERE {SUBTREE}", _subtree_args(path))
+        return [r[0] for r in rows]
+
+    @traced("file_index.build")
+    def build(self, root: str, progress: Optional[Callable[[int], None]] = None) -> int:
+        """(Re)index everything below root and register it as an indexed root; returns the number of entries.
+
+        The crawl runs without the lock and rows are committed in batches, so
+        searches and roots() stay responsive while a large root is indexed.
+        Entries that disappeared are removed once the crawl is complete.
+        """
+        root = os.path.abspath(root)
+        count, changes = self._crawl(root, progress)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO roots VALUES (?, ?)", (root, time.time()))
+            self._db.commit()
+            if root not in self._roots:
+                self._roots = sorted(self._roots + [root])
+        self._notify(changes)
+        return count
+
+    def _crawl(self, root: str, progress: Optional[Callable[[int], None]] = None) -> Tuple[int, ChangeSet]:
+        """Index everything below root without registering it as a root"""
+        count = 0
+        batch: List[tuple] = []
+        seen: Dict[str, tuple] = {}
+        with self._lock:
+            before = {r[0]: (r[1], r[2]) for r in self._db.execute(
+                f"SELECT path, size, mtime_ns FROM files WHERE {SUBTREE}", _subtree_args(root))}
+        for listing in self.scanner.walk_dirs(root):
+            batch.append(self._dir_row(listing.path, listing.mtime_ns))
+            batch.extend(self._file_rows(listing))
+            if len(batch) >= BUILD_BATCH:
+                count += self._commit_batch(batch, seen)
+                batch = []
+                if progress:
+                    progress(count)
+        count += self._commit_batch(batch, seen)
+        removed = [p for p in before if p not in seen]
+        with self._lock:
+            self._db.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+            self._db.commit()
+        added = [p for p in seen if p not in before]
+        updated = [p for p, old in before.items() if p in seen and not seen[p][1] and seen[p][0] != old]
+        return count, ChangeSet(added, updated, removed)
+
+    def _commit_batch(self, rows: List[tuple], seen: Dict[str, tuple]) -> int:
+        with self._lock:
+            count = self._insert(rows, seen)
+            self._db.commit()
+        return count
+
+    def _insert(self, rows: List[tuple], seen: Dict[str, tuple]) -> int:
+        self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        for row in rows:
+            seen[row[0]] = ((row[5], row[6]), row[7])
+        return len(rows)
+
+    def update_directory(self, path: str) -> ChangeSet:
+        """Re-list one directory (not its subdirectories' contents) and apply the difference"""
+        path = os.path.abspath(path)
+        with self._lock:
+            known = {r[0]: (r[1], r[2], r[3]) for r in self._db.execute(
+                "SELECT path, size, mtime_ns, is_dir FROM files WHERE parent = ?", (path,))}
+            excludes = self.scanner.excludes
+            excluded = excludes is not None and excludes.is_excluded(path)
+            # An excluded folder is treated like a deleted one, dropping anything indexed before the rule existed
+            listing = self.scanner.scan_dir(path) if os.path.isdir(path) and not excluded else None
+            added: List[str] = []
+            updated: List[str] = []
+            removed: List[str] = []
+            if listing is None:
+                removed = self._forget_tree(path)
+            else:
+                rows = self._file_rows(listing)
+                # Known subdirectories keep their stored mtime so refresh() still visits them
+                for sub in listing.subdirs:
+                    if sub not in known:
+                        try:
+                            rows.append(self._dir_row(sub, os.stat(sub).st_mtime_ns))
+                        except OSError:
+                            continue
+                current = set()
+                for row in rows:
+                    current.add(row[0])
+                    old = known.get(row[0])
+                    if old is None:
+                        added.append(row[0])
+                    elif (old[0], old[1]) != (row[5], row[6]):
+                        updated.append(row[0])
+                    else:
+                        continue
+                    self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+                current.update(listing.subdirs)
+                for gone in set(known) - current:
+                    removed.extend(self._forget_tree(gone))
+                self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 self._dir_row(path, listing.mtime_ns))
+            self._db.commit()
+        changes = ChangeSet(added, updated, removed)
+        self._notify(changes)
+        return changes
+
+    @traced("file_index.refresh")
+    def refresh(self, root: Optional[str] = None) -> int:
+        """Re-list directories whose mtime changed (all roots by default); returns how many"""
+        with self._lock:
+            if root is None:
+                dirs = list(self._db.execute("SELECT path, mtime_ns FROM files WHERE is_dir = 1"))
+            else:
+                root = os.path.abspath(root)
+                dirs = list(self._db.execute(
+                    f"SELECT path, mtime_ns FROM files WHERE is_dir = 1 AND {SUBTREE}", _subtree_args(root)))
+        stale = []
+        for path, mtime_ns in dirs:
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    stale.append(path)
+            except OSError:
+                stale.append(path)
+        # Parents first, so a removed tree is dropped before its children are visited
+        stale.sort(key=len)
+        for path in stale:
+            with self._lock:
+                still_indexed = self._db.execute("SELECT 1 FROM files WHERE path = ?", (path,)).fetchone()
+            if still_indexed:
+                changes = self.update_directory(path)
+                for new_path in changes.added:
+                    if os.path.isdir(new_path) and not os.path.islink(new_path):
+                        # Part of an existing root, so crawled without becoming a root of its own
+                        self._notify(self._crawl(new_path)[1])
+        return len(stale)
+
+    # ---- reading ----
+    def roots(self) -> List[str]:
+        # Served from memory so the GUI thread never waits for a build holding the lock
+        return list(self._roots)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def get(self, path: str) -> Optional[IndexedFile]:
+        with self._lock:
+            row = self._db.execute("SELECT path, name, size, mtime_ns, is_dir FROM files WHERE path = ?",
+                                   (os.path.abspath(path),)).fetchone()
+        return IndexedFile(row[0], row[1], row[2], row[3], bool(row[4])) if row else None
+
+    @traced("file_index.search")
+    def search(self, name_contains: Optional[str] = None, exts: Optional[Sequence[str]] = None,
+               min_size: Optional[int] = None, max_size: Optional[int] = None,
+               modified_after_ns: Optional[int] = None, modified_before_ns: Optional[int] = None,
+               under: Optional[Union[str, Iterable[str]]] = None, include_dirs: bool = False,
+               name_glob: Optional[str] = None, limit: Optional[int] = None) -> List[IndexedFile]:
+        """Files matching every given condition; name matching is case-insensitive"""
+        clauses = []
+        args: List[object] = []
+        if not include_dirs:
+            clauses.append("is_dir = 0")
+        if name_contains:
+            clauses.append("instr(name_lower, ?) > 0")
+            args.append(name_contains.lower())
+        if name_glob:
+            clauses.append("name_lower GLOB ?")
+            args.append(name_glob.lower())
+        if exts:
+            clauses.append(f"ext IN ({', '.join('?' * len(exts))})")
+            args.extend(e.lower().lstrip('.') for e in exts)
+        if min_size is not None:
+            clauses.append("size >= ?")
+            args.append(min_size)
+        if max_size is not None:
+            clauses.append("size <= ?")
+            args.append(max_size)
+        if modified_after_ns is not None:
+            clauses.append("mtime_ns >= ?")
+            args.append(modified_after_ns)
+        if modified_before_ns is not None:
+            clauses.append("mtime_ns <= ?")
+            args.append(modified_before_ns)
+        if under:
+            roots = [under] if isinstance(under, str) else list(under)
+            parts = []
+            for root in roots:
+                root = os.path.abspath(root)
+                parts.append(SUBTREE)
+                args.extend(_subtree_args(root))
+            clauses.append("(" + " OR ".join(parts) + ")")
+        query = "SELECT path, name, size, mtime_ns, is_dir FROM files"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._db.execute(query, args).fetchall()
+        return [IndexedFile(r[0], r[1], r[2], r[3], bool(r[4])) for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_default_index: Optional[FileIndex] = None
+
+
+def get_file_index() -> FileIndex:
+    """Process-wide filename index"""
+    global _default_index
+    if _default_index is None:
+        _default_index = FileIndex()
+    return _default_index
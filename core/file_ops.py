@@ -1,14 +1,27 @@
 import subprocess
 import os
+import json
+import shutil
+import stat
+import time
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .delta import delta_copy
+from .tracing import traced
 
 def create_file(path):
     if os.path.exists(path):
         raise FileExistsError(f"File already exists: {path}")
     subprocess.run(["powershell", "New-Item", path, "-ItemType", "File"], check=True)
 
-def delete_file(path):
+def delete_file(path, use_trash=False):
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
+    if use_trash:
+        from .trash import get_trash_store
+        return get_trash_store().trash(path)
     subprocess.run(["powershell", "Remove-Item", path, "-Force"], check=True)
 
 def rename_file(src, dst):
@@ -20,3 +33,509 @@ def move_file(src, dst):
     if not os.path.exists(src):
         raise FileNotFoundError(f"Source not found: {src}")
     subprocess.run(["powershell", "Move-Item", src, dst], check=True)
+
+
+# ---- Journaled batch operations ----
+BACKUP_SUFFIX = ".bbjournal-bak"
+PART_SUFFIX = ".bbjournal-part"
+COPY_PART_SUFFIX = ".bbcopy-part"
+CHECKPOINT_SUFFIX = ".ckpt"
+RESUMABLE_CHUNK = 8 * 1024 * 1024
+RESUMABLE_THRESHOLD = 64 * 1024 * 1024
+DELTA_THRESHOLD = 16 * 1024 * 1024
+
+
+def default_journal_dir(app_name="BrontoBase"):
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "journals")
+
+
+def _remove(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _copy_atomic(src, dst, basis=None):
+    """Copy a file or tree next to dst, then swap it into place in one rename.
+
+    When basis is an older version of a large file, only the changed blocks are
+    read from src (see core.delta).
+    """
+    part = dst + PART_SUFFIX
+    if os.path.isfile(src) and not os.path.islink(src):
+        size = os.path.getsize(src)
+        if basis and size >= DELTA_THRESHOLD and os.path.isfile(basis) and not os.path.islink(basis):
+            delta_copy(src, dst, basis=basis, temp_path=part)
+            return
+        if size >= RESUMABLE_THRESHOLD:
+            copy_file_resumable(src, dst)
+            return
+    if os.path.lexists(part):
+        _remove(part)
+    if os.path.isdir(src) and not os.path.islink(src):
+        shutil.copytree(src, part, symlinks=True)
+    else:
+        shutil.copy2(src, part, follow_symlinks=False)
+    os.replace(part, dst)
+
+
+@traced("file_ops.copy_item")
+def copy_item(src, dst):
+    """Copy a file or folder with the native engine, replacing dst atomically and keeping timestamps"""
+    _copy_atomic(src, dst, basis=dst if os.path.isfile(dst) else None)
+
+
+# ---- Resumable large-file copy ----
+def _chunk_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _load_checkpoint(ckpt_path, src_stat, chunk_size):
+    """Return the saved copy state if it belongs to this exact source file"""
+    try:
+        with open(ckpt_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (state.get('size') != src_stat.st_size or state.get('mtime_ns') != src_stat.st_mtime_ns
+            or state.get('chunk_size') != chunk_size):
+        return None
+    return state
+
+
+def _save_checkpoint(ckpt_path, state):
+    tmp = ckpt_path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, ckpt_path)
+
+
+@traced("file_ops.copy_file_resumable")
+def copy_file_resumable(src, dst, chunk_size=RESUMABLE_CHUNK, verify=True, checkpoint_every=4, progress=None):
+    """Copy one file through a temp file plus a sidecar checkpoint of finished chunks.
+
+    A later call with the same arguments continues from the last checkpointed
+    chunk instead of starting over. With verify, each chunk's hash is stored
+    and the last checkpointed chunk is re-checked before resuming. The result
+    is moved into place with os.replace once complete.
+    """
+    src_stat = os.stat(src)
+    part = dst + COPY_PART_SUFFIX
+    ckpt = part + CHECKPOINT_SUFFIX
+    state = _load_checkpoint(ckpt, src_stat, chunk_size) if os.path.exists(part) else None
+    if state is None:
+        state = {'src': src, 'size': src_stat.st_size, 'mtime_ns': src_stat.st_mtime_ns,
+                 'chunk_size': chunk_size, 'offset': 0, 'hashes': []}
+        with open(part, 'wb'):
+            pass
+
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(src, 'rb', buffering=0) as fin, open(part, 'r+b', buffering=0) as fout:
+        # Step back past any checkpointed chunk that no longer matches what is on disk
+        while verify and state['hashes']:
+            last = len(state['hashes']) - 1
+            fout.seek(last * chunk_size)
+            n = fout.readinto(buf)
+            if state['offset'] == last * chunk_size + n and _chunk_digest(view[:n]) == state['hashes'][last]:
+                break
+            state['hashes'].pop()
+            state['offset'] = len(state['hashes']) * chunk_size
+        offset = state['offset']
+        fout.truncate(offset)
+        fin.seek(offset)
+        fout.seek(offset)
+        since_checkpoint = 0
+        while True:
+            n = fin.readinto(buf)
+            if not n:
+                break
+            fout.write(view[:n])
+            offset += n
+            if verify:
+                state['hashes'].append(_chunk_digest(view[:n]))
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                os.fsync(fout.fileno())
+                state['offset'] = offset
+                _save_checkpoint(ckpt, state)
+                since_checkpoint = 0
+            if progress:
+                progress(offset, src_stat.st_size)
+        os.fsync(fout.fileno())
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+    if os.path.exists(ckpt):
+        os.remove(ckpt)
+    return dst
+
+
+class OperationJournal:
+    """Write-ahead journal (JSON lines) for a batch of copy/move steps.
+
+    The plan is fsynced before any step runs. Completion records are flushed
+    immediately but only fsynced every sync_every records or sync_interval
+    seconds; steps lost from the tail after a crash are re-checked on resume,
+    which is safe because every step can tell whether it already happened.
+    """
+
+    def __init__(self, path, sync_every=32, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.steps = []
+        self.done = set()
+        self.failed = {}
+        self.finished = False
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _append(self, record, force_sync=False):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        now = time.monotonic()
+        if force_sync or self._unsynced >= self.sync_every or now - self._last_sync >= self.sync_interval:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = now
+
+    def begin(self, steps):
+        """Record the planned steps as (op, src, dst) tuples"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.steps = [{'op': op, 'src': src, 'dst': dst, 'existed': os.path.lexists(dst)}
+                      for op, src, dst in steps]
+        self._append({'type': 'plan', 'steps': self.steps}, force_sync=True)
+
+    def mark_done(self, index):
+        self.done.add(index)
+        self._append({'type': 'done', 'step': index})
+
+    def mark_failed(self, index, error):
+        self.failed[index] = error
+        self._append({'type': 'failed', 'step': index, 'error': error})
+
+    def finish(self, outcome='commit'):
+        """Seal the journal and delete it; outcome is 'commit' or 'rollback'"""
+        self._append({'type': outcome}, force_sync=True)
+        self.close()
+        os.remove(self.path)
+        self.finished = True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @classmethod
+    def load(cls, path):
+        """Read a journal left behind by an interrupted batch"""
+        journal = cls(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn final line
+                kind = record.get('type')
+                if kind == 'plan':
+                    journal.steps = record['steps']
+                elif kind == 'done':
+                    journal.done.add(record['step'])
+                elif kind == 'failed':
+                    journal.failed[record['step']] = record.get('error', '')
+                elif kind in ('commit', 'rollback'):
+                    journal.finished = True
+        return journal
+
+
+class BatchResult:
+    """Outcome of a journaled batch"""
+
+    def __init__(self):
+        self.completed = 0
+        self.errors = []
+        self.journal_path = None
+
+
+def _step_applied(step):
+    """Whether a step's effect is already in place (used for unrecorded steps on resume)"""
+    dst = step['dst']
+    if os.path.lexists(dst + PART_SUFFIX):
+        return False
+    dst_is_new = os.path.lexists(dst) and (not step['existed'] or os.path.lexists(dst + BACKUP_SUFFIX))
+    return dst_is_new
+
+
+def _execute_step(step):
+    src, dst = step['src'], step['dst']
+    if os.path.lexists(dst) and not os.path.lexists(dst + BACKUP_SUFFIX):
+        os.replace(dst, dst + BACKUP_SUFFIX)
+    # An overwritten file's backup doubles as the delta basis
+    basis = dst + BACKUP_SUFFIX
+    if step['op'] == 'copy':
+        _copy_atomic(src, dst, basis)
+    elif step['op'] == 'move':
+        try:
+            os.replace(src, dst)
+        except OSError:
+            # Different volume: copy into place, then drop the source
+            _copy_atomic(src, dst, basis)
+            _remove(src)
+    else:
+        raise ValueError(f"Unknown operation: {step['op']}")
+
+
+def _finish_step(step):
+    """Complete the tail of a step that is already in place (cross-volume move source cleanup)"""
+    if step['op'] == 'move' and os.path.lexists(step['src']):
+        _remove(step['src'])
+
+
+def _undo_step(step):
+    src, dst = step['src'], step['dst']
+    backup = dst + BACKUP_SUFFIX
+    # Temp files of the atomic copy and of a resumable large-file copy (with its checkpoint)
+    for temp in (dst + PART_SUFFIX, dst + COPY_PART_SUFFIX, dst + COPY_PART_SUFFIX + CHECKPOINT_SUFFIX):
+        if os.path.lexists(temp):
+            _remove(temp)
+    if _step_applied(step):
+        if step['op'] == 'move':
+            if os.path.lexists(src):
+                _remove(src)  # partially deleted source from a cross-volume move
+            shutil.move(dst, src)
+        else:
+            _remove(dst)
+    if os.path.lexists(backup):
+        os.replace(backup, dst)
+
+
+def _drop_backups(journal):
+    for step in journal.steps:
+        backup = step['dst'] + BACKUP_SUFFIX
+        if os.path.lexists(backup):
+            _remove(backup)
+
+
+def _run_steps(journal, indexes, progress=None):
+    result = BatchResult()
+    result.journal_path = journal.path
+    total = len(journal.steps)
+    for i in indexes:
+        step = journal.steps[i]
+        try:
+            _execute_step(step)
+            journal.mark_done(i)
+            result.completed += 1
+        except Exception as e:
+            message = f"Failed to {step['op']} '{step['src']}': {e}"
+            result.errors.append(message)
+            try:
+                _undo_step(step)
+            except OSError:
+                pass
+            journal.mark_failed(i, message)
+        if progress:
+            progress(i + 1, total)
+    _drop_backups(journal)
+    journal.finish('commit')
+    return result
+
+
+@traced("file_ops.run_batch")
+def run_batch(steps, journal_dir=None, progress=None):
+    """Run (op, src, dst) steps under a write-ahead journal; op is 'copy' or 'move'"""
+    journal_dir = journal_dir or default_journal_dir()
+    path = os.path.join(journal_dir, f"batch-{int(time.time())}-{uuid.uuid4().hex[:8]}.journal")
+    journal = OperationJournal(path)
+    journal.begin(steps)
+    try:
+        return _run_steps(journal, range(len(journal.steps)), progress)
+    finally:
+        journal.close()
+
+
+def pending_journals(journal_dir=None):
+    """Journals of batches that were interrupted before finishing"""
+    journal_dir = journal_dir or default_journal_dir()
+    if not os.path.isdir(journal_dir):
+        return []
+    return sorted(os.path.join(journal_dir, name) for name in os.listdir(journal_dir) if name.endswith(".journal"))
+
+
+@traced("file_ops.resume_batch")
+def resume_batch(journal_path, progress=None):
+    """Finish an interrupted batch, skipping steps that already took effect"""
+    journal = OperationJournal.load(journal_path)
+    remaining = []
+    for i, step in enumerate(journal.steps):
+        if i in journal.failed:
+            continue
+        if i in journal.done or _step_applied(step):
+            _finish_step(step)
+            journal.done.add(i)
+        else:
+            remaining.append(i)
+    try:
+        result = _run_steps(journal, remaining, progress)
+        result.completed = len(journal.done)
+        return result
+    finally:
+        journal.close()
+
+
+@traced("file_ops.rollback_batch")
+def rollback_batch(journal_path):
+    """Undo every step of an interrupted batch, newest first"""
+    journal = OperationJournal.load(journal_path)
+    result = BatchResult()
+    result.journal_path = journal_path
+    for step in reversed(journal.steps):
+        try:
+            _undo_step(step)
+            result.completed += 1
+        except OSError as e:
+            result.errors.append(f"Failed to undo {step['op']} of '{step['src']}': {e}")
+    try:
+        if not result.errors:
+            journal.finish('rollback')
+    finally:
+        journal.close()
+    return result
+
+
+# ---- Fast recursive delete ----
+_USE_DIR_FD = (os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd
+               and hasattr(os, 'O_DIRECTORY'))
+
+
+class DeleteResult:
+    """Counters from delete_tree"""
+
+    def __init__(self):
+        self.files_deleted = 0
+        self.dirs_deleted = 0
+        self.errors = []
+
+
+def _is_reparse_dir(entry):
+    """Junctions and directory symlinks on Windows: removed with rmdir, never descended into"""
+    attributes = getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0)
+    return (attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT and attributes & stat.FILE_ATTRIBUTE_DIRECTORY) != 0
+
+
+def _unlink_entries(path, identity=None):
+    """Unlink every non-directory in path; returns (subdirectories, files deleted, errors).
+
+    Subdirectories come back as (path, (st_dev, st_ino)) pairs. Given an
+    identity, the directory must still be that one when opened, so a folder
+    swapped for a link after its parent was listed is not followed.
+    """
+    subdirs = []
+    deleted = 0
+    errors = []
+    if _USE_DIR_FD:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | getattr(os, 'O_NOFOLLOW', 0))
+        try:
+            if identity is not None:
+                st = os.fstat(fd)
+                if (st.st_dev, st.st_ino) != identity:
+                    raise OSError(f"Directory changed during delete: {path}")
+            with os.scandir(fd) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            subdirs.append((os.path.join(path, entry.name), (st.st_dev, st.st_ino)))
+                        else:
+                            os.unlink(entry.name, dir_fd=fd)
+                            deleted += 1
+                    except OSError as e:
+                        errors.append(f"{os.path.join(path, entry.name)}: {e}")
+        finally:
+            os.close(fd)
+    else:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if _is_reparse_dir(entry):
+                        # Remove the junction itself, never what it points at
+                        os.rmdir(entry.path)
+                        deleted += 1
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, None))
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                    except PermissionError:
+                        # Read-only files on Windows must be made writable first
+                        os.chmod(entry.path, 0o666)
+                        os.unlink(entry.path)
+                    deleted += 1
+                except OSError as e:
+                    errors.append(f"{entry.path}: {e}")
+    return subdirs, deleted, errors
+
+
+@traced("file_ops.delete_tree")
+def delete_tree(path, workers=8, rename_aside=True, progress=None):
+    """Delete a file or directory tree natively and in parallel.
+
+    Files are unlinked relative to an open directory descriptor where the
+    platform supports it, so each directory's path is resolved once rather
+    than once per file. Directories are removed deepest first once empty.
+    With rename_aside, the root is first renamed to a hidden sibling so it
+    disappears from listings immediately.
+    """
+    result = DeleteResult()
+    if not os.path.lexists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    if not os.path.isdir(path) or os.path.islink(path):
+        os.unlink(path)
+        result.files_deleted = 1
+        return result
+
+    root = os.path.abspath(path)
+    if rename_aside:
+        aside = os.path.join(os.path.dirname(root), f".{os.path.basename(root)}.bbdeleting-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(root, aside)
+            root = aside
+        except OSError:
+            pass
+
+    dirs = [(0, root)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bb-delete") as executor:
+        pending = {executor.submit(_unlink_entries, root): 0}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                try:
+                    subdirs, deleted, errors = future.result()
+                except OSError as e:
+                    result.errors.append(str(e))
+                    continue
+                result.files_deleted += deleted
+                result.errors.extend(errors)
+                for sub, identity in subdirs:
+                    dirs.append((depth + 1, sub))
+                    pending[executor.submit(_unlink_entries, sub, identity)] = depth + 1
+                if progress:
+                    progress(result.files_deleted)
+
+    dirs.sort(key=lambda d: d[0], reverse=True)
+    for _, directory in dirs:
+        try:
+            os.rmdir(directory)
+            result.dirs_deleted += 1
+        except OSError as e:
+            result.errors.append(f"{directory}: {e}")
+    return result
@@ -0,0 +1,188 @@
+import hashlib
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+DIGEST_SIZE = 32
+CHUNK_SIZE = 1024 * 1024
+
+# dev, inode, size, mtime_ns, digest -- 64 bytes per record
+_RECORD = struct.Struct('<QQQq%ds' % DIGEST_SIZE)
+_MAGIC = b'BBHC0001'
+
+
+class HashKey(NamedTuple):
+    """Identity of one version of a file's content"""
+    dev: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result) -> 'HashKey':
+        return cls(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class HashCache:
+    """BLAKE2b content digests cached by (dev, inode, size, mtime_ns) in a compact binary store"""
+
+    def __init__(self, store_path: Optional[str] = None, workers: int = 4,
+                 chunk_size: int = CHUNK_SIZE, max_entries: int = 1000000):
+        self.store_path = store_path
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bytes_hashed = 0
+        self._digests: Dict[HashKey, bytes] = {}
+        self._unsaved: Dict[HashKey, bytes] = {}
+        self._records_on_disk = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if store_path:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.store_path, 'rb') as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    return
+                data = f.read()
+        except OSError:
+            return
+        usable = len(data) - len(data) % _RECORD.size
+        for dev, inode, size, mtime_ns, digest in _RECORD.iter_unpack(data[:usable]):
+            self._digests[HashKey(dev, inode, size, mtime_ns)] = digest
+        self._records_on_disk = usable // _RECORD.size
+
+    def _buffer(self) -> bytearray:
+        buf = getattr(self._local, 'buffer', None)
+        if buf is None or len(buf) != self.chunk_size:
+            buf = self._local.buffer = bytearray(self.chunk_size)
+        return buf
+
+    def _compute(self, path: str) -> Tuple[bytes, int]:
+        h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        buf = self._buffer()
+        view = memoryview(buf)
+        total = 0
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+                total += n
+        return h.digest(), total
+
+    def lookup(self, key: HashKey) -> Optional[str]:
+        """Return a cached hex digest without touching the file"""
+        with self._lock:
+            digest = self._digests.get(key)
+        return digest.hex() if digest is not None else None
+
+    def get_or_compute(self, path: str) -> Tuple[Optional[str], bool]:
+        """Return (hex digest, served_from_cache); digest is None if the file is unreadable"""
+        try:
+            key = HashKey.from_stat(os.stat(path))
+        except OSError:
+            return None, False
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self.hits += 1
+                return digest.hex(), True
+            self.misses += 1
+        try:
+            digest, read = self._compute(path)
+        except OSError:
+            return None, False
+        with self._lock:
+            self.bytes_hashed += read
+            self._digests[key] = digest
+            self._unsaved[key] = digest
+        return digest.hex(), False
+
+    def digest(self, path: str) -> Optional[str]:
+        """Return the hex digest of a file, computing it if needed"""
+        return self.get_or_compute(path)[0]
+
+    def digest_many(self, paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Hash many files, computing misses on a thread pool"""
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bb-hashcache") as executor:
+            return dict(zip(paths, executor.map(self.digest, paths)))
+
+    def flush(self) -> bool:
+        """Append new digests to the store, compacting it when it has grown stale"""
+        if not self.store_path:
+            return False
+        with self._lock:
+            if len(self._digests) > self.max_entries:
+                # Oldest insertions go first
+                for key in list(self._digests)[:len(self._digests) - self.max_entries]:
+                    del self._digests[key]
+                    self._unsaved.pop(key, None)
+                compact = True
+            else:
+                compact = (self._records_on_disk == 0 or
+                           self._records_on_disk + len(self._unsaved) > 2 * len(self._digests) + 1024)
+            records = self._digests if compact else self._unsaved
+            payload = b''.join(_RECORD.pack(*key, digest) for key, digest in records.items())
+            count = len(records)
+            self._unsaved = {}
+        try:
+            os.makedirs(os.path.dirname(self.store_path) or '.', exist_ok=True)
+            if compact:
+                tmp_path = self.store_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(_MAGIC + payload)
+                os.replace(tmp_path, self.store_path)
+                with self._lock:
+                    self._records_on_disk = count
+            else:
+                with open(self.store_path, 'ab') as f:
+                    f.write(payload)
+                with self._lock:
+                    self._records_on_disk += count
+            return True
+        except OSError:
+            with self._lock:
+                self._unsaved.update(records)
+            return False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss statistics and store size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes_hashed': self.bytes_hashed,
+                'entries': len(self._digests),
+                'unsaved': len(self._unsaved),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._digests)
+
+
+_default_cache: Optional[HashCache] = None
+_default_lock = threading.Lock()
+
+
+def default_store_path(app_name: str = "BrontoBase") -> str:
+    """Location of the shared hash store, next to the favorites file"""
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "hashes.bin")
+
+
+def get_hash_cache() -> HashCache:
+    """Process-wide hash cache shared by copy verification, dedupe and extraction"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HashCache(default_store_path())
+        return _default_cache
@@ -0,0 +1,128 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+from .tracing import traced
+
+
+class ListingEntry(NamedTuple):
+    """One row of a cached directory listing"""
+    name: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+class DirectorySnapshot:
+    """Listing of a directory captured together with the directory's mtime"""
+
+    __slots__ = ('path', 'entries', 'dir_mtime_ns')
+
+    def __init__(self, path: str, entries: List[ListingEntry], dir_mtime_ns: int):
+        self.path = path
+        self.entries = entries
+        self.dir_mtime_ns = dir_mtime_ns
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def scan_directory(path: str) -> DirectorySnapshot:
+    """Read a directory listing with stat data in a single scandir pass"""
+    dir_mtime_ns = os.stat(path).st_mtime_ns
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append(ListingEntry(entry.name, is_dir, 0 if is_dir else st.st_size, st.st_mtime))
+    return DirectorySnapshot(path, entries, dir_mtime_ns)
+
+
+class DirectoryListingCache:
+    """LRU cache of recent directory listings bounded by total entry count"""
+
+    def __init__(self, max_entries: int = 200000):
+        self.max_entries = max_entries
+        self.total_entries = 0
+        self._snapshots: 'OrderedDict[str, DirectorySnapshot]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def get(self, path: str) -> Optional[DirectorySnapshot]:
+        """Return the cached snapshot for a directory and mark it recently used"""
+        key = self._key(path)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+            return snapshot
+
+    def put(self, snapshot: DirectorySnapshot) -> None:
+        """Store a snapshot, evicting least recently used listings over budget"""
+        key = self._key(snapshot.path)
+        with self._lock:
+            old = self._snapshots.pop(key, None)
+            if old is not None:
+                self.total_entries -= len(old)
+            # A single listing larger than the whole budget is not worth keeping
+            if len(snapshot) > self.max_entries:
+                return
+            self._snapshots[key] = snapshot
+            self.total_entries += len(snapshot)
+            while self.total_entries > self.max_entries:
+                _, evicted = self._snapshots.popitem(last=False)
+                self.total_entries -= len(evicted)
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached listing for a directory"""
+        with self._lock:
+            old = self._snapshots.pop(self._key(path), None)
+            if old is not None:
+                self.total_entries -= len(old)
+
+    def clear(self) -> None:
+        """Drop all cached listings"""
+        with self._lock:
+            self._snapshots.clear()
+            self.total_entries = 0
+
+    def is_fresh(self, snapshot: DirectorySnapshot) -> bool:
+        """Check whether the directory is unchanged since the snapshot was taken"""
+        try:
+            return os.stat(snapshot.path).st_mtime_ns == snapshot.dir_mtime_ns
+        except OSError:
+            return False
+
+    def load(self, path: str) -> DirectorySnapshot:
+        """Scan a directory and cache the result"""
+        snapshot = scan_directory(path)
+        self.put(snapshot)
+        return snapshot
+
+    @traced("listing_cache.revalidate")
+    def revalidate(self, path: str) -> Tuple[Optional[DirectorySnapshot], bool]:
+        """Rescan a directory if its mtime changed; returns (snapshot, changed)"""
+        snapshot = self.get(path)
+        if snapshot is not None and self.is_fresh(snapshot):
+            return snapshot, False
+        try:
+            return self.load(path), True
+        except OSError:
+            self.invalidate(path)
+            return None, True
+
+    def __contains__(self, path: str) -> bool:
+        with self._lock:
+            return self._key(path) in self._snapshots
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._snapshots)
@@ -0,0 +1,543 @@
+import json
+import mimetypes
+import os
+import re
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+HEADER_BYTES = 16 * 1024
+PDF_TAIL_BYTES = 64 * 1024
+
+# (offset, magic, mime type), checked in order
+_SIGNATURES = [
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'BM', 'image/bmp'),
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'PK\x03\x04', 'application/zip'),
+    (0, b'\x1f\x8b', 'application/gzip'),
+    (0, b'7z\xbc\xaf\x27\x1c', 'application/x-7z-compressed'),
+    (0, b'Rar!\x1a\x07', 'application/vnd.rar'),
+    (0, b'ID3', 'audio/mpeg'),
+    (0, b'fLaC', 'audio/flac'),
+    (0, b'OggS', 'audio/ogg'),
+    (0, b'\x7fELF', 'application/x-executable'),
+    (0, b'MZ', 'application/x-msdownload'),
+    (0, b'SQLite format 3\x00', 'application/vnd.sqlite3'),
+    (4, b'ftyp', 'video/mp4'),
+]
+
+
+def read_header(path: str, size: int = HEADER_BYTES) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read(size)
+
+
+def sniff_mime(path: str, header: Optional[bytes] = None) -> str:
+    """MIME type from the file's leading bytes, falling back to its extension"""
+    if header is None:
+        header = read_header(path)
+    if header[:4] == b'RIFF' and len(header) >= 12:
+        kind = header[8:12]
+        if kind == b'WEBP':
+            return 'image/webp'
+        if kind == b'WAVE':
+            return 'audio/wav'
+        if kind == b'AVI ':
+            return 'video/x-msvideo'
+    for offset, magic, mime in _SIGNATURES:
+        if header[offset:offset + len(magic)] == magic:
+            return mime
+    guessed = mimetypes.guess_type(path)[0]
+    if guessed:
+        return guessed
+    if b'\x00' not in header:
+        try:
+            header.decode('utf-8')
+            return 'text/plain'
+        except UnicodeDecodeError:
+            # A multi-byte character may have been cut off at the end of the header
+            if len(header) == HEADER_BYTES and _decodes_except_tail(header):
+                return 'text/plain'
+    return 'application/octet-stream'
+
+
+def _decodes_except_tail(data: bytes) -> bool:
+    try:
+        data[:-4].decode('utf-8')
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _jpeg_size(path: str) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segment headers up to the first SOF marker, seeking over segment bodies"""
+    with open(path, 'rb') as f:
+        if f.read(2) != b'\xff\xd8':
+            return None
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xff:
+                return None
+            code = marker[1]
+            if code == 0xff:
+                f.seek(-1, os.SEEK_CUR)  # fill byte
+                continue
+            if code in (0xd8, 0x01) or 0xd0 <= code <= 0xd7:
+                continue
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack('>H', length_bytes)[0]
+            if 0xc0 <= code <= 0xcf and code not in (0xc4, 0xc8, 0xcc):
+                data = f.read(5)
+                if len(data) < 5:
+                    return None
+                height, width = struct.unpack('>HH', data[1:5])
+                return width, height
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def image_size(path: str, header: Optional[bytes] = None) -> Optional[Tuple[int, int]]:
+    """(width, height) read from an image header, or None if not a recognized image"""
+    if header is None:
+        header = read_header(path, 64)
+    if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', header[6:10])
+    if header[:2] == b'BM' and len(header) >= 26:
+        width, height = struct.unpack('<ii', header[18:26])
+        return width, abs(height)
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        chunk = header[12:16]
+        if chunk == b'VP8X':
+            w = int.from_bytes(header[24:27], 'little') + 1
+            h = int.from_bytes(header[27:30], 'little') + 1
+            return w, h
+        if chunk == b'VP8 ':
+            w, h = struct.unpack('<HH', header[26:30])
+            return w & 0x3fff, h & 0x3fff
+        if chunk == b'VP8L':
+            bits = int.from_bytes(header[21:25], 'little')
+            return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if header[:3] == b'\xff\xd8\xff':
+        return _jpeg_size(path)
+    return None
+
+
+# ---- Extractor registry ----
+class Extractor(NamedTuple):
+    """Reads typed fields from a file's header; mime_types entries ending in '/' match a whole family"""
+    name: str
+    mime_types: Tuple[str, ...]
+    func: Callable[[str, bytes], Dict[str, object]]
+
+
+_extractors: List[Extractor] = []
+
+
+def register_extractor(name: str, mime_types: Iterable[str]):
+    """Decorator adding func(path, header) -> fields to the registry.
+
+    Extractors run in worker processes, so they must be registered when their
+    module is imported.
+    """
+    def decorate(func):
+        _extractors.append(Extractor(name, tuple(mime_types), func))
+        return func
+    return decorate
+
+
+def extractors_for(mime: str) -> List[Extractor]:
+    return [e for e in _extractors
+            if any(mime == m or (m.endswith('/') and mime.startswith(m)) for m in e.mime_types)]
+
+
+@register_extractor('image', ['image/'])
+def _image_fields(path: str, header: bytes) -> Dict[str, object]:
+    size = image_size(path, header)
+    return {'width': size[0], 'height': size[1]} if size else {}
+
+
+@register_extractor('wav', ['audio/wav'])
+def _wav_fields(path: str, header: bytes) -> Dict[str, object]:
+    fields: Dict[str, object] = {}
+    byte_rate = 0
+    with open(path, 'rb') as f:
+        f.seek(12)
+        for _ in range(64):
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                break
+            chunk_id, size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+            if chunk_id == b'fmt ':
+                fmt = f.read(16)
+                channels, rate, byte_rate = struct.unpack('<HII', fmt[2:12])
+                fields.update(channels=channels, sample_rate=rate)
+                f.seek(size - 16 + (size & 1), os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if byte_rate:
+                    fields['duration'] = size / byte_rate
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+    return fields
+
+
+@register_extractor('flac', ['audio/flac'])
+def _flac_fields(path: str, header: bytes) -> Dict[str, object]:
+    if header[4] & 0x7f != 0:  # first metadata block must be STREAMINFO
+        return {}
+    bits = int.from_bytes(header[18:26], 'big')
+    rate = bits >> 44
+    samples = bits & ((1 << 36) - 1)
+    fields: Dict[str, object] = {'sample_rate': rate, 'channels': ((bits >> 41) & 7) + 1}
+    if rate and samples:
+        fields['duration'] = samples / rate
+    return fields
+
+
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],  # MPEG-1 layer III
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],      # MPEG-2/2.5 layer III
+}
+_MP3_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+@register_extractor('mp3', ['audio/mpeg'])
+def _mp3_fields(path: str, header: bytes) -> Dict[str, object]:
+    offset = 0
+    if header[:3] == b'ID3':
+        # ID3v2 tags (often holding cover art) are skipped by their syncsafe size
+        offset = 10 + ((header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9])
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        f.seek(offset)
+        data = f.read(4096)
+    for i in range(len(data) - 4):
+        if data[i] != 0xff or data[i + 1] & 0xe0 != 0xe0:
+            continue
+        version = (data[i + 1] >> 3) & 3
+        layer = (data[i + 1] >> 1) & 3
+        bitrate_index = data[i + 2] >> 4
+        rate_index = (data[i + 2] >> 2) & 3
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+        rate = _MP3_RATES[version][rate_index]
+        bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+        mono = (data[i + 3] >> 6) == 3
+        samples_per_frame = 1152 if version == 3 else 576
+        fields: Dict[str, object] = {'sample_rate': rate, 'channels': 1 if mono else 2, 'bitrate': bitrate}
+        # A Xing/Info header in the first frame carries the frame count (needed for VBR)
+        side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        tag = data[i + 4 + side_info:i + 8 + side_info + 8]
+        if tag[:4] in (b'Xing', b'Info') and struct.unpack('>I', tag[4:8])[0] & 1:
+            frames = struct.unpack('>I', tag[8:12])[0]
+            fields['duration'] = frames * samples_per_frame / rate
+        else:
+            fields['duration'] = (file_size - offset - i) * 8 / bitrate
+        return fields
+    return {}
+
+
+@register_extractor('pdf', ['application/pdf'])
+def _pdf_fields(path: str, header: bytes) -> Dict[str, object]:
+    fields: Dict[str, object] = {}
+    version = re.match(rb'%PDF-(\d\.\d)', header)
+    if version:
+        fields['pdf_version'] = version.group(1).decode()
+    linearized = re.search(rb'/Linearized\b.{0,200}?/N\s+(\d+)', header, re.S)
+    if linearized:
+        fields['pages'] = int(linearized.group(1))
+        return fields
+    # Otherwise look for the page tree root near either end of the file
+    with open(path, 'rb') as f:
+        f.seek(max(0, os.fstat(f.fileno()).st_size - PDF_TAIL_BYTES))
+        text = header + f.read()
+    counts = []
+    for match in re.finditer(rb'/Type\s*/Pages\b', text):
+        window = text[max(0, match.start() - 200):match.end() + 200]
+        count = re.search(rb'/Count\s+(\d+)', window)
+        if count:
+            counts.append(int(count.group(1)))
+    if counts:
+        fields['pages'] = max(counts)
+    return fields
+
+
+def extract_metadata(path: str) -> Tuple[int, int, Dict[str, object]]:
+    """(size, mtime in ms, fields) for a file; runs in worker processes"""
+    st = os.stat(path)
+    header = read_header(path)
+    fields: Dict[str, object] = {'mime': sniff_mime(path, header)}
+    for extractor in extractors_for(fields['mime']):
+        try:
+            fields.update(extractor.func(path, header))
+        except (OSError, ValueError, IndexError, struct.error):
+            continue
+    return st.st_size, st.st_mtime_ns // 1000000, fields
+
+
+def extract_details(path: str) -> Dict[str, str]:
+    """Label -> value rows describing a file, extracted without caching"""
+    return describe(extract_metadata(path)[2])
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02}:{rest % 60:02}" if hours else f"{rest // 60}:{rest % 60:02}"
+
+
+def describe(fields: Dict[str, object]) -> Dict[str, str]:
+    """Label -> display value rows for the properties Details tab"""
+    rows = {}
+    if 'mime' in fields:
+        rows['MIME type'] = fields['mime']
+    if 'width' in fields:
+        rows['Dimensions'] = f"{fields['width']} x {fields['height']}"
+    if 'duration' in fields:
+        rows['Duration'] = format_duration(fields['duration'])
+    if 'sample_rate' in fields:
+        rows['Sample rate'] = f"{fields['sample_rate']} Hz"
+    if 'channels' in fields:
+        rows['Channels'] = str(fields['channels'])
+    if 'bitrate' in fields:
+        rows['Bit rate'] = f"{fields['bitrate'] // 1000} kbps"
+    if 'pages' in fields:
+        rows['Pages'] = str(fields['pages'])
+    if 'pdf_version' in fields:
+        rows['PDF version'] = fields['pdf_version']
+    return rows
+
+
+class MetadataColumn(NamedTuple):
+    """A sortable list view column backed by extracted fields"""
+    title: str
+    display: Callable[[Dict[str, object]], str]
+    sort_key: Callable[[Dict[str, object]], float]
+
+
+COLUMNS = [
+    MetadataColumn('Dimensions', lambda d: f"{d['width']} x {d['height']}" if 'width' in d else "",
+                   lambda d: d.get('width', 0) * d.get('height', 0)),
+    MetadataColumn('Duration', lambda d: format_duration(d['duration']) if 'duration' in d else "",
+                   lambda d: d.get('duration', 0)),
+    MetadataColumn('Pages', lambda d: str(d['pages']) if 'pages' in d else "", lambda d: d.get('pages', 0)),
+]
+
+
+# ---- Persistent cache and worker pool ----
+def default_store_path(app_name: str = "BrontoBase") -> str:
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "metadata.db")
+
+
+class MetadataStore:
+    """SQLite table of extracted fields keyed by (path, size, mtime in ms)"""
+
+    def __init__(self, db_path: Optional[str] = None, commit_every: int = 64):
+        db_path = db_path or default_store_path()
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS metadata (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ms INTEGER NOT NULL,
+                fields TEXT NOT NULL
+            )""")
+        self._db.commit()
+
+    def get(self, path: str, size: int, mtime_ms: int) -> Optional[Dict[str, object]]:
+        with self._lock:
+            row = self._db.execute("SELECT size, mtime_ms, fields FROM metadata WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ms:
+            return None
+        return json.loads(row[2])
+
+    def get_many(self, files: Iterable[Tuple[str, int, int]]) -> Dict[str, Dict[str, object]]:
+        """Fields for every (path, size, mtime_ms) stored at that version, in one query per 500 paths"""
+        wanted = {path: (size, mtime_ms) for path, size, mtime_ms in files}
+        paths = list(wanted)
+        found = {}
+        with self._lock:
+            for start in range(0, len(paths), 500):
+                chunk = paths[start:start + 500]
+                rows = self._db.execute(f"SELECT path, size, mtime_ms, fields FROM metadata WHERE path IN "
+                                        f"({', '.join('?' * len(chunk))})", chunk).fetchall()
+                found.update((r[0], r) for r in rows)
+        return {path: json.loads(r[3]) for path, r in found.items() if (r[1], r[2]) == wanted[path]}
+
+    def put(self, path: str, size: int, mtime_ms: int, fields: Dict[str, object]) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                             (path, size, mtime_ms, json.dumps(fields)))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+class MetadataService:
+    """Serves extracted fields from memory or the store, extracting misses on a process pool"""
+
+    def __init__(self, store: Optional[MetadataStore] = None, workers: int = 2, use_processes: bool = True,
+                 max_memory_entries: int = 50000):
+        self.store = store or MetadataStore()
+        self.workers = workers
+        self.use_processes = use_processes
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        # Keyed by version, so a file that failed is tried again once it changes
+        self._failed: Set[Tuple[str, int, int]] = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._closed = False
+        self.extracted = 0
+
+    def _remember(self, path: str, size: int, mtime_ms: int, fields: Dict[str, object]) -> None:
+        with self._lock:
+            self._memory[path] = (size, mtime_ms, fields)
+            self._memory.move_to_end(path)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def peek(self, path: str, size: int, mtime_ms: int) -> Optional[Dict[str, object]]:
+        """Fields for this version of the file if they are in memory; never touches the store"""
+        with self._lock:
+            entry = self._memory.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime_ms:
+            return entry[2]
+        return None
+
+    def get(self, path: str, size: int, mtime_ms: int) -> Optional[Dict[str, object]]:
+        """Cached fields for this version of the file, or None"""
+        fields = self.peek(path, size, mtime_ms)
+        if fields is not None:
+            return fields
+        fields = self.store.get(path, size, mtime_ms)
+        if fields is not None:
+            self._remember(path, size, mtime_ms, fields)
+        return fields
+
+    def get_many(self, files: Iterable[Tuple[str, int, int]]) -> Dict[str, Dict[str, object]]:
+        """get() for many (path, size, mtime_ms) at once, with one store query for the memory misses"""
+        found = {}
+        misses = []
+        for path, size, mtime_ms in files:
+            fields = self.peek(path, size, mtime_ms)
+            if fields is not None:
+                found[path] = fields
+            else:
+                misses.append((path, size, mtime_ms))
+        if misses:
+            stored = self.store.get_many(misses)
+            for path, size, mtime_ms in misses:
+                if path in stored:
+                    self._remember(path, size, mtime_ms, stored[path])
+            found.update(stored)
+        return found
+
+    def _pool(self):
+        if self._executor is None:
+            if self.use_processes:
+                # Imported here: the process pool machinery is slow to import and only needed once rows are painted
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bb-meta")
+        return self._executor
+
+    def request(self, files: Iterable[Tuple[str, int, int]],
+                on_ready: Optional[Callable[[str, Dict[str, object]], None]] = None) -> int:
+        """Queue extraction for (path, size, mtime_ms) not already pending; on_ready runs on a pool callback thread"""
+        queued = 0
+        for path, size, mtime_ms in files:
+            version = (path, size, mtime_ms)
+            with self._lock:
+                if path in self._pending or version in self._failed:
+                    continue
+                future = self._pool().submit(extract_metadata, path)
+                self._pending[path] = future
+            queued += 1
+            future.add_done_callback(lambda f, v=version: self._finished(v, f, on_ready))
+        return queued
+
+    def _finished(self, version: Tuple[str, int, int], future: Future, on_ready) -> None:
+        path = version[0]
+        with self._lock:
+            self._pending.pop(path, None)
+            idle = not self._pending
+        if future.cancelled() or self._closed:
+            return
+        if future.exception() is not None:
+            # Unreadable files are not retried on every repaint, only once they change
+            with self._lock:
+                self._failed.add(version)
+            return
+        size, mtime_ms, fields = future.result()
+        with self._lock:
+            self.extracted += 1
+        self._remember(path, size, mtime_ms, fields)
+        self.store.put(path, size, mtime_ms, fields)
+        if idle:
+            self.store.flush()
+        if on_ready:
+            on_ready(path, fields)
+
+    def cancel_pending(self) -> None:
+        """Drop queued extractions that have not started (e.g. rows scrolled out of view)"""
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            future.cancel()
+
+    def get_or_extract(self, path: str) -> Dict[str, object]:
+        """Fields for a file, extracting in the calling thread on a miss"""
+        st = os.stat(path)
+        fields = self.get(path, st.st_size, st.st_mtime_ns // 1000000)
+        if fields is None:
+            size, mtime_ms, fields = extract_metadata(path)
+            self._remember(path, size, mtime_ms, fields)
+            self.store.put(path, size, mtime_ms, fields)
+            self.store.flush()
+        return fields
+
+    def shutdown(self) -> None:
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
+
+
+_default_service: Optional[MetadataService] = None
+
+
+def get_metadata_service() -> MetadataService:
+    """Process-wide metadata service"""
+    global _default_service
+    if _default_service is None:
+        _default_service = MetadataService()
+    return _default_service
@@ -0,0 +1,282 @@
+import os
+import shutil
+import string
+import sys
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+USAGE_TIMEOUT = 2.0
+
+# Kernel and virtual file systems that never hold user files
+PSEUDO_FS = {
+    'proc', 'sysfs', 'devtmpfs', 'devpts', 'tmpfs', 'ramfs', 'cgroup', 'cgroup2', 'securityfs',
+    'pstore', 'debugfs', 'tracefs', 'mqueue', 'hugetlbfs', 'configfs', 'fusectl', 'binfmt_misc',
+    'autofs', 'bpf', 'efivarfs', 'nsfs', 'rpc_pipefs', 'selinuxfs', 'squashfs', 'overlay', 'nfsd',
+}
+NETWORK_FS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', 'sshfs', '9p', 'afs', 'ceph',
+    'glusterfs', 'fuse.glusterfs', 'davfs', 'fuse.rclone',
+}
+# Mount points under these belong to the system, not the user
+SYSTEM_PREFIXES = ('/proc', '/sys', '/dev', '/run', '/snap', '/var/lib/docker')
+
+# GetDriveTypeW results
+_DRIVE_REMOVABLE, _DRIVE_REMOTE, _DRIVE_CDROM = 2, 4, 5
+
+
+class Mount(NamedTuple):
+    """A mounted volume as listed under "This PC"; path is where to browse it"""
+    path: str
+    label: str
+    fstype: str
+    device: str
+    is_remote: bool
+    is_removable: bool
+
+
+class MountUsage(NamedTuple):
+    """Capacity of one mount in bytes"""
+    total: int
+    used: int
+    free: int
+
+
+def _unescape(field: str) -> str:
+    """mountinfo escapes space, tab, newline and backslash as octal (\\040 etc.)"""
+    if '\\' not in field:
+        return field
+    out = []
+    i = 0
+    while i < len(field):
+        if field[i] == '\\' and i + 3 < len(field) and field[i + 1:i + 4].isdigit():
+            out.append(chr(int(field[i + 1:i + 4], 8)))
+            i += 4
+        else:
+            out.append(field[i])
+            i += 1
+    return ''.join(out)
+
+
+def parse_mountinfo(text: str) -> List[Mount]:
+    """User-visible mounts from /proc/self/mountinfo text, one per mount point"""
+    mounts: Dict[str, Mount] = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if '-' not in fields:
+            continue
+        sep = fields.index('-')
+        if sep < 5 or sep + 2 >= len(fields):
+            continue
+        mount_point = _unescape(fields[4])
+        fstype = fields[sep + 1]
+        device = _unescape(fields[sep + 2])
+        is_remote = fstype in NETWORK_FS
+        if mount_point != '/':
+            if fstype in PSEUDO_FS:
+                continue
+            if mount_point.startswith(SYSTEM_PREFIXES) and not is_remote:
+                continue
+            if not (device.startswith('/dev/') or is_remote or fstype.startswith('fuse.')):
+                continue
+        label = "File System" if mount_point == '/' else os.path.basename(mount_point)
+        is_removable = mount_point.startswith(('/media/', '/run/media/', '/mnt/'))
+        # A later line for the same mount point is stacked on top of the earlier one
+        mounts[mount_point] = Mount(mount_point, label, fstype, device, is_remote, is_removable)
+    return sorted(mounts.values(), key=lambda m: (m.path != '/', m.path))
+
+
+def _windows_mounts() -> List[Mount]:
+    """Drive letters from GetLogicalDrives, a bitmask read without touching any drive"""
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    mask = kernel32.GetLogicalDrives()
+    mounts = []
+    for i, letter in enumerate(string.ascii_uppercase):
+        if not mask & (1 << i):
+            continue
+        root = f"{letter}:\\"
+        drive_type = kernel32.GetDriveTypeW(ctypes.c_wchar_p(root))
+        mounts.append(Mount(root, f"{letter}:", "", root, drive_type == _DRIVE_REMOTE,
+                            drive_type in (_DRIVE_REMOVABLE, _DRIVE_CDROM)))
+    return mounts
+
+
+def _volumes_mounts() -> List[Mount]:
+    """macOS and other Unixes without mountinfo: / plus whatever is in /Volumes"""
+    mounts = [Mount('/', "File System", "", "", False, False)]
+    try:
+        with os.scandir('/Volumes') as it:
+            for entry in it:
+                if entry.is_dir() and not os.path.islink(entry.path):
+                    mounts.append(Mount(entry.path, entry.name, "", "", False, True))
+    except OSError:
+        pass
+    return mounts
+
+
+class MountService:
+    """Lists mounted volumes without probing them, and fetches their capacity in the background.
+
+    Listing reads the mount table (mountinfo on Linux, the logical drive bitmask
+    on Windows) so it never blocks on a disconnected network drive. Capacity
+    comes from statvfs on daemon threads; a mount that does not answer within
+    the timeout is reported as None and is not probed again until that call
+    returns. start_watching() calls listeners whenever the mount list changes.
+    """
+
+    def __init__(self, mountinfo_path: Optional[str] = None, usage_timeout: float = USAGE_TIMEOUT):
+        self.mountinfo_path = mountinfo_path or (MOUNTINFO_PATH if os.path.exists(MOUNTINFO_PATH) else None)
+        self.usage_timeout = usage_timeout
+        self._lock = threading.Lock()
+        self._mounts: Optional[List[Mount]] = None
+        self._usage: Dict[str, MountUsage] = {}
+        self._probing: set = set()
+        self._listeners: List[Callable[[List[Mount]], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _read(self) -> List[Mount]:
+        if self.mountinfo_path:
+            try:
+                with open(self.mountinfo_path, encoding='utf-8', errors='replace') as f:
+                    return parse_mountinfo(f.read())
+            except OSError:
+                return []
+        if sys.platform.startswith('win'):
+            return _windows_mounts()
+        return _volumes_mounts()
+
+    def list_mounts(self) -> List[Mount]:
+        """Current mounts; read once, then kept up to date by refresh() or the watcher"""
+        with self._lock:
+            if self._mounts is not None:
+                return list(self._mounts)
+        return self.refresh()
+
+    def refresh(self) -> List[Mount]:
+        mounts = self._read()
+        with self._lock:
+            changed = self._mounts is not None and mounts != self._mounts
+            self._mounts = mounts
+            for path in set(self._usage) - {m.path for m in mounts}:
+                del self._usage[path]
+        if changed:
+            for callback in list(self._listeners):
+                callback(list(mounts))
+        return list(mounts)
+
+    def add_listener(self, callback: Callable[[List[Mount]], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[List[Mount]], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ---- capacity ----
+    def usage(self, path: str) -> Optional[MountUsage]:
+        """Last capacity fetched for a mount, if any"""
+        with self._lock:
+            return self._usage.get(path)
+
+    def probe_usage(self, mounts: Optional[List[Mount]] = None,
+                    on_result: Optional[Callable[[Mount, Optional[MountUsage]], None]] = None) -> None:
+        """Fetch capacity for each mount; on_result runs once per mount on a background thread"""
+        for mount in mounts if mounts is not None else self.list_mounts():
+            with self._lock:
+                busy = mount.path in self._probing
+                self._probing.add(mount.path)
+                last = self._usage.get(mount.path)
+            if busy:
+                # Still stuck on an earlier call; do not pile up more threads behind it
+                if on_result:
+                    on_result(mount, last)
+                continue
+            delivered = threading.Event()
+
+            def deliver(usage, mount=mount, delivered=delivered):
+                with self._lock:
+                    if delivered.is_set():
+                        return
+                    delivered.set()
+                if on_result:
+                    on_result(mount, usage)
+
+            def probe(mount=mount, deliver=deliver):
+                try:
+                    total, used, free = shutil.disk_usage(mount.path)
+                    usage = MountUsage(total, used, free)
+                    with self._lock:
+                        self._usage[mount.path] = usage
+                except OSError:
+                    usage = None
+                finally:
+                    with self._lock:
+                        self._probing.discard(mount.path)
+                deliver(usage)
+
+            timer = threading.Timer(self.usage_timeout, deliver, args=(None,))
+            timer.daemon = True
+            timer.start()
+            threading.Thread(target=probe, name="bb-mount-usage", daemon=True).start()
+
+    # ---- change notification ----
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Watch for mounts and unmounts on a daemon thread"""
+        if self._watcher is not None:
+            return
+        self.list_mounts()
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="bb-mount-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        poller = None
+        fd = None
+        if self.mountinfo_path and self.mountinfo_path.startswith('/proc/'):
+            import select
+            # The kernel flags the mount table with POLLPRI when it changes
+            try:
+                fd = os.open(self.mountinfo_path, os.O_RDONLY)
+                poller = select.poll()
+                poller.register(fd, select.POLLPRI | select.POLLERR)
+            except (OSError, AttributeError):
+                poller = None
+        try:
+            while not self._stop.is_set():
+                if poller is not None:
+                    # Each poll that reports a change also re-arms the notification
+                    if poller.poll(interval * 1000):
+                        self.refresh()
+                else:
+                    if self._stop.wait(interval):
+                        break
+                    self.refresh()
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+
+def format_capacity(usage: Optional[MountUsage]) -> str:
+    if usage is None:
+        return ""
+    free_gb = usage.free / 1024 ** 3
+    total_gb = usage.total / 1024 ** 3
+    return f"{free_gb:.1f} GB free of {total_gb:.1f} GB"
+
+
+_default_service: Optional[MountService] = None
+
+
+def get_mount_service() -> MountService:
+    """Process-wide mount service"""
+    global _default_service
+    if _default_service is None:
+        _default_service = MountService()
+    return _default_service
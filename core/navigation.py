@@ -1,6 +1,7 @@
-import os
 from typing import List, Optional
 
+from .stat_cache import get_stat_cache
+
 
 class NavigationHistory:
     """Handles navigation history for back/forward functionality"""
@@ -12,7 +13,7 @@ class NavigationHistory:
     
     def add_to_history(self, path: str) -> None:
         """Add a path to navigation history"""
-        if not path or not os.path.exists(path):
+        if not path or not get_stat_cache().exists(path):
             return
             
         # Remove any future history if we're not at the end
@@ -42,7 +43,7 @@ class NavigationHistory:
             self.current_history_index -= 1
             previous_path = self.navigation_history[self.current_history_index]
             
-            if os.path.exists(previous_path):
+            if get_stat_cache().exists(previous_path):
                 return previous_path
             else:
                 # If the path no longer exists, try to go back further
@@ -55,7 +56,7 @@ class NavigationHistory:
             self.current_history_index += 1
             next_path = self.navigation_history[self.current_history_index]
             
-            if os.path.exists(next_path):
+            if get_stat_cache().exists(next_path):
                 return next_path
             else:
                 # If the path no longer exists, try to go forward further
@@ -77,6 +78,10 @@ class NavigationHistory:
         """Get the full history list"""
         return self.navigation_history.copy()
     
+    def get_forward_paths(self) -> List[str]:
+        """Get the paths ahead of the current position, nearest first"""
+        return self.navigation_history[self.current_history_index + 1:]
+    
     def get_history_index(self) -> int:
         """Get the current history index"""
         return self.current_history_index
@@ -0,0 +1,127 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, Set
+
+from .listing_cache import DirectoryListingCache
+
+
+class DirectoryPrefetcher:
+    """Warms the listing cache for directories the user is likely to open next"""
+
+    def __init__(self, cache: DirectoryListingCache, max_workers: int = 2, max_pending: int = 64):
+        self.cache = cache
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bb-prefetch")
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._warmed: Set[str] = set()
+        self._generation = 0
+        self._foreground_count = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self.counters: Dict[str, int] = {
+            'requested': 0, 'scheduled': 0, 'completed': 0, 'dropped': 0,
+            'already_cached': 0, 'failed': 0, 'hits': 0, 'misses': 0,
+        }
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    @contextmanager
+    def foreground(self):
+        """Mark foreground work; prefetch tasks wait until it finishes"""
+        with self._lock:
+            self._foreground_count += 1
+            self._idle.clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._foreground_count -= 1
+                if self._foreground_count == 0:
+                    self._idle.set()
+
+    def run_foreground(self, fn, *args):
+        """Call fn(*args) while holding off prefetch work"""
+        with self.foreground():
+            return fn(*args)
+
+    def prefetch(self, paths: Iterable[str]) -> int:
+        """Queue directories for warming; returns how many were scheduled"""
+        scheduled = 0
+        for path in paths:
+            if not path:
+                continue
+            key = self._key(path)
+            with self._lock:
+                self.counters['requested'] += 1
+                if key in self._pending:
+                    continue
+                if path in self.cache:
+                    self.counters['already_cached'] += 1
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    self.counters['dropped'] += 1
+                    continue
+                self._pending.add(key)
+                self.counters['scheduled'] += 1
+                generation = self._generation
+            self._executor.submit(self._warm, path, key, generation)
+            scheduled += 1
+        return scheduled
+
+    def cancel_pending(self) -> None:
+        """Discard queued prefetches, e.g. after the user navigated elsewhere"""
+        with self._lock:
+            self._generation += 1
+
+    def _warm(self, path: str, key: str, generation: int) -> None:
+        try:
+            # Yield to foreground work before touching the disk
+            self._idle.wait()
+            with self._lock:
+                if generation != self._generation:
+                    self.counters['dropped'] += 1
+                    return
+            if not os.path.isdir(path):
+                return
+            self.cache.load(path)
+            with self._lock:
+                self._warmed.add(key)
+                self.counters['completed'] += 1
+        except OSError:
+            with self._lock:
+                self.counters['failed'] += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def record_access(self, path: str) -> bool:
+        """Record a navigation; returns True if it was served by a prefetched listing"""
+        key = self._key(path)
+        with self._lock:
+            hit = key in self._warmed and path in self.cache
+            self._warmed.discard(key)
+            self.counters['hits' if hit else 'misses'] += 1
+            return hit
+
+    def hit_rate(self) -> float:
+        """Fraction of navigations served by a prefetch"""
+        with self._lock:
+            total = self.counters['hits'] + self.counters['misses']
+            return self.counters['hits'] / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        """Snapshot of the prefetch counters"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['pending'] = len(self._pending)
+        stats['hit_rate'] = self.hit_rate()
+        return stats
+
+    def shutdown(self) -> None:
+        self.cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,284 @@
+import fnmatch
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .excludes import get_exclude_engine
+from .file_index import FileIndex
+from .scanner import ParallelScanner
+from .search import file_contains
+from .tracing import traced
+
+SIZE_UNITS = {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2,
+              'g': 1024 ** 3, 'gb': 1024 ** 3, 't': 1024 ** 4, 'tb': 1024 ** 4}
+AGE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400, 'y': 365 * 86400}
+
+# key:value, key:"quoted value", "quoted text" or a bare word
+_TOKEN = re.compile(r'\s*(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+_COMPARISON = re.compile(r'^(>=|<=|>|<|=)?(.+)$')
+
+
+class QueryError(ValueError):
+    """A query string that cannot be parsed"""
+
+
+class Query(NamedTuple):
+    """Parsed search predicates; every given predicate must hold"""
+    name_terms: Tuple[str, ...] = ()
+    name_globs: Tuple[str, ...] = ()
+    exts: Tuple[str, ...] = ()
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    modified_after_ns: Optional[int] = None
+    modified_before_ns: Optional[int] = None
+    content: Tuple[str, ...] = ()
+
+
+class SearchHit(NamedTuple):
+    """One matching file; higher scores rank first"""
+    path: str
+    size: int
+    mtime_ns: int
+    score: float
+
+
+class QueryResult(NamedTuple):
+    hits: List[SearchHit]
+    plan: List[str]
+    stats: Dict[str, int]
+
+
+def _parse_size(text: str) -> int:
+    value = text.strip().lower()
+    number = value.rstrip('kmgtb')
+    unit = value[len(number):]
+    if unit not in SIZE_UNITS:
+        raise QueryError(f"Unknown size unit: {text}")
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except ValueError:
+        raise QueryError(f"Invalid size: {text}")
+
+
+def _split_range(value: str):
+    """'a..b' -> ('..', a, b); '>=a' -> ('>=', a, None); 'a' -> ('=', a, None)"""
+    if '..' in value:
+        low, high = value.split('..', 1)
+        return '..', low, high
+    op, operand = _COMPARISON.match(value).groups()
+    return op or '=', operand, None
+
+
+def _apply_size(query: Query, value: str) -> Query:
+    op, a, b = _split_range(value)
+    if op == '..':
+        return query._replace(min_size=_parse_size(a) if a else None, max_size=_parse_size(b) if b else None)
+    size = _parse_size(a)
+    return {
+        '>': query._replace(min_size=size + 1), '>=': query._replace(min_size=size),
+        '<': query._replace(max_size=size - 1), '<=': query._replace(max_size=size),
+        '=': query._replace(min_size=size, max_size=size),
+    }[op]
+
+
+def _day_bounds(text: str) -> Tuple[int, int]:
+    """First and last nanosecond of a YYYY-MM-DD day in local time"""
+    try:
+        day = datetime.strptime(text, "%Y-%m-%d")
+    except ValueError:
+        raise QueryError(f"Invalid date or age: {text} (use YYYY-MM-DD or e.g. 7d, 12h, 2w)")
+    start = int(day.timestamp() * 1e9)
+    return start, int((day + timedelta(days=1)).timestamp() * 1e9) - 1
+
+
+def _apply_modified(query: Query, value: str, now: float) -> Query:
+    op, a, b = _split_range(value)
+    if op == '..':
+        after = _day_bounds(a)[0] if a else None
+        before = _day_bounds(b)[1] if b else None
+        return query._replace(modified_after_ns=after, modified_before_ns=before)
+    age = re.fullmatch(r'(\d+(?:\.\d+)?)([hdwy])', a.lower())
+    if age:
+        # Ages compare by how old a file is: <7d is newer than a week, >7d older
+        cutoff = int((now - float(age.group(1)) * AGE_UNITS[age.group(2)]) * 1e9)
+        if op in ('<', '<='):
+            return query._replace(modified_after_ns=cutoff)
+        if op in ('>', '>='):
+            return query._replace(modified_before_ns=cutoff)
+        raise QueryError(f"Use < or > with an age: modified:{value}")
+    start, end = _day_bounds(a)
+    return {
+        '>': query._replace(modified_after_ns=end + 1), '>=': query._replace(modified_after_ns=start),
+        '<': query._replace(modified_before_ns=start - 1), '<=': query._replace(modified_before_ns=end),
+        '=': query._replace(modified_after_ns=start, modified_before_ns=end),
+    }[op]
+
+
+def parse_query(text: str, now: Optional[float] = None) -> Query:
+    """Parse e.g. 'ext:log size:>100MB modified:<7d "timeout"'.
+
+    name:TEXT (or a bare word) matches names, with * ? [ as wildcards;
+    ext:A,B file extensions; size:>N, <N, =N or N..M with k/MB/GB units;
+    modified:<7d (newer than), >30d (older than), a YYYY-MM-DD day, >DATE,
+    <DATE or DATE..DATE; content:"TEXT" or a bare "quoted" phrase searches
+    inside files. Matching is case-insensitive.
+    """
+    now = time.time() if now is None else now
+    query = Query()
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            raise QueryError(f"Cannot parse query at: {text[pos:]}")
+        pos = match.end()
+        key, quoted, bare = match.groups()
+        value = quoted if quoted is not None else bare
+        key = (key or '').lower()
+        if not value:
+            raise QueryError(f"Missing value for {key or 'quoted text'}")
+        if (key == '' and quoted is not None) or key == 'content':
+            query = query._replace(content=query.content + (value,))
+        elif key in ('', 'name'):
+            if any(c in value for c in '*?['):
+                query = query._replace(name_globs=query.name_globs + (value.lower(),))
+            else:
+                query = query._replace(name_terms=query.name_terms + (value.lower(),))
+        elif key == 'ext':
+            query = query._replace(exts=query.exts + tuple(e.lower().lstrip('.') for e in value.split(',') if e))
+        elif key == 'size':
+            query = _apply_size(query, value)
+        elif key in ('modified', 'date'):
+            query = _apply_modified(query, value, now)
+        else:
+            raise QueryError(f"Unknown field: {key}")
+    if query == Query():
+        raise QueryError("Empty query")
+    return query
+
+
+def _name_filter(query: Query) -> Optional[Callable[[str], bool]]:
+    if not (query.name_terms or query.name_globs or query.exts):
+        return None
+    exts = set(query.exts)
+
+    def accept(name: str) -> bool:
+        lower = name.lower()
+        if exts and os.path.splitext(lower)[1][1:] not in exts:
+            return False
+        if not all(term in lower for term in query.name_terms):
+            return False
+        return all(fnmatch.fnmatchcase(lower, glob) for glob in query.name_globs)
+    return accept
+
+
+def _stat_filter(query: Query) -> Optional[Callable[[int, int], bool]]:
+    bounds = (query.min_size, query.max_size, query.modified_after_ns, query.modified_before_ns)
+    if all(b is None for b in bounds):
+        return None
+    min_size, max_size, after, before = bounds
+
+    def accept(size: int, mtime_ns: int) -> bool:
+        return ((min_size is None or size >= min_size) and (max_size is None or size <= max_size)
+                and (after is None or mtime_ns >= after) and (before is None or mtime_ns <= before))
+    return accept
+
+
+def _score(name: str, query: Query) -> float:
+    """1 per file, plus a bonus for each name term that starts the name or is the whole stem"""
+    lower = name.lower()
+    stem = os.path.splitext(lower)[0]
+    score = 1.0
+    for term in query.name_terms:
+        if stem == term:
+            score += 2
+        elif lower.startswith(term):
+            score += 1
+    return score
+
+
+def _index_covers(index: FileIndex, root: str) -> bool:
+    return any(root == r or root.startswith(os.path.join(r, '')) for r in index.roots())
+
+
+def plan_query(query: Query, root: str, index: Optional[FileIndex] = None, use_excludes: bool = True) -> List[str]:
+    """The stages run_query will use, cheapest first"""
+    root = os.path.abspath(root)
+    steps = []
+    metadata = []
+    if query.name_terms or query.name_globs:
+        metadata.append("name " + " ".join(query.name_terms + query.name_globs))
+    if query.exts:
+        metadata.append("ext " + ",".join(query.exts))
+    stats = []
+    if query.min_size is not None or query.max_size is not None:
+        stats.append("size")
+    if query.modified_after_ns is not None or query.modified_before_ns is not None:
+        stats.append("modified")
+    if index is not None and _index_covers(index, root):
+        steps.append("index lookup: " + ", ".join(metadata + stats or ["all files"]))
+    else:
+        crawl = "crawl " + root + (" skipping ignored folders" if use_excludes else "")
+        steps.append(crawl + (": names filtered before stat (" + ", ".join(metadata) + ")" if metadata else ""))
+        if stats:
+            steps.append("stat filter: " + ", ".join(stats))
+    if query.content:
+        steps.append("content scan of survivors: " + ", ".join(f'"{c}"' for c in query.content))
+    return steps
+
+
+@traced("query.run")
+def run_query(query: Query, root: str, index: Optional[FileIndex] = None, recursive: bool = True,
+              limit: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None,
+              use_excludes: bool = True) -> QueryResult:
+    """Evaluate a query below root, cheapest predicates first.
+
+    Names, extensions, sizes and dates are answered by the filename index when
+    it covers root; otherwise by a crawl that filters names before stat'ing.
+    Content is searched last, only in files every other predicate accepted.
+    With use_excludes the crawl prunes ignored folders (the index never has them).
+    """
+    root = os.path.abspath(root)
+    plan = plan_query(query, root, index, use_excludes)
+    stats = {'candidates': 0, 'content_reads': 0, 'matches': 0, 'skipped': 0}
+    name_ok = _name_filter(query)
+    stat_ok = _stat_filter(query)
+
+    if index is not None and _index_covers(index, root):
+        rows = index.search(
+            name_contains=query.name_terms[0] if query.name_terms else None,
+            name_glob=query.name_globs[0] if query.name_globs else None,
+            exts=list(query.exts) or None, min_size=query.min_size, max_size=query.max_size,
+            modified_after_ns=query.modified_after_ns, modified_before_ns=query.modified_before_ns,
+            under=root)
+        candidates = ((r.path, r.size, r.mtime_ns) for r in rows
+                      if (recursive or os.path.dirname(r.path) == root) and (name_ok is None or name_ok(r.name)))
+    else:
+        scanner = ParallelScanner(file_filter=name_ok, excludes=get_exclude_engine() if use_excludes else None)
+
+        def crawl():
+            listings = scanner.walk_dirs(root) if recursive else filter(None, [scanner.scan_dir(root)])
+            for listing in listings:
+                stats['skipped'] += listing.skipped
+                for f in listing.files:
+                    if stat_ok is None or stat_ok(f.size, f.mtime_ns):
+                        yield f.path, f.size, f.mtime_ns
+        candidates = crawl()
+
+    hits = []
+    for path, size, mtime_ns in candidates:
+        if should_stop is not None and should_stop():
+            break
+        stats['candidates'] += 1
+        if query.content:
+            stats['content_reads'] += 1
+            if not all(file_contains(path, text) for text in query.content):
+                continue
+        hits.append(SearchHit(path, size, mtime_ns, _score(os.path.basename(path), query)))
+        if limit and len(hits) >= limit:
+            break
+    stats['matches'] = len(hits)
+    hits.sort(key=lambda h: -h.score)
+    return QueryResult(hits, plan, stats)
@@ -0,0 +1,115 @@
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .excludes import ExcludeContext, ExcludeEngine
+
+
+class ScanEntry(NamedTuple):
+    """A regular file found by the scanner, with the stat fields callers need"""
+    path: str
+    size: int
+    mtime_ns: int
+    dev: int
+    inode: int
+
+
+class DirListing(NamedTuple):
+    """Result of scanning a single directory"""
+    path: str
+    mtime_ns: int
+    files: List[ScanEntry]
+    subdirs: List[str]
+    skipped: int = 0
+
+
+class ParallelScanner:
+    """Crawls directory trees with one scandir per directory spread over a thread pool.
+
+    file_filter, if given, is called with each file name before the file is
+    stat'ed; files it rejects are skipped without a stat call. With an
+    ExcludeEngine, excluded entries are dropped while listing, so excluded
+    folders are never descended into; they are counted in skipped.
+    """
+
+    def __init__(self, max_workers: int = 8, follow_symlinks: bool = False,
+                 on_error: Optional[Callable[[str, OSError], None]] = None,
+                 file_filter: Optional[Callable[[str], bool]] = None,
+                 excludes: Optional[ExcludeEngine] = None):
+        self.max_workers = max_workers
+        self.follow_symlinks = follow_symlinks
+        self.on_error = on_error
+        self.file_filter = file_filter
+        self.excludes = excludes
+        self.dirs_scanned = 0
+        self.files_seen = 0
+        self.errors = 0
+        self.skipped = 0
+
+    def scan_dir(self, path: str) -> Optional[DirListing]:
+        """List a single directory (None if it cannot be read), applying excludes from its ancestors"""
+        # Exclude contexts match by absolute prefix, so entry paths must be absolute too
+        path = os.path.abspath(path)
+        context = self.excludes.context_for(path) if self.excludes is not None else None
+        return self._scan(path, context)[0]
+
+    def _scan(self, path: str, context: Optional[ExcludeContext]) -> Tuple[Optional[DirListing], Optional[ExcludeContext]]:
+        """List one directory; also returns the exclude context its subdirectories inherit"""
+        files = []
+        subdirs = []
+        skipped = 0
+        try:
+            dir_mtime_ns = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                entries = list(it) if context is not None else it
+                if context is not None:
+                    context = context.enter(path, (entry.name for entry in entries))
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=self.follow_symlinks)
+                        if context is not None and context.excluded(entry.path, is_dir):
+                            skipped += 1
+                            continue
+                        if is_dir:
+                            subdirs.append(entry.path)
+                            continue
+                        if self.file_filter is not None and not self.file_filter(entry.name):
+                            continue
+                        st = entry.stat(follow_symlinks=self.follow_symlinks)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode):
+                        files.append(ScanEntry(entry.path, st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino))
+        except OSError as e:
+            if self.on_error:
+                self.on_error(path, e)
+            return None, context
+        return DirListing(path, dir_mtime_ns, files, subdirs, skipped), context
+
+    def walk_dirs(self, roots: Union[str, Iterable[str]]) -> Iterator[DirListing]:
+        """Yield a DirListing for every directory below the roots (as absolute paths), in completion order"""
+        if isinstance(roots, str):
+            roots = [roots]
+        roots = [os.path.abspath(root) for root in roots]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bb-scan") as executor:
+            pending = {executor.submit(self._scan, root, self.excludes.context_for(root) if self.excludes else None)
+                       for root in roots}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listing, context = future.result()
+                    if listing is None:
+                        self.errors += 1
+                        continue
+                    self.dirs_scanned += 1
+                    self.files_seen += len(listing.files)
+                    self.skipped += listing.skipped
+                    for sub in listing.subdirs:
+                        pending.add(executor.submit(self._scan, sub, context))
+                    yield listing
+
+    def walk(self, roots: Union[str, Iterable[str]]) -> Iterator[ScanEntry]:
+        """Yield every regular file below the roots"""
+        for listing in self.walk_dirs(roots):
+            yield from listing.files
@@ -1,9 +1,11 @@
-import os
 import subprocess
 import re
 from typing import List, Dict, Optional
 from pathlib import Path
 
+from .stat_cache import get_stat_cache
+from .tracing import traced
+
 
 class FileSearcher:
     """Enhanced file search functionality"""
@@ -11,9 +13,10 @@ class FileSearcher:
     def __init__(self):
         self.search_results = []
     
+    @traced("search.search_files")
     def search_files(self, directory: str, pattern: str, recursive: bool = True) -> List[str]:
         """Search for files using PowerShell Get-ChildItem"""
-        if not os.path.exists(directory):
+        if not get_stat_cache().exists(directory):
             return []
         
         try:
@@ -31,9 +34,10 @@ class FileSearcher:
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, Exception):
             return []
     
+    @traced("search.search_by_content")
     def search_by_content(self, directory: str, search_text: str, file_extensions: Optional[List[str]] = None) -> List[str]:
         """Search for files containing specific text"""
-        if not os.path.exists(directory):
+        if not get_stat_cache().exists(directory):
             return []
         
         try:
@@ -57,9 +61,10 @@ class FileSearcher:
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, Exception):
             return []
     
+    @traced("search.search_by_size")
     def search_by_size(self, directory: str, min_size: Optional[int] = None, max_size: Optional[int] = None) -> List[Dict[str, any]]:
         """Search for files by size range (in bytes)"""
-        if not os.path.exists(directory):
+        if not get_stat_cache().exists(directory):
             return []
         
         try:
@@ -96,9 +101,10 @@ class FileSearcher:
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, Exception):
             return []
     
+    @traced("search.search_by_date")
     def search_by_date(self, directory: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, any]]:
         """Search for files by date range"""
-        if not os.path.exists(directory):
+        if not get_stat_cache().exists(directory):
             return []
         
         try:
@@ -163,7 +169,7 @@ class FileSearcher:
             extensions = [ext if ext.startswith('.') else f'.{ext}' for ext in extensions]
         
         # Build PowerShell command for system-wide search
-        if search_directory and os.path.exists(search_directory):
+        if search_directory and get_stat_cache().exists(search_directory):
             # Search in specific directory
             base_path = search_directory
         else:
@@ -226,6 +232,27 @@ class FileSearcher:
             return []
 
 
+def file_contains(path: str, text: str, chunk_size: int = 1024 * 1024) -> bool:
+    """Case-insensitive check for text in a file, read in chunks so large files are not loaded whole"""
+    needle = text.lower().encode('utf-8')
+    if not needle:
+        return True
+    tail = b""
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return False
+                # Keep the end of the previous chunk so matches across the boundary are found
+                window = tail + chunk.lower()
+                if needle in window:
+                    return True
+                tail = window[-(len(needle) - 1):] if len(needle) > 1 else b""
+    except OSError:
+        return False
+
+
 # Legacy function for backward compatibility
 def search_files(directory, pattern):
     """Legacy search function for backward compatibility"""
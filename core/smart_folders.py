@@ -0,0 +1,274 @@
+import fnmatch
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from .file_index import ChangeSet, FileIndex, IndexedFile, get_file_index
+from .search import file_contains
+
+# Above this many changed paths, re-running the query is cheaper than checking them one by one
+REEVALUATE_THRESHOLD = 5000
+
+
+class SavedSearch(NamedTuple):
+    """A named query shown as a smart folder; empty fields match everything"""
+    name: str
+    root: str
+    name_contains: str = ""
+    name_glob: str = ""
+    exts: Sequence[str] = ()
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    modified_after: str = ""
+    modified_before: str = ""
+    modified_within_days: Optional[int] = None
+    content: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SavedSearch":
+        known = {k: v for k, v in data.items() if k in cls._fields}
+        known['exts'] = tuple(known.get('exts') or ())
+        return cls(**known)
+
+    def to_dict(self) -> dict:
+        data = self._asdict()
+        data['exts'] = list(self.exts)
+        return data
+
+    def describe(self) -> str:
+        """Short human-readable summary, e.g. for a tooltip"""
+        parts = []
+        if self.name_contains:
+            parts.append(f"name contains \"{self.name_contains}\"")
+        if self.name_glob:
+            parts.append(f"name matches {self.name_glob}")
+        if self.exts:
+            parts.append("type " + ", ".join(self.exts))
+        if self.min_size is not None:
+            parts.append(f"at least {self.min_size:,} bytes")
+        if self.max_size is not None:
+            parts.append(f"at most {self.max_size:,} bytes")
+        if self.modified_after:
+            parts.append(f"modified from {self.modified_after}")
+        if self.modified_before:
+            parts.append(f"modified until {self.modified_before}")
+        if self.modified_within_days is not None:
+            parts.append(f"modified in the last {self.modified_within_days} day(s)")
+        if self.content:
+            parts.append(f"containing \"{self.content}\"")
+        return f"{'; '.join(parts) or 'all files'} in {self.root}"
+
+
+def default_store_path(app_name: str = "BrontoBase") -> str:
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "smart_folders.json")
+
+
+def _date_ns(text: str, end_of_day: bool = False) -> Optional[int]:
+    if not text:
+        return None
+    day = datetime.strptime(text, "%Y-%m-%d")
+    if end_of_day:
+        day += timedelta(days=1)
+    return int(day.timestamp() * 1e9) - (1 if end_of_day else 0)
+
+
+def _mtime_bounds(search: SavedSearch, now: Optional[float] = None):
+    after = _date_ns(search.modified_after)
+    before = _date_ns(search.modified_before, end_of_day=True)
+    if search.modified_within_days is not None:
+        cutoff = int(((now if now is not None else time.time()) - search.modified_within_days * 86400) * 1e9)
+        after = cutoff if after is None else max(after, cutoff)
+    return after, before
+
+
+def _under(path: str, root: str) -> bool:
+    return path == root or path.startswith(os.path.join(root, ''))
+
+
+def matches(search: SavedSearch, entry: IndexedFile, now: Optional[float] = None) -> bool:
+    """Whether an index entry passes every predicate except content, which needs the file itself"""
+    if entry.is_dir or not _under(entry.path, os.path.abspath(search.root)):
+        return False
+    if search.name_contains and search.name_contains.lower() not in entry.name.lower():
+        return False
+    if search.name_glob and not fnmatch.fnmatchcase(entry.name.lower(), search.name_glob.lower()):
+        return False
+    if search.exts and os.path.splitext(entry.name)[1][1:].lower() not in {e.lower().lstrip('.') for e in search.exts}:
+        return False
+    if search.min_size is not None and entry.size < search.min_size:
+        return False
+    if search.max_size is not None and entry.size > search.max_size:
+        return False
+    after, before = _mtime_bounds(search, now)
+    if after is not None and entry.mtime_ns < after:
+        return False
+    if before is not None and entry.mtime_ns > before:
+        return False
+    return True
+
+
+class SmartFolder:
+    """Live result set of one saved search, kept in step with the filename index.
+
+    The first call to results() runs the query against the index; after that,
+    apply() checks only the paths in each ChangeSet, so opening the folder again
+    costs a dictionary copy however large the indexed root is.
+    """
+
+    def __init__(self, search: SavedSearch, index: FileIndex):
+        self.search = search
+        self.index = index
+        self._lock = threading.Lock()
+        self._results: Optional[Dict[str, IndexedFile]] = None
+
+    def _passes(self, entry: IndexedFile, now: float) -> bool:
+        if not matches(self.search, entry, now):
+            return False
+        return not self.search.content or file_contains(entry.path, self.search.content)
+
+    def evaluate(self) -> List[IndexedFile]:
+        """Run the whole query against the index"""
+        search = self.search
+        after, before = _mtime_bounds(search)
+        candidates = self.index.search(
+            name_contains=search.name_contains or None, name_glob=search.name_glob or None, exts=list(search.exts) or None,
+            min_size=search.min_size, max_size=search.max_size,
+            modified_after_ns=after, modified_before_ns=before, under=search.root)
+        if search.content:
+            candidates = [c for c in candidates if file_contains(c.path, search.content)]
+        with self._lock:
+            self._results = {c.path: c for c in candidates}
+        return candidates
+
+    def results(self) -> List[IndexedFile]:
+        with self._lock:
+            evaluated = self._results is not None
+        if not evaluated:
+            return self.evaluate()
+        with self._lock:
+            if self.search.modified_within_days is not None:
+                # The window is relative to now, so entries age out without any change event
+                after, _ = _mtime_bounds(self.search)
+                self._results = {p: e for p, e in self._results.items() if e.mtime_ns >= after}
+            return list(self._results.values())
+
+    def apply(self, changes: ChangeSet) -> bool:
+        """Update the results from an index change; returns True if they changed"""
+        with self._lock:
+            if self._results is None:
+                return False
+        root = os.path.abspath(self.search.root)
+        touched = [p for p in changes.added + changes.updated if _under(p, root)]
+        removed = [p for p in changes.removed if _under(p, root)]
+        if len(touched) > REEVALUATE_THRESHOLD:
+            with self._lock:
+                before = set(self._results)
+            return {c.path for c in self.evaluate()} != before
+        now = time.time()
+        passed = {}
+        for path in touched:
+            entry = self.index.get(path)
+            passed[path] = entry if entry is not None and self._passes(entry, now) else None
+        changed = False
+        with self._lock:
+            for path in removed:
+                changed |= self._results.pop(path, None) is not None
+            for path, entry in passed.items():
+                if entry is not None:
+                    changed |= self._results.get(path) != entry
+                    self._results[path] = entry
+                else:
+                    changed |= self._results.pop(path, None) is not None
+        return changed
+
+
+class SmartFolderManager:
+    """Saved searches stored as JSON, each exposed as a SmartFolder over the shared index.
+
+    Registers itself as an index listener; listeners added here are called with
+    the name of every smart folder whose results changed (on the thread that
+    updated the index).
+    """
+
+    def __init__(self, index: Optional[FileIndex] = None, store_path: Optional[str] = None):
+        self.index = index or get_file_index()
+        self.store_path = store_path or default_store_path()
+        self._lock = threading.Lock()
+        self._folders: Dict[str, SmartFolder] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        for search in self._load():
+            self._folders[search.name] = SmartFolder(search, self.index)
+        self.index.add_listener(self._on_index_changed)
+
+    def _load(self) -> List[SavedSearch]:
+        try:
+            with open(self.store_path, encoding='utf-8') as f:
+                return [SavedSearch.from_dict(d) for d in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+    def _save(self) -> bool:
+        with self._lock:
+            data = [folder.search.to_dict() for folder in self._folders.values()]
+        try:
+            os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+            tmp_path = self.store_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.store_path)
+            return True
+        except OSError:
+            return False
+
+    def searches(self) -> List[SavedSearch]:
+        with self._lock:
+            return [folder.search for folder in self._folders.values()]
+
+    def get(self, name: str) -> Optional[SmartFolder]:
+        with self._lock:
+            return self._folders.get(name)
+
+    def save(self, search: SavedSearch) -> bool:
+        """Add a saved search, replacing any with the same name"""
+        search = search._replace(root=os.path.abspath(search.root))
+        with self._lock:
+            self._folders[search.name] = SmartFolder(search, self.index)
+        return self._save()
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            if self._folders.pop(name, None) is None:
+                return False
+        return self._save()
+
+    def results(self, name: str) -> List[IndexedFile]:
+        folder = self.get(name)
+        return folder.results() if folder else []
+
+    def is_indexed(self, name: str) -> bool:
+        """Whether the search root lies inside an indexed root (otherwise results are empty)"""
+        folder = self.get(name)
+        if folder is None:
+            return False
+        return any(_under(folder.search.root, root) for root in self.index.roots())
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _on_index_changed(self, changes: ChangeSet) -> None:
+        with self._lock:
+            folders = list(self._folders.values())
+        for folder in folders:
+            if folder.apply(changes):
+                for callback in list(self._listeners):
+                    callback(folder.search.name)
+
+    def close(self) -> None:
+        self.index.remove_listener(self._on_index_changed)
@@ -0,0 +1,133 @@
+import os
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+
+class StatCache:
+    """Short-lived cache of os.stat results keyed by path.
+
+    One user action tends to ask exists/isdir/isfile/stat about the same path
+    several times; with this cache the first question costs a syscall and the
+    rest are answered from memory until the entry is ttl seconds old. Missing
+    paths are cached too (as None).
+    """
+
+    def __init__(self, ttl: float = 2.0, max_entries: int = 20000, workers: int = 8):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.workers = workers
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.syscalls = 0
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _lookup(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return True, entry[1]
+        return False, None
+
+    def _store(self, key: str, result: Optional[os.stat_result], now: float) -> None:
+        self._entries[key] = (now, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _stat_uncached(path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except (OSError, ValueError):
+            return None
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """os.stat(path) (following symlinks), or None if the path does not exist"""
+        if not path:
+            return None
+        key = self._key(path)
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            found, result = self._lookup(key, now)
+            if found:
+                return result
+            self.syscalls += 1
+        result = self._stat_uncached(path)
+        with self._lock:
+            self._store(key, result, now)
+        return result
+
+    def stat_many(self, paths: Iterable[str]) -> Dict[str, Optional[os.stat_result]]:
+        """Stat a list of paths, running the uncached ones on a thread pool"""
+        paths = list(paths)
+        results: Dict[str, Optional[os.stat_result]] = {}
+        misses = []
+        now = time.monotonic()
+        with self._lock:
+            for path in paths:
+                self.calls += 1
+                found, result = self._lookup(self._key(path), now) if path else (True, None)
+                if found:
+                    results[path] = result
+                else:
+                    misses.append(path)
+            self.syscalls += len(misses)
+        if len(misses) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(misses)), thread_name_prefix="bb-stat") as executor:
+                fetched = list(executor.map(self._stat_uncached, misses))
+        else:
+            fetched = [self._stat_uncached(p) for p in misses]
+        with self._lock:
+            for path, result in zip(misses, fetched):
+                self._store(self._key(path), result, now)
+                results[path] = result
+        return results
+
+    def exists(self, path: str) -> bool:
+        return self.stat(path) is not None
+
+    def isdir(self, path: str) -> bool:
+        st = self.stat(path)
+        return st is not None and stat_module.S_ISDIR(st.st_mode)
+
+    def isfile(self, path: str) -> bool:
+        st = self.stat(path)
+        return st is not None and stat_module.S_ISREG(st.st_mode)
+
+    def invalidate(self, path: str) -> None:
+        """Forget a path, plus everything below it"""
+        key = self._key(path)
+        prefix = os.path.join(key, '')
+        with self._lock:
+            for k in [k for k in self._entries if k == key or k.startswith(prefix)]:
+                del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'calls': self.calls, 'syscalls': self.syscalls,
+                    'saved': self.calls - self.syscalls, 'entries': len(self._entries)}
+
+
+_default_cache: Optional[StatCache] = None
+_default_lock = threading.Lock()
+
+
+def get_stat_cache() -> StatCache:
+    """Process-wide stat cache"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = StatCache()
+        return _default_cache
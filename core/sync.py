@@ -0,0 +1,212 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from . import file_ops
+from .hash_cache import HashCache, get_hash_cache
+from .scanner import ParallelScanner, ScanEntry
+
+# FAT/exFAT store mtimes with 2 second resolution
+MTIME_TOLERANCE_NS = 2 * 10**9
+
+
+class SyncAction(NamedTuple):
+    """One thing a sync will do; rel_path is relative to the sync roots"""
+    kind: str  # 'copy', 'update', 'delete', 'mkdir', 'rmdir', 'skip', 'replace' or 'conflict'
+    rel_path: str
+    size: int
+
+
+class SyncReport:
+    """What a sync did, or would do in a dry run"""
+
+    def __init__(self):
+        self.actions: List[SyncAction] = []
+        self.copied = 0
+        self.updated = 0
+        self.deleted = 0
+        self.skipped = 0
+        self.conflicts = 0
+        self.bytes_transferred = 0
+        self.bytes_skipped = 0
+        self.errors: List[str] = []
+
+
+def _under_any(rel: str, tops: Set[str]) -> bool:
+    """Whether rel is one of tops or lies below one of them"""
+    while rel:
+        if rel in tops:
+            return True
+        rel = os.path.dirname(rel)
+    return False
+
+
+class FolderSync:
+    """One-way mirror of source into dest that only copies files that changed.
+
+    A path that is a file on one side and a folder on the other is replaced
+    (the destination item is removed first) when delete_extras is set, since
+    the destination is then meant to be an exact mirror; otherwise it is
+    reported as a conflict and left alone, along with everything below it.
+    """
+
+    def __init__(self, source: str, dest: str, use_hash: bool = False, delete_extras: bool = False,
+                 workers: int = 8, hash_cache: Optional[HashCache] = None):
+        self.source = os.path.abspath(source)
+        self.dest = os.path.abspath(dest)
+        self.use_hash = use_hash
+        self.delete_extras = delete_extras
+        self.workers = workers
+        self.hash_cache = hash_cache
+
+    def _index(self, root: str) -> Tuple[Dict[str, ScanEntry], Set[str]]:
+        files: Dict[str, ScanEntry] = {}
+        dirs: Set[str] = set()
+        if not os.path.isdir(root):
+            return files, dirs
+        cut = len(os.path.join(root, ''))
+        for listing in ParallelScanner(max_workers=self.workers).walk_dirs(root):
+            if listing.path != root:
+                dirs.add(listing.path[cut:])
+            for entry in listing.files:
+                files[entry.path[cut:]] = entry
+        return files, dirs
+
+    def compare(self) -> List[SyncAction]:
+        """Plan the sync by comparing size and mtime (and optionally content hashes)"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            src_future = executor.submit(self._index, self.source)
+            dst_future = executor.submit(self._index, self.dest)
+            src_files, src_dirs = src_future.result()
+            dst_files, dst_dirs = dst_future.result()
+
+        actions: List[SyncAction] = []
+        # File on one side, folder on the other
+        mismatched = (set(src_files) & dst_dirs) | (src_dirs & set(dst_files))
+        for rel in sorted(mismatched):
+            if self.delete_extras:
+                size = dst_files[rel].size if rel in dst_files else 0
+                actions.append(SyncAction('replace', rel, size))
+            else:
+                actions.append(SyncAction('conflict', rel, 0))
+        # Without replacing, nothing is written at or below a conflicting path
+        blocked = set() if self.delete_extras else mismatched
+
+        for rel in sorted(src_dirs - dst_dirs, key=len):
+            if not _under_any(rel, blocked):
+                actions.append(SyncAction('mkdir', rel, 0))
+
+        suspects = []
+        for rel, entry in src_files.items():
+            if _under_any(rel, blocked):
+                continue
+            other = dst_files.get(rel)
+            if other is None:
+                actions.append(SyncAction('copy', rel, entry.size))
+            elif other.size != entry.size:
+                actions.append(SyncAction('update', rel, entry.size))
+            elif abs(other.mtime_ns - entry.mtime_ns) <= MTIME_TOLERANCE_NS:
+                actions.append(SyncAction('skip', rel, entry.size))
+            elif self.use_hash:
+                suspects.append(rel)
+            else:
+                actions.append(SyncAction('update', rel, entry.size))
+
+        if suspects:
+            # Same size, different mtime: let content decide
+            cache = self.hash_cache or get_hash_cache()
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bb-sync") as executor:
+                src_digests = list(executor.map(cache.digest, (src_files[r].path for r in suspects)))
+                dst_digests = list(executor.map(cache.digest, (dst_files[r].path for r in suspects)))
+            for rel, a, b in zip(suspects, src_digests, dst_digests):
+                kind = 'skip' if a is not None and a == b else 'update'
+                actions.append(SyncAction(kind, rel, src_files[rel].size))
+            cache.flush()
+
+        if self.delete_extras:
+            # Replaced items go with everything below them
+            for rel in sorted(set(dst_files) - set(src_files)):
+                if not _under_any(rel, mismatched):
+                    actions.append(SyncAction('delete', rel, dst_files[rel].size))
+            for rel in sorted(dst_dirs - src_dirs, key=len, reverse=True):
+                if not _under_any(rel, mismatched):
+                    actions.append(SyncAction('rmdir', rel, 0))
+        return actions
+
+    def _copy(self, action: SyncAction) -> Optional[str]:
+        src = os.path.join(self.source, action.rel_path)
+        dst = os.path.join(self.dest, action.rel_path)
+        try:
+            file_ops.copy_item(src, dst)
+        except OSError as e:
+            return f"Failed to copy '{src}': {e}"
+        return None
+
+    def run(self, dry_run: bool = False, progress: Optional[Callable[[int, int], None]] = None) -> SyncReport:
+        """Bring dest up to date with source"""
+        report = SyncReport()
+        report.actions = self.compare()
+        transfers = [a for a in report.actions if a.kind in ('copy', 'update')]
+        for action in report.actions:
+            if action.kind == 'skip':
+                report.skipped += 1
+                report.bytes_skipped += action.size
+            elif action.kind == 'conflict':
+                report.conflicts += 1
+                src_kind = 'folder' if os.path.isdir(os.path.join(self.source, action.rel_path)) else 'file'
+                dst_kind = 'file' if src_kind == 'folder' else 'folder'
+                report.errors.append(f"Not synced: '{action.rel_path}' is a {src_kind} in the source but a "
+                                     f"{dst_kind} in the destination (mirror with deletions to replace it)")
+        if dry_run:
+            report.copied = sum(1 for a in transfers if a.kind == 'copy')
+            report.updated = len(transfers) - report.copied
+            report.bytes_transferred = sum(a.size for a in transfers)
+            report.deleted = sum(1 for a in report.actions if a.kind in ('delete', 'replace'))
+            return report
+
+        os.makedirs(self.dest, exist_ok=True)
+        for action in report.actions:
+            if action.kind == 'replace':
+                path = os.path.join(self.dest, action.rel_path)
+                try:
+                    if os.path.isdir(path) and not os.path.islink(path):
+                        file_ops.delete_tree(path)
+                    else:
+                        os.remove(path)
+                    report.deleted += 1
+                except OSError as e:
+                    report.errors.append(f"Failed to replace '{path}': {e}")
+        for action in report.actions:
+            if action.kind == 'mkdir':
+                os.makedirs(os.path.join(self.dest, action.rel_path), exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bb-sync") as executor:
+            for n, (action, error) in enumerate(zip(transfers, executor.map(self._copy, transfers)), 1):
+                if error:
+                    report.errors.append(error)
+                else:
+                    if action.kind == 'copy':
+                        report.copied += 1
+                    else:
+                        report.updated += 1
+                    report.bytes_transferred += action.size
+                if progress:
+                    progress(n, len(transfers))
+
+        for action in report.actions:
+            path = os.path.join(self.dest, action.rel_path)
+            try:
+                if action.kind == 'delete':
+                    os.remove(path)
+                    report.deleted += 1
+                elif action.kind == 'rmdir':
+                    os.rmdir(path)
+            except OSError as e:
+                report.errors.append(f"Failed to delete '{path}': {e}")
+        return report
+
+
+def sync_folders(source: str, dest: str, use_hash: bool = False, delete_extras: bool = False,
+                 dry_run: bool = False) -> SyncReport:
+    """Convenience wrapper around FolderSync"""
+    return FolderSync(source, dest, use_hash=use_hash, delete_extras=delete_extras).run(dry_run=dry_run)
@@ -0,0 +1,195 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# Histogram bucket i counts spans that took [2**(i-1), 2**i) microseconds; the last bucket is open-ended
+HISTOGRAM_BUCKETS = 32
+MAX_EVENTS = 100_000
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times one with-block and records it on exit"""
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, object]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **args) -> None:
+        """Attach results known only at the end of the span (e.g. a match count)"""
+        self.args.update(args)
+
+
+class SpanStats:
+    """Count, total and latency histogram for one span name"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration_ns: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.buckets[min((duration_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of spans, in milliseconds"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min((1 << i) / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_ms': self.total_ns / 1e6,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ns / 1e6,
+        }
+
+
+class Tracer:
+    """Collects timed spans around hot paths and exports them as a Chrome trace.
+
+    Disabled, span() returns a shared no-op object after one attribute check,
+    so instrumented code costs next to nothing. Enabled, each span adds to a
+    per-name latency histogram and to a bounded event buffer that
+    export_chrome_trace() writes in the format chrome://tracing and Perfetto load.
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = MAX_EVENTS):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats: Dict[str, SpanStats] = {}
+        self._events: deque = deque(maxlen=max_events)
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def span(self, name: str, **args):
+        """Context manager timing a block: with tracer.span("search", root=path): ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def record(self, name: str, start_ns: int, end_ns: int, args: Optional[Dict[str, object]] = None) -> None:
+        """Record a span measured elsewhere (perf_counter_ns timestamps), e.g. one that ends in a callback"""
+        if not self.enabled:
+            return
+        duration = max(0, end_ns - start_ns)
+        event = {'name': name, 'ph': 'X', 'ts': (start_ns - self._origin_ns) / 1000, 'dur': duration / 1000,
+                 'pid': self._pid, 'tid': threading.get_ident()}
+        if args:
+            event['args'] = args
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = SpanStats()
+            stats.add(duration)
+            self._events.append(event)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._stats.items())}
+
+    def event_count(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._events.clear()
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Write buffered spans as Chrome trace JSON; returns the number of events written"""
+        with self._lock:
+            events: List[dict] = list(self._events)
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': thread_names[tid]}}
+                    for tid in {e['tid'] for e in events} if tid in thread_names]
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+        os.replace(tmp_path, path)
+        return len(events)
+
+
+_default_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer; starts enabled when BRONTOBASE_TRACE is set"""
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer(enabled=bool(os.environ.get("BRONTOBASE_TRACE")))
+    return _default_tracer
+
+
+def span(name: str, **args):
+    """Span on the process-wide tracer"""
+    return get_tracer().span(name, **args)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of a function on the process-wide tracer"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
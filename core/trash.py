@@ -0,0 +1,251 @@
+import errno
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, NamedTuple, Optional
+
+UNKNOWN_SIZE = -1
+
+
+class TrashItem(NamedTuple):
+    """One deleted file or folder held in a trash directory"""
+    item_id: str
+    original_path: str
+    trash_path: str
+    deleted_at: float
+    size: int
+    is_dir: bool
+
+
+def find_volume_root(path: str) -> str:
+    """Walk up from path to the top directory on the same device"""
+    path = os.path.abspath(path)
+    dev = os.lstat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path:
+            return path
+        try:
+            if os.lstat(parent).st_dev != dev:
+                return path
+        except OSError:
+            return path
+        path = parent
+
+
+def _tree_size(path: str) -> int:
+    if not os.path.isdir(path) or os.path.islink(path):
+        return os.lstat(path).st_size
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class TrashStore:
+    """Moves deleted items into a trash directory on their own volume and indexes them in SQLite.
+
+    Deleting is a single same-device rename. Items on the home volume (or on
+    volumes where a trash directory cannot be created) go to the trash under
+    the app data directory instead.
+    """
+
+    def __init__(self, app_name: str = "BrontoBase", base_dir: Optional[str] = None):
+        self.app_name = app_name
+        self.base_dir = base_dir or os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name)
+        self.home_trash = os.path.join(self.base_dir, "Trash")
+        os.makedirs(self.home_trash, exist_ok=True)
+        self._home_dev = os.stat(self.home_trash).st_dev
+        self._trash_dirs = {self._home_dev: self.home_trash}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.base_dir, "trash.db"), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS trash (
+                id TEXT PRIMARY KEY,
+                original_path TEXT NOT NULL,
+                trash_path TEXT NOT NULL,
+                deleted_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                is_dir INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS trash_deleted_at ON trash (deleted_at);
+            CREATE INDEX IF NOT EXISTS trash_original ON trash (original_path);
+        """)
+        self._db.commit()
+        self._purge_thread = None
+        self._stop = threading.Event()
+
+    def _trash_dir_for(self, path: str) -> str:
+        dev = os.lstat(path).st_dev
+        trash_dir = self._trash_dirs.get(dev)
+        if trash_dir is None:
+            suffix = f"-{os.getuid()}" if hasattr(os, 'getuid') else ""
+            trash_dir = os.path.join(find_volume_root(path), f".BrontoTrash{suffix}")
+            try:
+                os.makedirs(trash_dir, exist_ok=True)
+            except OSError:
+                trash_dir = self.home_trash
+            self._trash_dirs[dev] = trash_dir
+        return trash_dir
+
+    def trash(self, path: str) -> TrashItem:
+        """Move path into the trash and record it"""
+        path = os.path.abspath(path)
+        st = os.lstat(path)
+        is_dir = os.path.isdir(path) and not os.path.islink(path)
+        item_id = uuid.uuid4().hex
+        trash_path = os.path.join(self._trash_dir_for(path), item_id)
+        try:
+            os.rename(path, trash_path)
+        except OSError as e:
+            # Only a cross-volume rename or an unusable volume trash (e.g. read-only root) falls back to a
+            # copying move; a locked or protected file must fail rather than be copied and then not deleted
+            trash_dir = os.path.dirname(trash_path)
+            if e.errno != errno.EXDEV and os.access(trash_dir, os.W_OK | os.X_OK):
+                raise
+            trash_path = os.path.join(self.home_trash, item_id)
+            shutil.move(path, trash_path)
+        size = UNKNOWN_SIZE if is_dir else st.st_size
+        item = TrashItem(item_id, path, trash_path, time.time(), size, is_dir)
+        with self._lock:
+            self._db.execute("INSERT INTO trash VALUES (?, ?, ?, ?, ?, ?)",
+                             (item.item_id, item.original_path, item.trash_path, item.deleted_at, item.size, int(is_dir)))
+            self._db.commit()
+        return item
+
+    def _rows(self, query: str, args=()) -> List[TrashItem]:
+        with self._lock:
+            rows = self._db.execute(query, args).fetchall()
+        return [TrashItem(r[0], r[1], r[2], r[3], r[4], bool(r[5])) for r in rows]
+
+    def list_items(self) -> List[TrashItem]:
+        """All trashed items, newest first"""
+        return self._rows("SELECT * FROM trash ORDER BY deleted_at DESC")
+
+    def get_item(self, item_id: str) -> Optional[TrashItem]:
+        rows = self._rows("SELECT * FROM trash WHERE id = ?", (item_id,))
+        return rows[0] if rows else None
+
+    def find_by_original(self, original_path: str) -> List[TrashItem]:
+        return self._rows("SELECT * FROM trash WHERE original_path = ? ORDER BY deleted_at DESC",
+                          (os.path.abspath(original_path),))
+
+    def _forget(self, item_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM trash WHERE id = ?", (item_id,))
+            self._db.commit()
+
+    def restore(self, item_id: str, destination: Optional[str] = None) -> str:
+        """Put an item back at its original path (or destination); returns where it went"""
+        item = self.get_item(item_id)
+        if item is None:
+            raise FileNotFoundError(f"Not in trash: {item_id}")
+        target = destination or item.original_path
+        if os.path.lexists(target):
+            raise FileExistsError(f"File already exists: {target}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.rename(item.trash_path, target)
+        except OSError:
+            shutil.move(item.trash_path, target)
+        self._forget(item_id)
+        return target
+
+    def purge(self, item_id: str) -> bool:
+        """Permanently delete one trashed item; False (and the item stays listed) if part of it could not be deleted"""
+        item = self.get_item(item_id)
+        if item is None:
+            return True
+        if item.is_dir:
+            shutil.rmtree(item.trash_path, ignore_errors=True)
+        elif os.path.lexists(item.trash_path):
+            os.remove(item.trash_path)
+        if os.path.lexists(item.trash_path):
+            return False
+        self._forget(item_id)
+        return True
+
+    def empty(self) -> int:
+        """Permanently delete everything in the trash; returns how many items went"""
+        return sum(self.purge(item.item_id) for item in self.list_items())
+
+    def fill_unknown_sizes(self) -> None:
+        """Measure trashed folders whose size was not computed at delete time"""
+        for item in self._rows("SELECT * FROM trash WHERE size = ?", (UNKNOWN_SIZE,)):
+            try:
+                size = _tree_size(item.trash_path)
+            except OSError:
+                continue
+            with self._lock:
+                self._db.execute("UPDATE trash SET size = ? WHERE id = ?", (size, item.item_id))
+                self._db.commit()
+
+    def total_size(self) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM trash WHERE size >= 0").fetchone()
+        return row[0]
+
+    def purge_older_than(self, max_age_seconds: float) -> int:
+        """Permanently delete items trashed more than max_age_seconds ago"""
+        cutoff = time.time() - max_age_seconds
+        items = self._rows("SELECT * FROM trash WHERE deleted_at < ?", (cutoff,))
+        return sum(self.purge(item.item_id) for item in items)
+
+    def purge_to_budget(self, max_bytes: int) -> int:
+        """Delete oldest items until the trash fits in max_bytes"""
+        self.fill_unknown_sizes()
+        total = self.total_size()
+        purged = 0
+        for item in self._rows("SELECT * FROM trash ORDER BY deleted_at ASC"):
+            if total <= max_bytes:
+                break
+            if self.purge(item.item_id):
+                total -= max(item.size, 0)
+                purged += 1
+        return purged
+
+    def start_background_purge(self, max_age_days: float = 30, max_bytes: Optional[int] = None,
+                               interval: float = 3600) -> None:
+        """Periodically purge by age and size budget on a daemon thread"""
+        if self._purge_thread is not None:
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.purge_older_than(max_age_days * 86400)
+                    if max_bytes is not None:
+                        self.purge_to_budget(max_bytes)
+                    else:
+                        self.fill_unknown_sizes()
+                except (OSError, sqlite3.Error):
+                    pass
+                self._stop.wait(interval)
+
+        self._purge_thread = threading.Thread(target=loop, name="bb-trash-purge", daemon=True)
+        self._purge_thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self._db.close()
+
+
+_default_store: Optional[TrashStore] = None
+_default_lock = threading.Lock()
+
+
+def get_trash_store() -> TrashStore:
+    """Process-wide trash store"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = TrashStore()
+        return _default_store
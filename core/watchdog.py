@@ -0,0 +1,167 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Callable, List, NamedTuple, Optional
+
+from .tracing import SpanStats, get_tracer
+
+STALL_THRESHOLD = 0.25
+HEARTBEAT_INTERVAL = 0.05
+MAX_LOG_BYTES = 1024 * 1024
+# A stall is blamed on the innermost frame under this directory, i.e. our code rather than the library it called
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Stall(NamedTuple):
+    """One period in which the event loop did not run for longer than the threshold"""
+    started: float
+    duration: float
+    function: str
+    stack: List[str]
+    samples: int
+
+
+def default_log_path(app_name: str = "BrontoBase") -> str:
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", app_name, "stalls.log")
+
+
+def _describe(frame) -> str:
+    filename = frame.f_code.co_filename
+    if filename.startswith(_APP_ROOT):
+        filename = os.path.relpath(filename, _APP_ROOT)
+    return f"{frame.f_code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _blamed_frame(frame):
+    """Innermost frame in the application's own code, or the innermost frame if there is none"""
+    innermost = frame
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_APP_ROOT):
+            return frame
+        frame = frame.f_back
+    return innermost
+
+
+class EventLoopWatchdog:
+    """Finds calls that block the GUI thread by watching event-loop heartbeats.
+
+    The event loop calls beat() from a repeating timer. A helper thread checks
+    how long ago the last beat was; once that exceeds the threshold it samples
+    the GUI thread's Python stack with sys._current_frames() until the loop
+    comes back. The function seen most often across the samples is blamed, and
+    the stall is logged as a JSON line and passed to on_stall (on the helper
+    thread). The lateness of every beat feeds a latency histogram.
+    """
+
+    def __init__(self, threshold: float = STALL_THRESHOLD, interval: float = HEARTBEAT_INTERVAL,
+                 thread_id: Optional[int] = None, log_path: Optional[str] = None,
+                 on_stall: Optional[Callable[[Stall], None]] = None, max_recent: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.main_thread().ident
+        self.log_path = log_path if log_path is not None else default_log_path()
+        self.on_stall = on_stall
+        self.latency = SpanStats()
+        self.recent: deque = deque(maxlen=max_recent)
+        self.stall_count = 0
+        self._lock = threading.Lock()
+        self._last_beat: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def beat(self) -> None:
+        """Called on the GUI thread every interval seconds by the event loop"""
+        now = time.perf_counter()
+        with self._lock:
+            if self._last_beat is not None:
+                self.latency.add(int(max(0.0, now - self._last_beat - self.interval) * 1e9))
+            self._last_beat = now
+
+    def start(self) -> None:
+        """Start the helper thread; stalls are only detected once the first beat has arrived"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="bb-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def latency_summary(self) -> dict:
+        with self._lock:
+            return dict(self.latency.summary(), stalls=self.stall_count)
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return None
+        return _blamed_frame(frame), traceback.format_stack(frame)
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.threshold / 4)
+        stalled_since = None
+        blamed: Counter = Counter()
+        first_stack: List[str] = []
+        samples = 0
+        while not self._stop.wait(poll):
+            with self._lock:
+                last_beat = self._last_beat
+            if last_beat is None:
+                continue
+            if stalled_since is not None and last_beat != stalled_since:
+                # The loop ran again: the stall lasted from the beat before it to this one
+                self._report(stalled_since, last_beat - stalled_since, blamed, first_stack, samples)
+                stalled_since = None
+                blamed, first_stack, samples = Counter(), [], 0
+                continue
+            if time.perf_counter() - last_beat < self.threshold:
+                continue
+            sample = self._sample()
+            if sample is None:
+                continue
+            frame, stack = sample
+            if stalled_since is None:
+                stalled_since = last_beat
+                first_stack = stack
+            blamed[_describe(frame)] += 1
+            samples += 1
+
+    def _report(self, started: float, duration: float, blamed: Counter, stack: List[str], samples: int) -> None:
+        stall = Stall(time.time() - (time.perf_counter() - started), duration,
+                      blamed.most_common(1)[0][0] if blamed else "", stack, samples)
+        with self._lock:
+            self.stall_count += 1
+            self.recent.append(stall)
+        tracer = get_tracer()
+        start_ns = int(started * 1e9)
+        tracer.record("gui.event_loop_stall", start_ns, start_ns + int(duration * 1e9), {'function': stall.function})
+        self._log(stall)
+        if self.on_stall:
+            self.on_stall(stall)
+
+    def _log(self, stall: Stall) -> None:
+        if not self.log_path:
+            return
+        record = {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(stall.started)),
+            'duration_ms': round(stall.duration * 1000, 1),
+            'function': stall.function,
+            'samples': stall.samples,
+            'stack': [line.rstrip() for line in stall.stack],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > MAX_LOG_BYTES:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
@@ -1,6 +1,9 @@
 import os
+import stat
+import time
+import threading
 import json
-import pickle
+from datetime import datetime
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSplitter,
@@ -9,36 +12,18 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSplitter,
     QTreeView, QTableView, QPushButton, QListView, QStackedWidget, QRadioButton, QButtonGroup,
     QMessageBox, QInputDialog, QStatusBar, QFileSystemModel, QFrame, QHeaderView, QFileDialog,
-    QMenu, QDialog, QLineEdit, QComboBox, QCheckBox, QTextEdit, QProgressBar, QGroupBox, QApplication,
-    QTabWidget, QFormLayout, QFontComboBox, QSpinBox
+    QMenu, QDialog, QLineEdit, QComboBox, QCheckBox, QProgressBar, QGroupBox, QApplication,
+    QTabWidget, QFormLayout, QFontComboBox, QSpinBox, QTreeWidget, QTreeWidgetItem,
+    QTableWidget, QTableWidgetItem
 )
-from PyQt5.QtCore import Qt, QSortFilterProxyModel, QSize, QDir, QFileInfo, QDateTime
-from PyQt5.QtGui import QIcon, QPalette, QColor, QLinearGradient, QStandardItemModel, QStandardItem, QFont
+from PyQt5.QtCore import Qt, QSortFilterProxyModel, QSize, QDir, QDateTime, QAbstractTableModel, QModelIndex, QTimer, QRectF, pyqtSignal
+from PyQt5.QtGui import QIcon, QPalette, QColor, QLinearGradient, QStandardItemModel, QStandardItem, QFont, QPainter, QPen
 
 # Assume core modules exist in a 'core' directory
 # from core import NavigationHistory, FavoritesManager, FileSearcher
+from core.navigation import NavigationHistory
 
 # ---- Mock core modules for standalone execution ----
-class NavigationHistory:
-    def __init__(self):
-        self.history = []
-        self.current_index = -1
-    def add_to_history(self, path):
-        if self.current_index < len(self.history) - 1:
-            self.history = self.history[:self.current_index + 1]
-        self.history.append(path)
-        self.current_index += 1
-    def go_back(self):
-        if self.current_index > 0:
-            self.current_index -= 1
-            return self.history[self.current_index]
-        return None
-    def go_forward(self):
-        if self.current_index < len(self.history) - 1:
-            self.current_index += 1
-            return self.history[self.current_index]
-        return None
-
 class FavoritesManager:
     def __init__(self, filepath='favorites.json'):
         self.filepath = filepath
@@ -55,10 +40,11 @@ class FavoritesManager:
     def get_favorites(self):
         return self.favorites
     def add_favorite(self, path):
-        if not os.path.exists(path) or any(fav['path'] == path for fav in self.favorites):
+        stat_cache = get_stat_cache()
+        if not stat_cache.exists(path) or any(fav['path'] == path for fav in self.favorites):
             return False
         name = os.path.basename(path)
-        fav_type = 'file' if os.path.isfile(path) else 'folder'
+        fav_type = 'file' if stat_cache.isfile(path) else 'folder'
         self.favorites.append({'name': name, 'path': path, 'type': fav_type})
         self._save()
         return True
@@ -71,12 +57,23 @@ class FavoritesManager:
         return False
 
 class FileSearcher:
-    def search_files(self, directory, pattern, recursive=True):
+    def search_files(self, directory, pattern, recursive=True, use_excludes=True):
+        from core.excludes import get_exclude_engine
         results = []
-        for root, _, files in os.walk(directory):
+        directory = os.path.abspath(directory)
+        excludes = get_exclude_engine() if use_excludes else None
+        contexts = {directory: excludes.context_for(directory)} if excludes else {}
+        for root, dirs, files in os.walk(directory):
+            context = contexts.pop(root).enter(root, files) if excludes else None
+            if context is not None:
+                # Prune ignored folders in place so os.walk never descends into them
+                dirs[:] = [d for d in dirs if not context.excluded(os.path.join(root, d), True)]
+                contexts.update((os.path.join(root, d), context) for d in dirs)
             for name in files:
                 if pattern in name: # Simple substring search
-                    results.append(os.path.join(root, name))
+                    path = os.path.join(root, name)
+                    if context is None or not context.excluded(path, False):
+                        results.append(path)
             if not recursive:
                 break
         return results
@@ -89,10 +86,26 @@ class FileSearcher:
         elif size_bytes < 1024**3: return f"{size_bytes/1024**2:.2f} MB"
         else: return f"{size_bytes/1024**3:.2f} GB"
 
-# ---- add imports for ctypes known folders ----
 import sys
-import ctypes
-from ctypes import wintypes
+
+# Only what the first window needs is imported here; dialogs and file operations
+# import their core modules when first used
+from core.listing_cache import DirectoryListingCache
+from core.prefetch import DirectoryPrefetcher
+from core.stat_cache import get_stat_cache
+from core.mounts import format_capacity, get_mount_service
+from core.results import COLUMNS as RESULT_COLUMNS, UNKNOWN as UNKNOWN_FIELD, ResultColumns, inverse_order
+from core.tracing import get_tracer, traced
+from core.watchdog import EventLoopWatchdog
+from core.metadata import COLUMNS as METADATA_COLUMNS, describe, get_metadata_service
+from gui.workers import TaskRunner
+
+
+def format_size(size_bytes):
+    if size_bytes < 1024: return f"{size_bytes} bytes"
+    elif size_bytes < 1024**2: return f"{size_bytes/1024:.2f} KB"
+    elif size_bytes < 1024**3: return f"{size_bytes/1024**2:.2f} MB"
+    else: return f"{size_bytes/1024**3:.2f} GB"
 
 
 class DirsOnlyProxyModel(QSortFilterProxyModel):
@@ -100,6 +113,109 @@ class DirsOnlyProxyModel(QSortFilterProxyModel):
         index = self.sourceModel().index(source_row, 0, source_parent)
         return self.sourceModel().isDir(index)
 
+METADATA_SORT_ROLE = Qt.UserRole + 10
+
+
+class MetadataFileSystemModel(QFileSystemModel):
+    """QFileSystemModel plus sortable columns filled in from the metadata service.
+
+    Views only ask for the rows they paint, so extraction is requested for
+    visible rows (or all rows while sorting by a metadata column). Cells and
+    sort comparisons are answered from a per-row cache only; misses are
+    collected and looked up in the store in one batch on a worker, and what
+    the store lacks is queued for extraction.
+    """
+    metadata_ready = pyqtSignal(str, object)
+    LOOKUP_DELAY_MS = 30
+
+    def __init__(self, service=None):
+        super().__init__()
+        self.metadata = service or get_metadata_service()
+        self.first_metadata_column = super().columnCount()
+        self.metadata_ready.connect(self.on_metadata_ready)
+        self.row_cache = {}   # path -> (size, mtime_ms, fields)
+        self.wanted = {}      # path -> (size, mtime_ms), waiting for the next batch
+        self.in_flight = {}   # path -> (size, mtime_ms), being looked up or extracted
+        self.lookup_runner = TaskRunner(max_workers=1, name="bb-meta-lookup")
+        self.lookup_timer = QTimer(self)
+        self.lookup_timer.setSingleShot(True)
+        self.lookup_timer.timeout.connect(self.lookup_wanted)
+        # Entries are only useful for the folder on show
+        self.rootPathChanged.connect(lambda _path: self.row_cache.clear())
+
+    def columnCount(self, parent=QModelIndex()):
+        count = super().columnCount(parent)
+        return count + len(METADATA_COLUMNS) if count else 0
+
+    def metadata_fields(self, index):
+        if self.isDir(index):
+            return None
+        path = self.filePath(index)
+        size, mtime_ms = self.size(index), self.lastModified(index).toMSecsSinceEpoch()
+        cached = self.row_cache.get(path)
+        if cached is not None and cached[0] == size and cached[1] == mtime_ms:
+            return cached[2]
+        if self.in_flight.get(path) != (size, mtime_ms) and path not in self.wanted:
+            self.wanted[path] = (size, mtime_ms)
+            if not self.lookup_timer.isActive():
+                self.lookup_timer.start(self.LOOKUP_DELAY_MS)
+        return None
+
+    def lookup_wanted(self):
+        files = [(path, size, mtime_ms) for path, (size, mtime_ms) in self.wanted.items()]
+        self.in_flight.update(self.wanted)
+        self.wanted = {}
+        service = self.metadata
+
+        def task():
+            found = service.get_many(files)
+            misses = [f for f in files if f[0] not in found]
+            # Emitted from a pool thread; the queued signal brings it back to the GUI thread
+            service.request(misses, lambda path, fields: self.metadata_ready.emit(path, fields))
+            return found
+        self.lookup_runner.submit(task, on_done=self.on_lookup_done,
+                                  on_error=lambda error: [self.in_flight.pop(f[0], None) for f in files])
+
+    def cancel_pending(self):
+        """Drop lookups and queued extractions for rows no longer shown; they are requested again when painted"""
+        self.lookup_timer.stop()
+        self.wanted = {}
+        self.in_flight = {}
+        self.metadata.cancel_pending()
+
+    def on_lookup_done(self, found):
+        for path, fields in found.items():
+            self.on_metadata_ready(path, fields)
+
+    def data(self, index, role=Qt.DisplayRole):
+        column = index.column() - self.first_metadata_column
+        if column < 0:
+            return super().data(index, role)
+        if role not in (Qt.DisplayRole, METADATA_SORT_ROLE):
+            return None
+        fields = self.metadata_fields(index)
+        if fields is None:
+            return "" if role == Qt.DisplayRole else 0
+        spec = METADATA_COLUMNS[column]
+        return spec.display(fields) if role == Qt.DisplayRole else spec.sort_key(fields)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        column = section - self.first_metadata_column
+        if column >= 0 and orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return METADATA_COLUMNS[column].title
+        return super().headerData(section, orientation, role)
+
+    def on_metadata_ready(self, path, fields):
+        version = self.in_flight.pop(path, None)
+        if version is None:
+            return
+        self.row_cache[path] = (version[0], version[1], fields)
+        first = self.index(path, self.first_metadata_column)
+        if first.isValid():
+            last = self.index(path, self.first_metadata_column + len(METADATA_COLUMNS) - 1)
+            self.dataChanged.emit(first, last)
+
+
 class FileSystemProxyModel(QSortFilterProxyModel):
     def __init__(self):
         super().__init__()
@@ -122,9 +238,132 @@ class FileSystemProxyModel(QSortFilterProxyModel):
                 return os.path.splitext(original_name)[0]
         return super().data(index, role)
 
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        first = getattr(model, 'first_metadata_column', None)
+        if first is not None and left.column() >= first:
+            return model.data(left, METADATA_SORT_ROLE) < model.data(right, METADATA_SORT_ROLE)
+        return super().lessThan(left, right)
+
+
+class ListingSnapshotModel(QAbstractTableModel):
+    """Read-only table over a cached DirectorySnapshot, shown while QFileSystemModel loads"""
+    HEADERS = ["Name", "Size", "Type", "Date Modified"]
+
+    def __init__(self):
+        super().__init__()
+        self.snapshot = None
+        self.entries = []
+
+    def set_snapshot(self, snapshot):
+        self.beginResetModel()
+        self.snapshot = snapshot
+        self.entries = sorted(snapshot.entries, key=lambda e: (not e.is_dir, e.name.lower())) if snapshot else []
+        self.endResetModel()
+
+    def path_at(self, row):
+        return os.path.join(self.snapshot.path, self.entries[row].name)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        entry = self.entries[index.row()]
+        col = index.column()
+        if col == 0:
+            return entry.name
+        if col == 1:
+            return "" if entry.is_dir else format_size(entry.size)
+        if col == 2:
+            if entry.is_dir:
+                return "File folder"
+            ext = os.path.splitext(entry.name)[1][1:]
+            return f"{ext.upper()} File" if ext else "File"
+        return QDateTime.fromSecsSinceEpoch(int(entry.mtime)).toString("yyyy-MM-dd HH:mm")
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """Read-only table over ResultColumns; view rows map to result rows through a sort permutation.
+
+    data() formats only the rows the view asks for, so a million results cost
+    no more to show than a screenful.
+    """
+    HEADERS = ["Name", "Folder", "Size", "Date Modified", "Score"]
+
+    def __init__(self):
+        super().__init__()
+        self.columns = ResultColumns()
+        self.order = None
+
+    def set_results(self, columns):
+        self.beginResetModel()
+        self.columns = columns
+        self.order = None
+        self.endResetModel()
+
+    def source_row(self, row):
+        return self.order[row] if self.order is not None else row
+
+    def path_at(self, row):
+        return self.columns.paths[self.source_row(row)]
+
+    def apply_order(self, columns, order, inverse):
+        """Show rows in a permutation from ResultColumns.sort_order; selection follows the rows"""
+        if columns is not self.columns:
+            return False
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        sources = [self.source_row(index.row()) for index in old]
+        self.order = order
+        self.changePersistentIndexList(old, [self.index(inverse[row], index.column())
+                                             for row, index in zip(sources, old)])
+        self.layoutChanged.emit()
+        return True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        row = self.columns.row(self.source_row(index.row()))
+        if role == Qt.ToolTipRole:
+            return row.path
+        col = index.column()
+        if col == 0:
+            return os.path.basename(row.path)
+        if col == 1:
+            return os.path.dirname(row.path)
+        if col == 2:
+            return "" if row.size == UNKNOWN_FIELD else format_size(row.size)
+        if col == 3:
+            if row.mtime_ns == UNKNOWN_FIELD:
+                return ""
+            return QDateTime.fromSecsSinceEpoch(row.mtime_ns // 10**9).toString("yyyy-MM-dd HH:mm")
+        return f"{row.score:g}"
+
 
 # ---- Known Folders support ----
 if sys.platform.startswith('win'):
+    import ctypes
     _SHGetKnownFolderPath = ctypes.windll.shell32.SHGetKnownFolderPath
     _SHGetKnownFolderPath.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p, ctypes.POINTER(ctypes.c_wchar_p)]
     _SHGetKnownFolderPath.restype = ctypes.c_long
@@ -182,15 +421,43 @@ def resolve_special_folder(label: str) -> str:
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted once deferred startup work is done, with perf_counter timestamps of each phase
+    startup_finished = pyqtSignal(dict)
+    # Mount service callbacks arrive on background threads; these carry them to the GUI thread
+    mount_usage_ready = pyqtSignal(object, object)
+    mounts_changed = pyqtSignal(object)
+    # Name of a smart folder whose results changed, emitted from whichever thread updated the index
+    smart_folder_changed = pyqtSignal(str)
+
+    def __init__(self, defer_startup=True):
         super().__init__()
+        self.startup_timings = {'init_started': time.perf_counter()}
         self.setWindowTitle("BrontoASPHERE File Manager")
         self.setGeometry(100, 100, 1400, 850) # Increased size for better layout
 
         # Initialize core modules first
+        self.stat_cache = get_stat_cache()
+        self.tracer = get_tracer()
+        self.model_load_started = {}
+        # Stalls of the event loop are logged with the function that blocked it (see core.watchdog)
+        self.watchdog = EventLoopWatchdog()
+        self.watchdog_timer = QTimer(self)
+        self.watchdog_timer.timeout.connect(self.watchdog.beat)
+        self.watchdog_timer.start(int(self.watchdog.interval * 1000))
         self.navigation_history = NavigationHistory()
         self.favorites_manager = FavoritesManager()
         self.file_searcher = FileSearcher()
+        self.listing_cache = DirectoryListingCache()
+        self.task_runner = TaskRunner()
+        self.prefetcher = DirectoryPrefetcher(self.listing_cache)
+        self.mount_service = get_mount_service()
+        self.drives_root = None
+        self.drive_items = {}
+        self.mount_usage_ready.connect(self.on_mount_usage_ready)
+        self.mounts_changed.connect(self.populate_drives)
+        self.mount_service.add_listener(self.mounts_changed.emit)
+        # Opened on first use (the navigation tree lists smart folders during startup)
+        self._smart_folders = None
 
         # --- Create a centralized icon manager ---
         self._create_icons()
@@ -269,9 +536,9 @@ class MainWindow(QMainWindow):
         self.switch_header_section("Home") # Default to Home for a more useful initial view
 
         # === File System Model ===
-        self.model = QFileSystemModel()
-        self.model.setRootPath('')
+        self.model = MetadataFileSystemModel()
         self.model.setFilter(self.model.filter() |  QDir.Hidden) # Show hidden files
+        self.model.directoryLoaded.connect(self.on_directory_loaded)
 
         # === Combined Navigation Tree (Quick Access + Drives) ===
         self.nav_model = QStandardItemModel()
@@ -304,7 +571,6 @@ class MainWindow(QMainWindow):
             }
         """)
 
-        self.build_navigation_tree()
         self.nav_tree.expanded.connect(self.on_nav_expanded)
         self.nav_tree.clicked.connect(self.on_nav_clicked)
         self.nav_tree.doubleClicked.connect(self.on_nav_double_clicked)
@@ -318,8 +584,9 @@ class MainWindow(QMainWindow):
         # === File View (QTableView - List View) ===
         self.file_view = QTableView()
         self.file_view.setModel(self.proxy_model)
-        # We need to map the root path to the proxy index
-        root_idx = self.model.index(self.model.rootPath())
+        # Start at the (empty) top level; the model is rooted and the home folder
+        # opened by the startup steps
+        root_idx = QModelIndex()
         self.file_view.setRootIndex(self.proxy_model.mapFromSource(root_idx))
         self.file_view.setSelectionBehavior(QTableView.SelectRows)
         self.file_view.setAlternatingRowColors(True)
@@ -372,8 +639,12 @@ class MainWindow(QMainWindow):
         self.file_view.setColumnWidth(1, 120)
         self.file_view.setColumnWidth(2, 140)
         self.file_view.setColumnWidth(3, 170)
+        for offset in range(len(METADATA_COLUMNS)):
+            self.file_view.setColumnWidth(self.model.first_metadata_column + offset, 110)
 
         self.file_view.doubleClicked.connect(self.open_file)
+        self.file_view.setMouseTracking(True)
+        self.file_view.entered.connect(self.on_file_hovered)
         self.file_view.setSortingEnabled(True)
         self.file_view.sortByColumn(3, Qt.DescendingOrder)
         self.file_view.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -404,13 +675,32 @@ class MainWindow(QMainWindow):
             }
         """)
         self.file_grid_view.doubleClicked.connect(self.open_file)
+        self.file_grid_view.setMouseTracking(True)
+        self.file_grid_view.entered.connect(self.on_file_hovered)
         self.file_grid_view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.file_grid_view.customContextMenuRequested.connect(self.on_file_context_menu)
 
+        # === Snapshot View (cached listing shown until the live model has loaded) ===
+        self.snapshot_model = ListingSnapshotModel()
+        self.snapshot_view = QTableView()
+        self.snapshot_view.setModel(self.snapshot_model)
+        self.snapshot_view.setSelectionBehavior(QTableView.SelectRows)
+        self.snapshot_view.setAlternatingRowColors(True)
+        self.snapshot_view.setStyleSheet(self.file_view.styleSheet())
+        self.snapshot_view.horizontalHeader().setStyleSheet(header_style)
+        self.snapshot_view.verticalHeader().setStyleSheet(header_style)
+        self.snapshot_view.horizontalHeader().setStretchLastSection(True)
+        self.snapshot_view.setColumnWidth(0, 350)
+        self.snapshot_view.setColumnWidth(1, 120)
+        self.snapshot_view.setColumnWidth(2, 140)
+        self.snapshot_view.doubleClicked.connect(self.open_snapshot_entry)
+
         # === View Stack ===
         self.view_stack = QStackedWidget()
         self.view_stack.addWidget(self.file_view)      # Index 0: List
         self.view_stack.addWidget(self.file_grid_view) # Index 1: Grid
+        self.view_stack.addWidget(self.snapshot_view)  # Index 2: Cached snapshot
+        self.live_view_index = 0
 
         # === Splitter ===
         tree_and_files_splitter = QSplitter(Qt.Horizontal)
@@ -452,8 +742,77 @@ class MainWindow(QMainWindow):
         self.clipboard_paths = []
         self.clipboard_mode = None
 
-        # Initial navigation to home directory
-        self.navigate_to_directory(str(Path.home()))
+        # Filling the model, the navigation tree and the drive list all touch the
+        # disk, so by default they run after the window has painted once
+        self._startup_steps = [
+            self.watchdog.start,
+            lambda: self.model.setRootPath(''),
+            lambda: self.navigate_to_directory(str(Path.home())),
+            self.build_navigation_tree,
+            lambda: self.trash_store.start_background_purge(max_age_days=30),
+            self.mount_service.start_watching,
+        ]
+        self.startup_timings['init_finished'] = time.perf_counter()
+        if not defer_startup:
+            self.run_startup_steps(all_at_once=True)
+
+    @property
+    def trash_store(self):
+        from core.trash import get_trash_store
+        return get_trash_store()
+
+    @property
+    def file_index(self):
+        from core.file_index import get_file_index
+        return get_file_index()
+
+    @property
+    def smart_folders(self):
+        if self._smart_folders is None:
+            from core.smart_folders import SmartFolderManager
+            self._smart_folders = SmartFolderManager(self.file_index)
+            self._smart_folders.add_listener(self.smart_folder_changed.emit)
+        return self._smart_folders
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if 'shown' not in self.startup_timings:
+            self.startup_timings['shown'] = time.perf_counter()
+            # Normally the first paint starts the deferred steps; this covers a window
+            # that is shown but not painted (e.g. shown minimized)
+            QTimer.singleShot(1000, self.begin_startup_steps)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if 'first_paint' not in self.startup_timings:
+            self.startup_timings['first_paint'] = time.perf_counter()
+            QTimer.singleShot(0, self.begin_startup_steps)
+            self._report_startup()
+
+    def begin_startup_steps(self):
+        if 'steps_started' not in self.startup_timings:
+            self.run_startup_steps()
+
+    def run_startup_steps(self, all_at_once=False):
+        """Run deferred startup work one step per event loop pass so the window keeps painting"""
+        if 'steps_started' not in self.startup_timings:
+            self.startup_timings['steps_started'] = time.perf_counter()
+        while self._startup_steps:
+            self._startup_steps.pop(0)()
+            if not all_at_once and self._startup_steps:
+                QTimer.singleShot(0, self.run_startup_steps)
+                return
+        if 'ready' in self.startup_timings:
+            return
+        self.startup_timings['ready'] = time.perf_counter()
+        self._report_startup()
+        # Offer to finish or undo batches cut short by a crash
+        QTimer.singleShot(0, self.check_interrupted_batches)
+
+    def _report_startup(self):
+        """Emit startup_finished once the window has both painted and finished its startup steps"""
+        if 'first_paint' in self.startup_timings and 'ready' in self.startup_timings:
+            self.startup_finished.emit(dict(self.startup_timings))
 
     def _create_icons(self):
         """Creates and stores QIcons for the application."""
@@ -484,6 +843,7 @@ class MainWindow(QMainWindow):
             'drive': QIcon.fromTheme("drive-harddisk", QIcon(get_icon_path("drive.png"))),
             'folder': QIcon.fromTheme("folder", QIcon(get_icon_path("folder.png"))),
             'file': QIcon.fromTheme("text-x-generic", QIcon(get_icon_path("file.png"))),
+            'smart_folder': QIcon.fromTheme("folder-saved-search", QIcon(get_icon_path("smart_folder.png"))),
         }
 
     def apply_dark_theme(self):
@@ -527,6 +887,7 @@ class MainWindow(QMainWindow):
         if section == "File":
             file_actions = [
                 ("commandprompt", self.open_cmd, "commandprompt.png"),
+                ("diagnostics", self.show_diagnostics, "diagnostics.png"),
                 ("about", self.show_about, "about.png"),
                 ("close", self.close, "close.png"),
             ]
@@ -546,6 +907,11 @@ class MainWindow(QMainWindow):
                 ("compress", self.on_compress, "compress.png"),
                 ("rename", self.on_rename, "rename.png"),
                 ("favourites", self.on_add_to_favorites, "favourites.png"),
+                ("duplicates", self.on_find_duplicates, "duplicates.png"),
+                ("diskusage", self.on_disk_usage, "diskusage.png"),
+                ("sync", self.on_sync_folders, "sync.png"),
+                ("delete", self.on_delete, "delete.png"),
+                ("trash", self.on_show_trash, "trash.png"),
             ]
             for action in actions:
                 self.add_ribbon_button(*action)
@@ -576,15 +942,15 @@ class MainWindow(QMainWindow):
             rb_list.setStyleSheet("color: #ccc;")
             rb_grid.setStyleSheet("color: #ccc;")
             
-            if self.view_stack.currentIndex() == 0: rb_list.setChecked(True)
+            if self.live_view_index == 0: rb_list.setChecked(True)
             else: rb_grid.setChecked(True)
             
             bg = QButtonGroup(mode_group) # Keep references
             bg.addButton(rb_list)
             bg.addButton(rb_grid)
             
-            rb_list.toggled.connect(lambda c: c and self.view_stack.setCurrentIndex(0))
-            rb_grid.toggled.connect(lambda c: c and self.view_stack.setCurrentIndex(1))
+            rb_list.toggled.connect(lambda c: c and self.set_view_mode(0))
+            rb_grid.toggled.connect(lambda c: c and self.set_view_mode(1))
             
             mode_layout.addWidget(rb_list)
             mode_layout.addWidget(rb_grid)
@@ -644,6 +1010,10 @@ class MainWindow(QMainWindow):
         self.ribbon_options_layout.addStretch() # Pushes buttons to the left
         self.header_section = section
 
+    def set_view_mode(self, index):
+        self.live_view_index = index
+        self.view_stack.setCurrentIndex(index)
+
     def update_app_font(self):
         font = self.font_combo.currentFont()
         font.setPointSize(self.font_size.value())
@@ -667,7 +1037,7 @@ class MainWindow(QMainWindow):
             btn.setIconSize(QSize(70, 70))
             btn.setStyleSheet(self.get_button_style())
         else:
-            fallback_texts = {"back": "⬅", "forward": "➡", "move": "📂", "commandprompt": "🖥", "about": "ℹ", "close": "❌"}
+            fallback_texts = {"back": "⬅", "forward": "➡", "move": "📂", "commandprompt": "🖥", "about": "ℹ", "close": "❌", "duplicates": "⧉", "diskusage": "▦", "trash": "♻", "sync": "⇄", "diagnostics": "⏱"}
             btn.setText(fallback_texts.get(label, label[0].upper()))
             btn.setStyleSheet(self.get_button_style() + "QPushButton { font-size: 18px; font-weight: bold; }")
 
@@ -708,10 +1078,10 @@ class MainWindow(QMainWindow):
         }
         for label, icon in special_folders.items():
             path = resolve_special_folder(label)
-            if path and os.path.exists(path):
+            if path and self.stat_cache.exists(path):
                 item = self.create_tree_item(label, path, icon)
                 qa_root.appendRow(item)
-                if os.path.isdir(path):
+                if self.stat_cache.isdir(path):
                     item.appendRow(QStandardItem(""))
 
         favorites_root = QStandardItem("Favorites")
@@ -729,20 +1099,61 @@ class MainWindow(QMainWindow):
             item.setData("__favorite__", Qt.UserRole+1)
             favorites_root.appendRow(item)
 
-        drives_root = QStandardItem("This PC")
-        drives_root.setIcon(self.icons['drives'])
-        drives_root.setEditable(False)
-        drives_root.setData("__section__", Qt.UserRole+1)
-        root.appendRow(drives_root)
+        smart_root = QStandardItem("Smart Folders")
+        smart_root.setIcon(self.icons['smart_folder'])
+        smart_root.setEditable(False)
+        smart_root.setData("__section__", Qt.UserRole+1)
+        root.appendRow(smart_root)
 
-        for drive in self.enumerate_drives():
-            d_item = self.create_tree_item(drive, drive, self.icons['drive'])
-            drives_root.appendRow(d_item)
-            d_item.appendRow(QStandardItem(""))
+        for search in self.smart_folders.searches():
+            item = QStandardItem(search.name)
+            item.setIcon(self.icons['smart_folder'])
+            item.setEditable(False)
+            item.setToolTip(search.describe())
+            item.setData(search.name, Qt.UserRole)
+            item.setData("__smart_folder__", Qt.UserRole+1)
+            smart_root.appendRow(item)
+
+        self.drives_root = QStandardItem("This PC")
+        self.drives_root.setIcon(self.icons['drives'])
+        self.drives_root.setEditable(False)
+        self.drives_root.setData("__section__", Qt.UserRole+1)
+        root.appendRow(self.drives_root)
+        self.populate_drives(self.mount_service.list_mounts())
 
         self.nav_tree.expand(qa_root.index())
         self.nav_tree.expand(favorites_root.index())
-        self.nav_tree.expand(drives_root.index())
+        self.nav_tree.expand(smart_root.index())
+        self.nav_tree.expand(self.drives_root.index())
+
+    def populate_drives(self, mounts):
+        """Fill "This PC" from the mount table straight away; capacities arrive later as tooltips"""
+        if self.drives_root is None:
+            return
+        self.drives_root.removeRows(0, self.drives_root.rowCount())
+        self.drive_items = {}
+        for mount in mounts:
+            label = mount.path if mount.path.endswith(':\\') else f"{mount.label} ({mount.path})"
+            d_item = self.create_tree_item(label, mount.path, self.icons['drive'])
+            usage = self.mount_service.usage(mount.path)
+            d_item.setToolTip(format_capacity(usage) if usage else mount.device)
+            self.drives_root.appendRow(d_item)
+            # Remote drives may not answer; only offer to expand them once they have
+            if not mount.is_remote or usage is not None:
+                d_item.appendRow(QStandardItem(""))
+            self.drive_items[mount.path] = d_item
+        self.mount_service.probe_usage(mounts, self.mount_usage_ready.emit)
+
+    def on_mount_usage_ready(self, mount, usage):
+        item = self.drive_items.get(mount.path)
+        if item is None:
+            return
+        if usage is None:
+            item.setToolTip(f"{mount.device} (not responding)" if mount.is_remote else mount.device)
+            return
+        item.setToolTip(format_capacity(usage))
+        if not item.hasChildren():
+            item.appendRow(QStandardItem(""))
 
     def create_tree_item(self, label: str, path: str, icon: QIcon = None) -> QStandardItem:
         it = QStandardItem(label)
@@ -753,12 +1164,11 @@ class MainWindow(QMainWindow):
         return it
 
     def enumerate_drives(self):
-        import string
-        return [f"{d}:\\" for d in string.ascii_uppercase if os.path.exists(f"{d}:\\")]
+        return [mount.path for mount in self.mount_service.list_mounts()]
 
     def on_path_entered(self):
         path = self.path_edit.text()
-        if os.path.isdir(path):
+        if self.stat_cache.isdir(path):
             self.navigate_to_directory(path)
         else:
             QMessageBox.warning(self, "Invalid Path", f"The path '{path}' does not exist or is not a directory.")
@@ -771,7 +1181,9 @@ class MainWindow(QMainWindow):
 
         if item_type == "__favorite__":
             self.on_favorite_clicked(index)
-        elif path and os.path.isdir(path):
+        elif item_type == "__smart_folder__":
+            self.open_smart_folder(path)
+        elif path and self.stat_cache.isdir(path):
             self.navigate_to_directory(path)
 
     def on_nav_double_clicked(self, index):
@@ -781,8 +1193,10 @@ class MainWindow(QMainWindow):
 
         if item_type == "__favorite__":
             self.on_favorite_double_clicked(index)
-        elif path and os.path.exists(path):
-            if os.path.isdir(path):
+        elif item_type == "__smart_folder__":
+            return  # opened by the first click
+        elif path and self.stat_cache.exists(path):
+            if self.stat_cache.isdir(path):
                 self.navigate_to_directory(path)
             else:
                 os.startfile(path)
@@ -807,11 +1221,29 @@ class MainWindow(QMainWindow):
                 path = item.data(Qt.UserRole)
                 self.remove_favorite(path)
                 self.status_bar.showMessage("Removed from favorites", 2000)
-
+        elif item_type == "__smart_folder__":
+            name = item.data(Qt.UserRole)
+            menu = QMenu(self)
+            menu.setStyleSheet("""
+                QMenu { background-color: #2a2a2a; color: #ccc; border: 1px solid #555; }
+                QMenu::item { padding: 8px 20px; }
+                QMenu::item:selected { background-color: #ffd700; color: #000; }
+            """)
+            open_action = menu.addAction("📂 Open")
+            remove_action = menu.addAction("🗑 Delete Smart Folder")
+            action = menu.exec_(self.nav_tree.mapToGlobal(position))
+            if action == open_action:
+                self.open_smart_folder(name)
+            elif action == remove_action:
+                if self.smart_folders.remove(name):
+                    self.build_navigation_tree()
+                    self.status_bar.showMessage(f"Deleted smart folder '{name}'", 2000)
+
+    @traced("gui.nav_expand")
     def on_nav_expanded(self, index):
         item = self.nav_model.itemFromIndex(index)
         path = item.data(Qt.UserRole)
-        if not path or not os.path.isdir(path): return
+        if not path or not self.stat_cache.isdir(path): return
 
         if item.hasChildren() and item.child(0).data(Qt.UserRole) is None and item.child(0).text() == "":
             item.removeRows(0, item.rowCount())
@@ -836,9 +1268,9 @@ class MainWindow(QMainWindow):
         source_index = self.proxy_model.mapToSource(index)
         path = self.model.filePath(source_index)
         
-        if os.path.isdir(path):
+        if self.stat_cache.isdir(path):
             self.navigate_to_directory(path)
-        elif os.path.isfile(path):
+        elif self.stat_cache.isfile(path):
             try:
                 os.startfile(path)
             except Exception as e:
@@ -849,12 +1281,16 @@ class MainWindow(QMainWindow):
         os.chdir(current_dir)
         os.system('start cmd')
 
+    def show_diagnostics(self):
+        dialog = DiagnosticsDialog(self, self.tracer, self.watchdog)
+        dialog.exec_()
+
     def show_about(self):
         QMessageBox.information(self, "About", "BrontoSphere File Manager\nVersion 1.0\nPowered by PyQt5")
 
     def get_selected_paths(self):
         # Determine active view
-        if self.view_stack.currentIndex() == 0:
+        if self.live_view_index == 0:
             view = self.file_view
         else:
             view = self.file_grid_view
@@ -876,26 +1312,114 @@ class MainWindow(QMainWindow):
         return self.model.filePath(self.proxy_model.mapToSource(self.file_view.rootIndex()))
 
     def refresh_current_dir(self):
+        # Refreshes follow file operations; drop stat results they may have invalidated
+        self.stat_cache.clear()
+        self.update_index_for(self.get_current_dir())
         self.navigate_to_directory(self.get_current_dir(), record_history=False)
 
+    def closeEvent(self, event):
+        if self._smart_folders is not None:
+            self._smart_folders.close()
+        self.watchdog_timer.stop()
+        self.watchdog.stop()
+        self.mount_service.stop_watching()
+        self.model.metadata.shutdown()
+        self.task_runner.shutdown()
+        super().closeEvent(event)
+
+    @traced("gui.navigate")
     def navigate_to_directory(self, path, record_history=True):
-        if not os.path.exists(path): return
-        
+        if not self.stat_cache.exists(path): return
+
+        # Rows of the folder being left no longer need their metadata
+        self.model.cancel_pending()
+
         # We need to map the source model index for 'path' to the proxy model index
         src_index = self.model.index(path)
+        # Loads of folders left before they finished are no longer measured
+        self.model_load_started.clear()
+        if self.tracer.enabled and self.model.canFetchMore(src_index):
+            # Closed by on_directory_loaded once the live model has the folder; folders the model
+            # already holds emit no directoryLoaded, so they are not timed
+            self.model_load_started[os.path.normcase(os.path.normpath(path))] = time.perf_counter_ns()
         proxy_index = self.proxy_model.mapFromSource(src_index)
         
         self.file_view.setRootIndex(proxy_index)
         self.file_grid_view.setRootIndex(proxy_index)
+
+        # Render the cached listing straight away if the live model has nothing yet
+        self.prefetcher.record_access(path)
+        snapshot = self.listing_cache.get(path)
+        if snapshot is not None and self.model.rowCount(src_index) == 0:
+            self.show_listing_snapshot(snapshot)
+        else:
+            self.show_live_view()
+        self.task_runner.submit(self.prefetcher.run_foreground, self.listing_cache.revalidate, path,
+                                on_done=lambda result, p=path: self.on_listing_revalidated(p, result))
         
         self.path_edit.setText(path)
         
         if record_history:
             self.navigation_history.add_to_history(path)
+
+        self.prefetch_likely_next()
             
         # Update window title
         self.setWindowTitle(f"{os.path.basename(path)} - BrontoASPHERE File Manager")
 
+    def prefetch_likely_next(self):
+        """Warm listings for the forward stack, folder favorites and the current row"""
+        self.prefetcher.cancel_pending()
+        candidates = self.navigation_history.get_forward_paths()[:5]
+        candidates += [fav['path'] for fav in self.favorites_manager.get_favorites() if fav.get('type') == 'folder']
+        current = self.file_view.currentIndex()
+        if current.isValid():
+            candidates.insert(0, self.model.filePath(self.proxy_model.mapToSource(current)))
+        self.prefetcher.prefetch(candidates)
+
+    def on_file_hovered(self, index):
+        source_index = self.proxy_model.mapToSource(index)
+        if self.model.isDir(source_index):
+            self.prefetcher.prefetch([self.model.filePath(source_index)])
+
+    def show_listing_snapshot(self, snapshot):
+        self.snapshot_model.set_snapshot(snapshot)
+        self.view_stack.setCurrentIndex(2)
+        self.status_bar.showMessage(f"{len(snapshot)} item(s) (cached)")
+
+    def show_live_view(self):
+        if self.view_stack.currentIndex() != self.live_view_index:
+            self.view_stack.setCurrentIndex(self.live_view_index)
+
+    def on_listing_revalidated(self, path, result):
+        snapshot, changed = result
+        if os.path.normcase(path) != os.path.normcase(self.get_current_dir()):
+            return
+        if snapshot is None:
+            self.show_live_view()
+        elif changed and self.view_stack.currentIndex() == 2:
+            self.show_listing_snapshot(snapshot)
+
+    def on_directory_loaded(self, path):
+        started = self.model_load_started.pop(os.path.normcase(os.path.normpath(path)), None)
+        if started is not None:
+            self.tracer.record("gui.model_load", started, time.perf_counter_ns(), {'path': path})
+        # A fresh listing of an indexed folder keeps the index (and smart folders) current
+        self.update_index_for(path)
+        if os.path.normcase(os.path.normpath(path)) == os.path.normcase(os.path.normpath(self.get_current_dir())):
+            self.show_live_view()
+            self.status_bar.showMessage("Ready")
+
+    def open_snapshot_entry(self, index):
+        path = self.snapshot_model.path_at(index.row())
+        if self.stat_cache.isdir(path):
+            self.navigate_to_directory(path)
+        elif self.stat_cache.isfile(path):
+            try:
+                os.startfile(path)
+            except Exception as e:
+                QMessageBox.warning(self, "Open File Error", f"Could not open the file:\n{e}")
+
     def on_back(self):
         path = self.navigation_history.go_back()
         if path: self.navigate_to_directory(path, record_history=False)
@@ -908,6 +1432,18 @@ class MainWindow(QMainWindow):
         search_dialog = SearchDialog(self, self.file_searcher, self.get_current_dir())
         search_dialog.exec_()
 
+    def on_find_duplicates(self):
+        dialog = DuplicatesDialog(self, self.get_current_dir())
+        dialog.exec_()
+
+    def on_disk_usage(self):
+        dialog = DiskUsageDialog(self, self.get_current_dir())
+        dialog.exec_()
+
+    def on_sync_folders(self):
+        dialog = SyncDialog(self, self.get_current_dir())
+        dialog.exec_()
+
     def on_copy(self):
         self.clipboard_paths = self.get_selected_paths()
         if not self.clipboard_paths: return
@@ -938,26 +1474,19 @@ class MainWindow(QMainWindow):
             return
 
         errors = []
+        steps = []
+        op = 'copy' if self.clipboard_mode == 'copy' else 'move'
         for src in self.clipboard_paths:
-            try:
-                base = os.path.basename(src.rstrip("/\\"))
-                dest = os.path.join(dest_dir, base)
-                if src == dest or dest.startswith(src + os.path.sep):
-                    errors.append(f"Cannot {self.clipboard_mode} '{base}' into a subfolder of itself.")
-                    continue
-                if self.clipboard_mode == 'copy':
-                    self.ps_copy(src, dest)
-                else:
-                    self.ps_move(src, dest)
-            except Exception as e:
-                errors.append(f"Failed to {self.clipboard_mode} '{src}': {e}")
-
-        if errors:
-            QMessageBox.warning(self, "Paste Error", "Some items failed to paste:\n" + "\n".join(errors))
+            base = os.path.basename(src.rstrip("/\\"))
+            dest = os.path.join(dest_dir, base)
+            if src == dest or dest.startswith(src + os.path.sep):
+                errors.append(f"Cannot {self.clipboard_mode} '{base}' into a subfolder of itself.")
+                continue
+            steps.append((op, src, dest))
         if self.clipboard_mode == 'cut':
             self.clipboard_paths = []
             self.clipboard_mode = None
-        self.refresh_current_dir()
+        self.run_journaled_batch(steps, "Paste Error", "Some items failed to paste:", errors)
 
     def on_move(self):
         paths = self.get_selected_paths()
@@ -967,14 +1496,54 @@ class MainWindow(QMainWindow):
         dest_dir = QFileDialog.getExistingDirectory(self, "Select Destination Folder", self.get_current_dir())
         if not dest_dir: return
 
-        errors = []
-        for src in paths:
-            try:
-                self.ps_move(src, os.path.join(dest_dir, os.path.basename(src.rstrip("/\\"))))
-            except Exception as e:
-                errors.append(f"Failed to move '{src}': {e}")
+        steps = [('move', src, os.path.join(dest_dir, os.path.basename(src.rstrip("/\\")))) for src in paths]
+        self.run_journaled_batch(steps, "Move Error", "Some items failed to move:")
+
+    def run_journaled_batch(self, steps, title, intro, errors=()):
+        """Run copy/move steps under a write-ahead journal on a worker, then report errors and refresh"""
+        from core.file_ops import run_batch
+        errors = list(errors)
+
+        def finished(batch_errors):
+            errors.extend(batch_errors)
+            if errors:
+                QMessageBox.warning(self, title, intro + "\n" + "\n".join(errors[:20]))
+            else:
+                self.status_bar.showMessage(f"Done: {len(steps)} item(s)", 3000)
+            self.refresh_current_dir()
+
+        if not steps:
+            finished([])
+            return
+        self.status_bar.showMessage(f"Working on {len(steps)} item(s)...")
+        self.task_runner.submit(run_batch, steps,
+                                on_done=lambda result: finished(result.errors),
+                                on_error=lambda error: finished([f"Could not start operation: {error}"]))
+
+    def check_interrupted_batches(self):
+        from core import file_ops
+        for journal_path in file_ops.pending_journals():
+            box = QMessageBox(self)
+            box.setWindowTitle("Interrupted Operation")
+            box.setText("A copy/move operation was interrupted before it finished.")
+            resume_btn = box.addButton("Resume", QMessageBox.AcceptRole)
+            rollback_btn = box.addButton("Roll Back", QMessageBox.DestructiveRole)
+            box.addButton("Later", QMessageBox.RejectRole)
+            box.exec_()
+            if box.clickedButton() == resume_btn:
+                finish = file_ops.resume_batch
+            elif box.clickedButton() == rollback_btn:
+                finish = file_ops.rollback_batch
+            else:
+                continue
+            self.task_runner.submit(finish, journal_path,
+                                    on_done=self.on_interrupted_batch_done,
+                                    on_error=lambda error: self.on_interrupted_batch_done(None, error))
+
+    def on_interrupted_batch_done(self, result, error=None):
+        errors = [str(error)] if error is not None else result.errors
         if errors:
-            QMessageBox.warning(self, "Move Error", "Some items failed to move:\n" + "\n".join(errors))
+            QMessageBox.warning(self, "Interrupted Operation", "\n".join(errors[:20]))
         self.refresh_current_dir()
 
     def on_compress(self):
@@ -1002,8 +1571,13 @@ class MainWindow(QMainWindow):
 
     def on_rename(self):
         paths = self.get_selected_paths()
-        if len(paths) != 1:
-            QMessageBox.information(self, "Rename", "Select exactly one item to rename.")
+        if not paths:
+            QMessageBox.information(self, "Rename", "Select at least one item to rename.")
+            return
+        if len(paths) > 1:
+            dialog = BatchRenameDialog(self, sorted(paths, key=lambda p: os.path.basename(p).lower()))
+            if dialog.exec_() == QDialog.Accepted:
+                self.refresh_current_dir()
             return
         src = paths[0]
         new_name, ok = QInputDialog.getText(self, "Rename", "Enter new name:", text=os.path.basename(src))
@@ -1015,6 +1589,55 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Rename Error", f"Failed to rename: {e}")
         self.refresh_current_dir()
 
+    def on_delete(self):
+        paths = self.get_selected_paths()
+        if not paths:
+            QMessageBox.information(self, "Delete", "No items selected.")
+            return
+        errors = []
+        for path in paths:
+            try:
+                self.trash_store.trash(path)
+            except OSError as e:
+                errors.append(f"Failed to delete '{path}': {e}")
+        if errors:
+            QMessageBox.warning(self, "Delete Error", "\n".join(errors))
+        else:
+            self.status_bar.showMessage(f"Moved {len(paths)} item(s) to trash", 3000)
+        self.refresh_current_dir()
+
+    def on_delete_permanently(self):
+        paths = self.get_selected_paths()
+        if not paths:
+            return
+        if QMessageBox.question(self, "Delete Permanently",
+                                f"Permanently delete {len(paths)} item(s)? This cannot be undone.") != QMessageBox.Yes:
+            return
+        from core.file_ops import delete_tree
+        self.status_bar.showMessage(f"Deleting {len(paths)} item(s)...")
+        for path in paths:
+            # The root is renamed aside first, so the listing updates before the unlinking finishes
+            self.task_runner.submit(delete_tree, path,
+                                    on_done=lambda result, p=path: self.on_delete_finished(p, result),
+                                    on_error=lambda error, p=path: self.on_delete_failed(p, error))
+        QTimer.singleShot(100, self.refresh_current_dir)
+
+    def on_delete_finished(self, path, result):
+        if result.errors:
+            QMessageBox.warning(self, "Delete Error",
+                                f"Some items under '{path}' could not be deleted:\n" + "\n".join(result.errors[:20]))
+        self.status_bar.showMessage(f"Deleted {result.files_deleted} file(s), {result.dirs_deleted} folder(s)", 3000)
+        self.refresh_current_dir()
+
+    def on_delete_failed(self, path, error):
+        QMessageBox.warning(self, "Delete Error", f"Failed to delete '{path}': {error}")
+        self.refresh_current_dir()
+
+    def on_show_trash(self):
+        dialog = TrashDialog(self, self.trash_store)
+        dialog.exec_()
+        self.refresh_current_dir()
+
     def on_add_to_favorites(self):
         paths = self.get_selected_paths()
         if not paths:
@@ -1029,14 +1652,14 @@ class MainWindow(QMainWindow):
 
     def on_favorite_clicked(self, index):
         path = self.nav_model.itemFromIndex(index).data(Qt.UserRole)
-        if path and os.path.exists(path):
-            parent_dir = os.path.dirname(path) if os.path.isfile(path) else path
+        if path and self.stat_cache.exists(path):
+            parent_dir = os.path.dirname(path) if self.stat_cache.isfile(path) else path
             self.navigate_to_directory(parent_dir)
 
     def on_favorite_double_clicked(self, index):
         path = self.nav_model.itemFromIndex(index).data(Qt.UserRole)
-        if path and os.path.exists(path):
-            if os.path.isfile(path):
+        if path and self.stat_cache.exists(path):
+            if self.stat_cache.isfile(path):
                 # --- FIXED: Directly open the file path ---
                 try:
                     os.startfile(path)
@@ -1049,6 +1672,38 @@ class MainWindow(QMainWindow):
         if self.favorites_manager.remove_favorite(path):
             self.build_navigation_tree()
 
+    def save_smart_folder(self, search):
+        if self.smart_folders.save(search):
+            self.build_navigation_tree()
+            self.status_bar.showMessage(f"Saved smart folder '{search.name}'", 2000)
+            return True
+        return False
+
+    def open_smart_folder(self, name):
+        folder = self.smart_folders.get(name)
+        if folder is None: return
+        root = folder.search.root
+        if not self.smart_folders.is_indexed(name):
+            reply = QMessageBox.question(self, "Smart Folder",
+                                         f"{root} is not in the file index yet. Index it now?\n"
+                                         "Results appear as the index is built.", QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes: return
+            self.status_bar.showMessage(f"Indexing {root}...")
+            self.task_runner.submit(self.file_index.build, root,
+                                    on_done=lambda count: self.status_bar.showMessage(f"Indexed {count} entries under {root}", 3000),
+                                    on_error=lambda e: self.status_bar.showMessage(f"Indexing failed: {e}", 5000))
+        else:
+            # Pick up changes made while the app was closed; the folder updates as they are found
+            self.task_runner.submit(self.file_index.refresh, root)
+        dialog = SmartFolderDialog(self, self.smart_folders, name)
+        dialog.exec_()
+
+    def update_index_for(self, path):
+        """Re-list a folder in the file index in the background, if it lies under an indexed root"""
+        path = os.path.abspath(path)
+        if any(path == r or path.startswith(os.path.join(r, '')) for r in self.file_index.roots()):
+            self.task_runner.submit(self.file_index.update_directory, path)
+
 
 
     def ps_copy(self, src, dest):
@@ -1089,12 +1744,18 @@ class MainWindow(QMainWindow):
         
         open_action = menu.addAction("Open")
         menu.addSeparator()
+        delete_action = menu.addAction("Delete")
+        delete_permanently_action = menu.addAction("Delete Permanently")
         properties_action = menu.addAction("Properties")
 
         action = menu.exec_(view.mapToGlobal(position))
         
         if action == open_action:
             self.open_file(index)
+        elif action == delete_action:
+            self.on_delete()
+        elif action == delete_permanently_action:
+            self.on_delete_permanently()
         elif action == properties_action:
             self.show_file_properties(file_path)
 
@@ -1109,7 +1770,8 @@ class SearchDialog(QDialog):
         super().__init__(parent)
         self.file_searcher = file_searcher or FileSearcher()
         self.search_directory = search_directory
-        self.search_results = []
+        self.search_results = ResultColumns()
+        self.sort_generation = 0
 
         self.setWindowTitle("🔍 Search Files")
         self.setGeometry(200, 200, 600, 500)
@@ -1125,7 +1787,7 @@ class SearchDialog(QDialog):
         type_layout = QHBoxLayout()
         type_layout.addWidget(QLabel("Search Type:"))
         self.search_type = QComboBox()
-        self.search_type.addItems(["Windows Style", "File Name", "Content", "Size", "Date"])
+        self.search_type.addItems(["Windows Style", "File Name", "Content", "Size", "Date", "Query"])
         self.search_type.currentTextChanged.connect(self.on_search_type_changed)
         type_layout.addWidget(self.search_type)
         options_layout.addLayout(type_layout)
@@ -1165,6 +1827,10 @@ class SearchDialog(QDialog):
         self.recursive_check.setChecked(True)
         options_layout.addWidget(self.recursive_check)
 
+        self.excludes_check = QCheckBox("Skip ignored folders (.git, node_modules, .gitignore rules)")
+        self.excludes_check.setChecked(True)
+        options_layout.addWidget(self.excludes_check)
+
         self.advanced_group = QGroupBox("Advanced Options")
         self.advanced_layout = QVBoxLayout()
 
@@ -1205,19 +1871,44 @@ class SearchDialog(QDialog):
         layout.addWidget(options_group)
 
         self.search_btn = QPushButton("🔍 Search")
-        self.search_btn.clicked.connect(self.perform_search)
+        self.search_btn.clicked.connect(lambda: self.perform_search())
         layout.addWidget(self.search_btn)
 
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
 
-        results_group = QGroupBox("Search Results")
+        self.results_group = QGroupBox("Search Results")
         results_layout = QVBoxLayout()
 
-        self.results_text = QTextEdit()
-        self.results_text.setReadOnly(True)
-        results_layout.addWidget(self.results_text)
+        # Fixed row heights and no resize-to-contents keep the table virtual: only visible rows are formatted
+        self.results_model = SearchResultsModel()
+        self.results_view = QTableView()
+        self.results_view.setModel(self.results_model)
+        self.results_view.setSelectionBehavior(QTableView.SelectRows)
+        self.results_view.setAlternatingRowColors(True)
+        self.results_view.setWordWrap(False)
+        self.results_view.verticalHeader().setVisible(False)
+        self.results_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.results_view.verticalHeader().setDefaultSectionSize(22)
+        header = self.results_view.horizontalHeader()
+        header.setStretchLastSection(True)
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.sort_results)
+        self.results_view.setColumnWidth(0, 200)
+        self.results_view.setColumnWidth(1, 260)
+        self.results_view.setColumnWidth(2, 90)
+        self.results_view.setColumnWidth(3, 130)
+        self.results_view.doubleClicked.connect(lambda index: self.open_selected())
+        self.results_view.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        results_layout.addWidget(self.results_view)
+
+        self.plan_label = QLabel("")
+        self.plan_label.setWordWrap(True)
+        self.plan_label.setVisible(False)
+        results_layout.addWidget(self.plan_label)
 
         actions_layout = QHBoxLayout()
         self.open_btn = QPushButton("Open Selected")
@@ -1234,9 +1925,15 @@ class SearchDialog(QDialog):
         self.clear_btn.clicked.connect(self.clear_results)
         actions_layout.addWidget(self.clear_btn)
 
+        self.save_smart_btn = QPushButton("⭐ Save as Smart Folder")
+        self.save_smart_btn.setToolTip("Keep this search in the navigation pane, answered from the file index")
+        self.save_smart_btn.clicked.connect(self.save_as_smart_folder)
+        self.save_smart_btn.setVisible(hasattr(self.parent(), 'save_smart_folder'))
+        actions_layout.addWidget(self.save_smart_btn)
+
         results_layout.addLayout(actions_layout)
-        results_group.setLayout(results_layout)
-        layout.addWidget(results_group)
+        self.results_group.setLayout(results_layout)
+        layout.addWidget(self.results_group)
 
         self.setLayout(layout)
 
@@ -1255,6 +1952,15 @@ class SearchDialog(QDialog):
                 background-color: #3a3a3a; color: #ccc;
                 border: 1px solid #555555; border-radius: 3px; padding: 5px;
             }
+            QTableView {
+                background-color: #3a3a3a; alternate-background-color: #333333; color: #ccc;
+                border: 1px solid #555555; gridline-color: #444444;
+                selection-background-color: #555555; selection-color: #ffd700;
+            }
+            QHeaderView::section {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; padding: 4px;
+            }
             QPushButton {
                 background-color: #333333; color: #ffd700;
                 border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
@@ -1273,6 +1979,8 @@ class SearchDialog(QDialog):
     def on_search_type_changed(self, search_type):
         is_windows_style = search_type == "Windows Style"
         self.file_type_input.setVisible(is_windows_style)
+        # Saved searches hold fixed criteria fields, not free-form queries
+        self.save_smart_btn.setEnabled(search_type != "Query")
         self.advanced_group.setVisible(search_type in ["Content", "Size", "Date"])
 
         if search_type == "Windows Style":
@@ -1282,6 +1990,10 @@ class SearchDialog(QDialog):
             self.search_text.setPlaceholderText("Enter file pattern (e.g., *.txt)")
         elif search_type == "Content":
             self.search_text.setPlaceholderText("Enter text to search for...")
+        elif search_type == "Query":
+            self.search_text.setPlaceholderText('e.g. ext:log size:>100MB modified:<7d "timeout"')
+            self.search_text.setToolTip("name:TEXT or a bare word, ext:A,B, size:>N / <N / N..M (k, MB, GB), "
+                                        "modified:<7d / >30d / YYYY-MM-DD / DATE..DATE, \"quoted text\" inside files")
         else:
             self.search_text.setPlaceholderText("Enter search term...")
 
@@ -1322,9 +2034,10 @@ class SearchDialog(QDialog):
                 self.dir_combo.addItem(directory)
             self.dir_combo.setCurrentText(directory)
 
+    @traced("gui.search")
     def perform_search(self):
         search_directory = self.dir_combo.currentText()
-        if not search_directory or not os.path.exists(search_directory):
+        if not search_directory or not get_stat_cache().isdir(search_directory):
             QMessageBox.warning(self, "Search Error", "Please select a valid directory.")
             return
 
@@ -1334,68 +2047,1079 @@ class SearchDialog(QDialog):
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         self.search_btn.setEnabled(False)
-        self.results_text.clear()
+        self.clear_results()
+        self.plan_label.setVisible(False)
         QApplication.processEvents() # Update UI
 
+        pending = False
         try:
             results = []
-            if search_type == "File Name":
+            if search_type == "Query":
+                from core.query import QueryError, parse_query, run_query
+                try:
+                    query = parse_query(search_text)
+                except QueryError as e:
+                    QMessageBox.warning(self, "Search Error", str(e))
+                    return
+                # Only an index covering the directory is used; run_query falls back to crawling
+                index = getattr(self.parent(), 'file_index', None)
+                recursive, use_excludes = self.recursive_check.isChecked(), self.excludes_check.isChecked()
+
+                def task():
+                    result = run_query(query, search_directory, index, recursive, use_excludes=use_excludes)
+                    # Built on the worker too: a million hits take a while to copy into columns
+                    return result, ResultColumns.from_hits(result.hits)
+                runner = self.task_runner()
+                if runner is None:
+                    self.show_query_result(task())
+                else:
+                    runner.submit(task, on_done=self.show_query_result, on_error=self.show_query_error)
+                    pending = True
+            elif search_type == "File Name":
                 if not search_text:
                     QMessageBox.warning(self, "Search Error", "Please enter a search term.")
                     return
-                results = self.file_searcher.search_files(search_directory, search_text, self.recursive_check.isChecked())
-                self.display_results(results)
+                results = self.file_searcher.search_files(search_directory, search_text, self.recursive_check.isChecked(),
+                                                          self.excludes_check.isChecked())
+                self.display_results(ResultColumns.from_paths(results))
             # Add other search types here...
         except Exception as e:
             QMessageBox.critical(self, "Search Error", f"An error occurred: {str(e)}")
         finally:
-            self.progress_bar.setVisible(False)
-            self.search_btn.setEnabled(True)
-
-    def display_results(self, results):
-        self.search_results = results
-        if not results:
-            self.results_text.setText("No results found.")
-            self.open_btn.setEnabled(False)
-            self.navigate_btn.setEnabled(False)
+            if not pending:
+                self.progress_bar.setVisible(False)
+                self.search_btn.setEnabled(True)
+
+    def task_runner(self):
+        return getattr(self.parent(), 'task_runner', None)
+
+    def show_query_result(self, outcome):
+        result, columns = outcome
+        self.progress_bar.setVisible(False)
+        self.search_btn.setEnabled(True)
+        self.display_results(columns)
+        stats = result.stats
+        self.plan_label.setText("Plan: " + " → ".join(result.plan) +
+                                f"\n{stats['candidates']} candidate(s), {stats['content_reads']} file(s) read, "
+                                f"{stats['matches']} match(es), {stats['skipped']} ignored folder(s) or file(s) skipped")
+        self.plan_label.setVisible(True)
+
+    def show_query_error(self, error):
+        self.progress_bar.setVisible(False)
+        self.search_btn.setEnabled(True)
+        QMessageBox.critical(self, "Search Error", f"An error occurred: {error}")
+
+    def display_results(self, columns):
+        """Show a ResultColumns in the results table"""
+        self.search_results = columns
+        self.results_model.set_results(columns)
+        # A new result set starts in the order the search produced it
+        header = self.results_view.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.blockSignals(False)
+        count = len(columns)
+        self.results_group.setTitle(f"Search Results ({count:,})" if count else "Search Results (no results found)")
+        self.on_selection_changed()
+
+    def sort_results(self, column, order):
+        """Sort on a worker; the table keeps showing the current order until the permutation arrives"""
+        columns = self.results_model.columns
+        if column < 0 or len(columns) < 2:
+            return
+        key, descending = RESULT_COLUMNS[column], order == Qt.DescendingOrder
+        self.sort_generation += 1
+        generation = self.sort_generation
+
+        def task():
+            permutation = columns.sort_order(key, descending)
+            return generation, columns, permutation, inverse_order(permutation, len(columns))
+        runner = self.task_runner()
+        if runner is None:
+            self.apply_sort(task())
+        else:
+            self.results_group.setTitle(f"Search Results ({len(columns):,}, sorting…)")
+            runner.submit(task, on_done=self.apply_sort, on_error=self.show_query_error)
+
+    def apply_sort(self, outcome):
+        generation, columns, permutation, inverse = outcome
+        # Drop sorts overtaken by a later header click or by a new search
+        if generation != self.sort_generation:
             return
+        if self.results_model.apply_order(columns, permutation, inverse):
+            self.results_group.setTitle(f"Search Results ({len(columns):,})")
+            selected = self.results_view.selectionModel().selectedRows()
+            if selected:
+                self.results_view.scrollTo(selected[0])
 
-        result_text = f"Found {len(results)} result(s):\n\n" + "\n".join([f"{i}. {res}" for i, res in enumerate(results, 1)])
-        self.results_text.setText(result_text)
-        self.open_btn.setEnabled(True)
-        self.navigate_btn.setEnabled(True)
+    def selected_paths(self):
+        rows = sorted(index.row() for index in self.results_view.selectionModel().selectedRows())
+        return [self.results_model.path_at(row) for row in rows]
+
+    def on_selection_changed(self, *args):
+        selected = self.results_view.selectionModel().hasSelection()
+        self.open_btn.setEnabled(selected)
+        self.navigate_btn.setEnabled(selected)
 
     def open_selected(self):
-        if not self.search_results: return
-        # A real implementation would parse the selected line. This just opens the first result.
-        try:
-            os.startfile(self.search_results[0])
-        except Exception as e:
-            QMessageBox.warning(self, "Open Error", f"Could not open file: {e}")
+        for path in self.selected_paths():
+            try:
+                os.startfile(path)
+            except Exception as e:
+                QMessageBox.warning(self, "Open Error", f"Could not open file: {e}")
+                return
 
     def navigate_to_selected(self):
-        if not self.search_results: return
-        # A real implementation would parse the selected line. This navigates to the first result.
-        file_path = self.search_results[0]
-        if os.path.exists(file_path) and hasattr(self.parent(), 'navigate_to_directory'):
+        paths = self.selected_paths()
+        if not paths:
+            return
+        file_path = paths[0]
+        if get_stat_cache().exists(file_path) and hasattr(self.parent(), 'navigate_to_directory'):
             self.parent().navigate_to_directory(os.path.dirname(file_path))
             self.accept()
 
     def clear_results(self):
-        self.results_text.clear()
-        self.search_results = []
-        self.open_btn.setEnabled(False)
-        self.navigate_btn.setEnabled(False)
+        self.search_results = ResultColumns()
+        self.results_model.set_results(self.search_results)
+        self.results_group.setTitle("Search Results")
+        self.on_selection_changed()
+
+    def build_saved_search(self, name):
+        """The criteria currently entered, as a SavedSearch; raises ValueError for malformed sizes or dates"""
+        from core.smart_folders import SavedSearch
+        search_type = self.search_type.currentText()
+        text = self.search_text.text().strip()
+        search = SavedSearch(name, self.dir_combo.currentText())
+        if text:
+            if search_type == "Content":
+                search = search._replace(content=text)
+            elif any(c in text for c in "*?["):
+                search = search._replace(name_glob=text)
+            else:
+                search = search._replace(name_contains=text)
+        advanced = search_type in ["Content", "Size", "Date"]
+        exts_text = self.extensions_input.text() if advanced else self.file_type_input.text()
+        exts = tuple(e.strip().lstrip('.') for e in exts_text.split(',') if e.strip())
+        search = search._replace(exts=exts)
+        if advanced:
+            if self.min_size.text().strip():
+                search = search._replace(min_size=int(float(self.min_size.text()) * 1024 * 1024))
+            if self.max_size.text().strip():
+                search = search._replace(max_size=int(float(self.max_size.text()) * 1024 * 1024))
+            for field, edit in (('modified_after', self.start_date), ('modified_before', self.end_date)):
+                value = edit.text().strip()
+                if value:
+                    datetime.strptime(value, "%Y-%m-%d")
+                    search = search._replace(**{field: value})
+        return search
+
+    def save_as_smart_folder(self):
+        directory = self.dir_combo.currentText()
+        if not directory or not get_stat_cache().isdir(directory):
+            QMessageBox.warning(self, "Save as Smart Folder", "Please select a valid directory.")
+            return
+        name, ok = QInputDialog.getText(self, "Save as Smart Folder", "Name:",
+                                        text=self.search_text.text().strip() or "Smart Folder")
+        if not ok or not name.strip():
+            return
+        try:
+            search = self.build_saved_search(name.strip())
+        except ValueError as e:
+            QMessageBox.warning(self, "Save as Smart Folder", f"Invalid size or date: {e}")
+            return
+        if not self.parent().save_smart_folder(search):
+            QMessageBox.warning(self, "Save as Smart Folder", "Could not save the smart folder.")
+
+
+
+
+class DuplicatesDialog(QDialog):
+    """Finds duplicate files below a folder and lists them grouped by content"""
+
+    def __init__(self, parent, root_dir):
+        super().__init__(parent)
+        from core.duplicates import DuplicateFinder
+        self.root_dir = root_dir
+        self.finder = DuplicateFinder()
+        self.setWindowTitle("⧉ Find Duplicates")
+        self.setGeometry(200, 200, 750, 550)
+
+        layout = QVBoxLayout()
+        dir_layout = QHBoxLayout()
+        dir_layout.addWidget(QLabel("Folder:"))
+        self.dir_edit = QLineEdit(root_dir)
+        dir_layout.addWidget(self.dir_edit)
+        browse_btn = QPushButton("Browse")
+        browse_btn.clicked.connect(self.browse_directory)
+        dir_layout.addWidget(browse_btn)
+        self.scan_btn = QPushButton("Scan")
+        self.scan_btn.clicked.connect(self.start_scan)
+        dir_layout.addWidget(self.scan_btn)
+        layout.addLayout(dir_layout)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderLabels(["File", "Size"])
+        self.results_tree.setColumnWidth(0, 550)
+        self.results_tree.itemDoubleClicked.connect(self.navigate_to_item)
+        layout.addWidget(self.results_tree)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        btn_box = QHBoxLayout()
+        btn_box.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_box.addWidget(close_btn)
+        layout.addLayout(btn_box)
+
+        self.setLayout(layout)
+        self.apply_dark_theme()
+
+    def browse_directory(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder", self.dir_edit.text())
+        if directory:
+            self.dir_edit.setText(directory)
+
+    def start_scan(self):
+        root = self.dir_edit.text()
+        if not os.path.isdir(root):
+            QMessageBox.warning(self, "Find Duplicates", "Please select a valid folder.")
+            return
+        self.results_tree.clear()
+        self.summary_label.setText("Scanning...")
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.scan_btn.setEnabled(False)
+        self.parent().task_runner.submit(self.finder.find, root, on_done=self.show_report, on_error=self.show_error)
+
+    def show_report(self, report):
+        self.progress_bar.setVisible(False)
+        self.scan_btn.setEnabled(True)
+        for group in report.groups:
+            group_item = QTreeWidgetItem([f"{len(group.paths)} copies ({format_size(group.wasted_bytes)} reclaimable)",
+                                          format_size(group.size)])
+            for path in group.paths:
+                child = QTreeWidgetItem([path, ""])
+                child.setData(0, Qt.UserRole, path)
+                group_item.addChild(child)
+            self.results_tree.addTopLevelItem(group_item)
+        self.summary_label.setText(
+            f"{len(report.groups)} group(s), {format_size(report.wasted_bytes)} reclaimable. "
+            f"Scanned {report.files_scanned} files, read {report.read_fraction:.1%} of {format_size(report.total_bytes)}."
+        )
+
+    def show_error(self, error):
+        self.progress_bar.setVisible(False)
+        self.scan_btn.setEnabled(True)
+        self.summary_label.setText("")
+        QMessageBox.critical(self, "Find Duplicates", f"Scan failed: {error}")
+
+    def navigate_to_item(self, item, column):
+        path = item.data(0, Qt.UserRole)
+        if path and os.path.exists(path) and hasattr(self.parent(), 'navigate_to_directory'):
+            self.parent().navigate_to_directory(os.path.dirname(path))
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QLabel { color: #ccc; }
+            QLineEdit, QTreeWidget {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px; padding: 5px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+            QPushButton:disabled {
+                background-color: #222222; color: #666666; border: 1px solid #444444;
+            }
+            QProgressBar {
+                border: 1px solid #555555; border-radius: 3px;
+                text-align: center; background-color: #3a3a3a;
+            }
+            QProgressBar::chunk { background-color: #ffd700; border-radius: 2px; }
+        """)
+
+
+class SmartFolderDialog(QDialog):
+    """Results of a saved search, answered from the file index and updated as the index changes"""
+
+    MAX_ROWS = 5000
 
+    def __init__(self, parent, manager, name):
+        super().__init__(parent)
+        self.manager = manager
+        self.name = name
+        self.setWindowTitle(f"⭐ {name}")
+        self.setGeometry(200, 200, 850, 550)
+
+        layout = QVBoxLayout()
+        folder = manager.get(name)
+        self.query_label = QLabel(folder.search.describe() if folder else "")
+        self.query_label.setWordWrap(True)
+        layout.addWidget(self.query_label)
+
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderLabels(["Name", "Folder", "Size", "Modified"])
+        self.results_tree.setColumnWidth(0, 250)
+        self.results_tree.setColumnWidth(1, 350)
+        self.results_tree.setRootIsDecorated(False)
+        self.results_tree.itemDoubleClicked.connect(self.navigate_to_item)
+        layout.addWidget(self.results_tree)
+
+        self.summary_label = QLabel("Loading...")
+        layout.addWidget(self.summary_label)
+
+        btn_box = QHBoxLayout()
+        btn_box.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_box.addWidget(close_btn)
+        layout.addLayout(btn_box)
+        self.setLayout(layout)
+        self.apply_dark_theme()
+
+        # Index updates can arrive in bursts; reload at most a few times a second
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.reload)
+        parent.smart_folder_changed.connect(self.on_folder_changed)
+        self.reload()
+
+    def on_folder_changed(self, name):
+        if name == self.name:
+            self.reload_timer.start()
+
+    def reload(self):
+        # The first evaluation (and content checks) can take a while, so it runs off the GUI thread
+        self.parent().task_runner.submit(self.manager.results, self.name, on_done=self.show_results,
+                                         on_error=lambda e: self.summary_label.setText(f"Could not read the index: {e}"))
+
+    def show_results(self, results):
+        results = sorted(results, key=lambda f: f.mtime_ns, reverse=True)
+        self.results_tree.clear()
+        items = []
+        for entry in results[:self.MAX_ROWS]:
+            modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.mtime_ns / 1e9))
+            item = QTreeWidgetItem([entry.name, os.path.dirname(entry.path), format_size(entry.size), modified])
+            item.setData(0, Qt.UserRole, entry.path)
+            items.append(item)
+        self.results_tree.addTopLevelItems(items)
+        shown = f" (showing the {self.MAX_ROWS} most recent)" if len(results) > self.MAX_ROWS else ""
+        self.summary_label.setText(f"{len(results)} file(s){shown}")
+
+    def navigate_to_item(self, item, column):
+        path = item.data(0, Qt.UserRole)
+        if path and os.path.exists(path) and hasattr(self.parent(), 'navigate_to_directory'):
+            self.parent().navigate_to_directory(os.path.dirname(path))
+            self.accept()
+
+    def done(self, result):
+        self.reload_timer.stop()
+        self.parent().smart_folder_changed.disconnect(self.on_folder_changed)
+        super().done(result)
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QLabel { color: #ccc; }
+            QTreeWidget {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px; padding: 5px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+        """)
+
+
+class SyncDialog(QDialog):
+    """Mirrors a source folder into a destination, copying only what changed"""
+
+    def __init__(self, parent, source_dir):
+        super().__init__(parent)
+        self.setWindowTitle("⇄ Sync Folders")
+        self.setGeometry(200, 200, 700, 500)
+
+        layout = QVBoxLayout()
+        self.source_edit = self._add_folder_row(layout, "Source:", source_dir)
+        self.dest_edit = self._add_folder_row(layout, "Destination:", "")
+
+        options = QHBoxLayout()
+        self.hash_check = QCheckBox("Compare contents when timestamps differ")
+        options.addWidget(self.hash_check)
+        self.delete_check = QCheckBox("Delete extra files in destination")
+        options.addWidget(self.delete_check)
+        layout.addLayout(options)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
 
+        self.actions_list = QTreeWidget()
+        self.actions_list.setHeaderLabels(["Action", "File", "Size"])
+        self.actions_list.setColumnWidth(1, 450)
+        layout.addWidget(self.actions_list)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        btn_box = QHBoxLayout()
+        btn_box.addStretch()
+        self.preview_btn = QPushButton("Preview")
+        self.preview_btn.clicked.connect(lambda: self.start_sync(dry_run=True))
+        btn_box.addWidget(self.preview_btn)
+        self.sync_btn = QPushButton("Sync")
+        self.sync_btn.clicked.connect(lambda: self.start_sync(dry_run=False))
+        btn_box.addWidget(self.sync_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_box.addWidget(close_btn)
+        layout.addLayout(btn_box)
+
+        self.setLayout(layout)
+        self.apply_dark_theme()
+
+    def _add_folder_row(self, layout, label, value):
+        row = QHBoxLayout()
+        row.addWidget(QLabel(label))
+        edit = QLineEdit(value)
+        row.addWidget(edit)
+        browse_btn = QPushButton("Browse")
+        browse_btn.clicked.connect(lambda: self.browse_directory(edit))
+        row.addWidget(browse_btn)
+        layout.addLayout(row)
+        return edit
+
+    def browse_directory(self, edit):
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder", edit.text())
+        if directory:
+            edit.setText(directory)
+
+    def start_sync(self, dry_run):
+        source, dest = self.source_edit.text(), self.dest_edit.text()
+        if not os.path.isdir(source) or not dest:
+            QMessageBox.warning(self, "Sync Folders", "Please select a source folder and a destination.")
+            return
+        if os.path.abspath(dest).startswith(os.path.join(os.path.abspath(source), '')):
+            QMessageBox.warning(self, "Sync Folders", "The destination cannot be inside the source.")
+            return
+        if not dry_run and self.delete_check.isChecked():
+            reply = QMessageBox.question(self, "Sync Folders",
+                                         f"Files in '{dest}' that are not in the source will be deleted. Continue?",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        from core.sync import FolderSync
+        sync = FolderSync(source, dest, use_hash=self.hash_check.isChecked(),
+                          delete_extras=self.delete_check.isChecked())
+        self.actions_list.clear()
+        self.summary_label.setText("Comparing..." if dry_run else "Syncing...")
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.preview_btn.setEnabled(False)
+        self.sync_btn.setEnabled(False)
+        self.parent().task_runner.submit(sync.run, dry_run,
+                                         on_done=lambda report: self.show_report(report, dry_run),
+                                         on_error=self.show_error)
+
+    def show_report(self, report, dry_run):
+        self.progress_bar.setVisible(False)
+        self.preview_btn.setEnabled(True)
+        self.sync_btn.setEnabled(True)
+        for action in report.actions:
+            if action.kind != 'skip':
+                self.actions_list.addTopLevelItem(QTreeWidgetItem(
+                    [action.kind, action.rel_path, format_size(action.size) if action.size else ""]))
+        verb = "Would transfer" if dry_run else "Transferred"
+        self.summary_label.setText(
+            f"{verb} {format_size(report.bytes_transferred)} ({report.copied} new, {report.updated} changed), "
+            f"skipped {format_size(report.bytes_skipped)} in {report.skipped} unchanged file(s), "
+            f"{report.deleted} deleted" + (f", {report.conflicts} file/folder conflict(s)." if report.conflicts else ".")
+        )
+        if report.errors:
+            QMessageBox.warning(self, "Sync Folders", "\n".join(report.errors[:20]))
+        if not dry_run and hasattr(self.parent(), 'listing_cache'):
+            self.parent().listing_cache.invalidate(self.dest_edit.text())
+
+    def show_error(self, error):
+        self.progress_bar.setVisible(False)
+        self.preview_btn.setEnabled(True)
+        self.sync_btn.setEnabled(True)
+        self.summary_label.setText("")
+        QMessageBox.critical(self, "Sync Folders", f"Sync failed: {error}")
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QLabel, QCheckBox { color: #ccc; }
+            QLineEdit, QTreeWidget {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px; padding: 5px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+            QPushButton:disabled {
+                background-color: #222222; color: #666666; border: 1px solid #444444;
+            }
+            QProgressBar {
+                border: 1px solid #555555; border-radius: 3px;
+                text-align: center; background-color: #3a3a3a;
+            }
+            QProgressBar::chunk { background-color: #ffd700; border-radius: 2px; }
+        """)
+
+
+class TrashDialog(QDialog):
+    """Lists trashed items for restore or permanent deletion"""
+
+    def __init__(self, parent, trash_store):
+        super().__init__(parent)
+        self.trash_store = trash_store
+        self.items = []
+        self.setWindowTitle("♻ Trash")
+        self.setGeometry(200, 200, 750, 450)
+
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Name", "Original Location", "Deleted", "Size"])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(0, 180)
+        self.table.setColumnWidth(1, 300)
+        self.table.setColumnWidth(2, 140)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        btn_box = QHBoxLayout()
+        restore_btn = QPushButton("Restore")
+        restore_btn.clicked.connect(self.restore_selected)
+        btn_box.addWidget(restore_btn)
+        purge_btn = QPushButton("Delete Permanently")
+        purge_btn.clicked.connect(self.purge_selected)
+        btn_box.addWidget(purge_btn)
+        empty_btn = QPushButton("Empty Trash")
+        empty_btn.clicked.connect(self.empty_trash)
+        btn_box.addWidget(empty_btn)
+        btn_box.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_box.addWidget(close_btn)
+        layout.addLayout(btn_box)
+        self.setLayout(layout)
+        self.apply_dark_theme()
+        self.reload()
+
+    def reload(self):
+        self.items = self.trash_store.list_items()
+        self.table.setRowCount(len(self.items))
+        for row, item in enumerate(self.items):
+            deleted = QDateTime.fromSecsSinceEpoch(int(item.deleted_at)).toString("yyyy-MM-dd HH:mm")
+            size = "..." if item.size < 0 else format_size(item.size)
+            for col, text in enumerate([os.path.basename(item.original_path), os.path.dirname(item.original_path), deleted, size]):
+                self.table.setItem(row, col, QTableWidgetItem(text))
+
+    def selected_items(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        return [self.items[row] for row in rows]
+
+    def restore_selected(self):
+        errors = []
+        for item in self.selected_items():
+            try:
+                self.trash_store.restore(item.item_id)
+            except OSError as e:
+                errors.append(f"Could not restore '{item.original_path}': {e}")
+        if errors:
+            QMessageBox.warning(self, "Restore Error", "\n".join(errors))
+        self.reload()
+
+    def purge_selected(self):
+        items = self.selected_items()
+        if not items:
+            return
+        if QMessageBox.question(self, "Delete Permanently", f"Permanently delete {len(items)} item(s)?") != QMessageBox.Yes:
+            return
+        errors = []
+        for item in items:
+            try:
+                if not self.trash_store.purge(item.item_id):
+                    errors.append(f"Could not delete all of '{item.original_path}'")
+            except OSError as e:
+                errors.append(f"Could not delete '{item.original_path}': {e}")
+        if errors:
+            QMessageBox.warning(self, "Delete Error", "\n".join(errors))
+        self.reload()
+
+    def empty_trash(self):
+        if QMessageBox.question(self, "Empty Trash", "Permanently delete everything in the trash?") != QMessageBox.Yes:
+            return
+        total = len(self.trash_store.list_items())
+        left = total - self.trash_store.empty()
+        if left:
+            QMessageBox.warning(self, "Empty Trash", f"{left} item(s) could not be deleted and were kept in the trash.")
+        self.reload()
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QTableWidget {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+        """)
+
+
+class DiagnosticsDialog(QDialog):
+    """Live latency table for traced spans, with Chrome trace export"""
+
+    COLUMNS = ["Span", "Count", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (ms)"]
+
+    def __init__(self, parent, tracer, watchdog=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.watchdog = watchdog
+        self.setWindowTitle("⏱ Diagnostics")
+        self.setGeometry(200, 200, 800, 450)
+
+        layout = QVBoxLayout()
+        self.enabled_check = QCheckBox("Record timings (also enabled by setting BRONTOBASE_TRACE)")
+        self.enabled_check.setChecked(tracer.enabled)
+        self.enabled_check.toggled.connect(lambda on: tracer.enable() if on else tracer.disable())
+        layout.addWidget(self.enabled_check)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(0, 220)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.watchdog_label = QLabel()
+        self.watchdog_label.setWordWrap(True)
+        layout.addWidget(self.watchdog_label)
+
+        btn_box = QHBoxLayout()
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        btn_box.addWidget(reset_btn)
+        export_btn = QPushButton("Export Trace...")
+        export_btn.clicked.connect(self.export_trace)
+        btn_box.addWidget(export_btn)
+        btn_box.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_box.addWidget(close_btn)
+        layout.addLayout(btn_box)
+        self.setLayout(layout)
+        self.apply_dark_theme()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.reload)
+        self.refresh_timer.start(1000)
+        self.reload()
+
+    def reload(self):
+        stats = self.tracer.get_stats()
+        self.table.setRowCount(len(stats))
+        for row, (name, s) in enumerate(stats.items()):
+            values = [name, str(s['count'])] + [f"{s[k]:.2f}" for k in ('mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'total_ms')]
+            for col, text in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(text))
+        cache = get_stat_cache().get_stats()
+        self.summary_label.setText(f"{self.tracer.event_count()} buffered event(s) | stat cache: "
+                                   f"{cache['calls']} lookups, {cache['saved']} served from memory")
+        if self.watchdog is not None:
+            loop = self.watchdog.latency_summary()
+            text = (f"Event loop latency: p50 {loop['p50_ms']:.1f} ms, p95 {loop['p95_ms']:.1f} ms, "
+                    f"max {loop['max_ms']:.1f} ms | {loop['stalls']} stall(s) over {self.watchdog.threshold * 1000:.0f} ms")
+            if self.watchdog.recent:
+                last = self.watchdog.recent[-1]
+                text += f"\nLast stall: {last.duration * 1000:.0f} ms in {last.function} (logged to {self.watchdog.log_path})"
+            self.watchdog_label.setText(text)
+
+    def reset(self):
+        self.tracer.reset()
+        self.reload()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "brontobase-trace.json", "Chrome trace (*.json)")
+        if not path:
+            return
+        try:
+            count = self.tracer.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Trace", f"Could not write the trace:\n{e}")
+            return
+        QMessageBox.information(self, "Export Trace", f"Wrote {count} event(s). Open the file in chrome://tracing or ui.perfetto.dev.")
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QLabel, QCheckBox { color: #ccc; }
+            QTableWidget {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+        """)
+
+
+class BatchRenameDialog(QDialog):
+    """Renames many items at once from a template or regex, with a live preview of the plan"""
+    PREVIEW_ROWS = 1000
+
+    def __init__(self, parent, paths):
+        super().__init__(parent)
+        self.paths = paths
+        self.plan = None
+        self.setWindowTitle(f"Rename {len(paths)} Items")
+        self.setGeometry(200, 200, 700, 550)
+
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["Template", "Regex"])
+        self.mode_combo.currentTextChanged.connect(self.on_mode_changed)
+        form.addRow(QLabel("Mode:"), self.mode_combo)
+        self.pattern_edit = QLineEdit("{name}_{n:03}{ext}")
+        form.addRow(QLabel("Pattern:"), self.pattern_edit)
+        self.replacement_edit = QLineEdit()
+        self.replacement_edit.setPlaceholderText(r"Replacement, e.g. \1_{n}")
+        self.replacement_edit.setEnabled(False)
+        form.addRow(QLabel("Replace with:"), self.replacement_edit)
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(0, 10**9)
+        self.start_spin.setValue(1)
+        form.addRow(QLabel("Counter start:"), self.start_spin)
+        layout.addLayout(form)
+
+        self.preview_table = QTableWidget(0, 3)
+        self.preview_table.setHorizontalHeaderLabels(["Current Name", "New Name", "Status"])
+        self.preview_table.horizontalHeader().setStretchLastSection(True)
+        self.preview_table.setColumnWidth(0, 250)
+        self.preview_table.setColumnWidth(1, 250)
+        self.preview_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.preview_table)
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        btn_box = QHBoxLayout()
+        btn_box.addStretch()
+        self.apply_btn = QPushButton("Rename")
+        self.apply_btn.clicked.connect(self.apply_renames)
+        btn_box.addWidget(self.apply_btn)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        btn_box.addWidget(cancel_btn)
+        layout.addLayout(btn_box)
+        self.setLayout(layout)
+
+        # Re-plan shortly after typing stops rather than on every keystroke
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(150)
+        self.preview_timer.timeout.connect(self.update_preview)
+        for edit in (self.pattern_edit, self.replacement_edit):
+            edit.textChanged.connect(self.preview_timer.start)
+        self.start_spin.valueChanged.connect(self.preview_timer.start)
+
+        self.apply_dark_theme()
+        self.update_preview()
+
+    def on_mode_changed(self, mode):
+        self.replacement_edit.setEnabled(mode == "Regex")
+        self.pattern_edit.setText("{name}_{n:03}{ext}" if mode == "Template" else r"^(.*)$")
+        self.update_preview()
+
+    def update_preview(self):
+        from core.batch_rename import build_names, plan_renames
+        mode = self.mode_combo.currentText().lower()
+        try:
+            names = build_names(self.paths, mode, self.pattern_edit.text(), self.replacement_edit.text(),
+                                self.start_spin.value())
+        except ValueError as e:
+            self.plan = None
+            self.preview_table.setRowCount(0)
+            self.summary_label.setText(f"Invalid pattern: {e}")
+            self.apply_btn.setEnabled(False)
+            return
+        self.plan = plan_renames(self.paths, names)
+        rows = self.plan.preview()
+        shown = rows[:self.PREVIEW_ROWS]
+        self.preview_table.setUpdatesEnabled(False)
+        self.preview_table.setRowCount(len(shown))
+        for r, (old, new, status) in enumerate(shown):
+            self.preview_table.setItem(r, 0, QTableWidgetItem(old))
+            self.preview_table.setItem(r, 1, QTableWidgetItem(new))
+            status_item = QTableWidgetItem(status)
+            if status != "OK":
+                status_item.setForeground(QColor("#ff6b6b"))
+            self.preview_table.setItem(r, 2, status_item)
+        self.preview_table.setUpdatesEnabled(True)
+        summary = f"{len(rows)} to rename, {self.plan.unchanged} unchanged"
+        if len(rows) > len(shown):
+            summary += f" (showing first {len(shown)})"
+        if self.plan.conflicts:
+            summary += f", {len(self.plan.conflicts)} conflict(s)"
+        self.summary_label.setText(summary)
+        self.apply_btn.setEnabled(bool(rows) and self.plan.is_valid)
+
+    def apply_renames(self):
+        if self.plan is None or not self.plan.is_valid:
+            return
+        from core.batch_rename import apply_plan
+        result = apply_plan(self.plan)
+        if result.errors:
+            note = "All renames were undone.\n" if result.rolled_back else ""
+            QMessageBox.warning(self, "Rename Error", note + "\n".join(result.errors[:20]))
+            return
+        self.accept()
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QLabel { color: #ccc; }
+            QLineEdit, QComboBox, QSpinBox, QTableWidget {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px; padding: 5px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+            QPushButton:disabled {
+                background-color: #222222; color: #666666; border: 1px solid #444444;
+            }
+        """)
+
+
+class TreemapWidget(QWidget):
+    """Paints a squarified treemap of one UsageTree node's children"""
+    node_activated = pyqtSignal(int)
+
+    PALETTE = ["#b8860b", "#8b6914", "#6b8e23", "#4682b4", "#8b4513", "#708090", "#9932cc", "#2e8b57"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = None
+        self.node = 0
+        self.rects = []
+        self.setMinimumSize(400, 300)
+        self.setMouseTracking(True)
+
+    def set_tree(self, tree, node=0):
+        self.tree = tree
+        self.node = node
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#111111"))
+        self.rects = []
+        if self.tree is None:
+            return
+        with self.tree.lock:
+            kids = [k for k in self.tree.children(self.node) if self.tree.total_size[k] > 0][:200]
+            sizes = [self.tree.total_size[k] for k in kids]
+            own = self.tree.own_size[self.node]
+            labels = [(self.tree.names[k], self.tree.total_size[k]) for k in kids]
+        items = list(zip(kids, sizes, labels))
+        if own > 0:
+            items.append((-1, own, ("(files)", own)))
+            items.sort(key=lambda it: it[1], reverse=True)
+        if not items:
+            return
+        from core.disk_usage import squarify
+        layout = squarify([it[1] for it in items], 0, 0, self.width(), self.height())
+        painter.setPen(QPen(QColor("#20201f"), 1))
+        for i, ((node, _, (name, size)), (x, y, w, h)) in enumerate(zip(items, layout)):
+            rect = QRectF(x, y, w, h)
+            color = QColor("#444444") if node < 0 else QColor(self.PALETTE[i % len(self.PALETTE)])
+            painter.fillRect(rect, color)
+            painter.drawRect(rect)
+            if w > 60 and h > 18:
+                painter.setPen(QColor("#000000"))
+                painter.drawText(rect.adjusted(4, 2, -4, -2), Qt.AlignLeft | Qt.AlignTop, f"{name}\n{format_size(size)}")
+                painter.setPen(QPen(QColor("#20201f"), 1))
+            self.rects.append((rect, node))
+
+    def mouseDoubleClickEvent(self, event):
+        for rect, node in self.rects:
+            if node >= 0 and rect.contains(event.pos().x(), event.pos().y()):
+                self.node_activated.emit(node)
+                return
+
+    def mouseMoveEvent(self, event):
+        for rect, node in self.rects:
+            if rect.contains(event.pos().x(), event.pos().y()):
+                self.setToolTip(self.tree.path(node) if node >= 0 else "Files directly in this folder")
+                return
+
+
+class DiskUsageDialog(QDialog):
+    """Shows what is using space below a folder as a treemap that fills in while scanning"""
+
+    def __init__(self, parent, root_dir):
+        super().__init__(parent)
+        self.tree = None
+        self.shown_path = ""
+        self.setWindowTitle("▦ Disk Usage")
+        self.setGeometry(150, 150, 900, 650)
+
+        layout = QVBoxLayout()
+        dir_layout = QHBoxLayout()
+        dir_layout.addWidget(QLabel("Folder:"))
+        self.dir_edit = QLineEdit(root_dir)
+        dir_layout.addWidget(self.dir_edit)
+        self.scan_btn = QPushButton("Scan")
+        self.scan_btn.clicked.connect(self.start_scan)
+        dir_layout.addWidget(self.scan_btn)
+        self.rescan_btn = QPushButton("Rescan Changes")
+        self.rescan_btn.setEnabled(False)
+        self.rescan_btn.clicked.connect(self.start_rescan)
+        dir_layout.addWidget(self.rescan_btn)
+        self.up_btn = QPushButton("Up")
+        self.up_btn.clicked.connect(self.go_up)
+        dir_layout.addWidget(self.up_btn)
+        layout.addLayout(dir_layout)
+
+        self.location_label = QLabel("")
+        layout.addWidget(self.location_label)
+        self.treemap = TreemapWidget()
+        self.treemap.node_activated.connect(self.show_node)
+        layout.addWidget(self.treemap, 1)
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        self.setLayout(layout)
+
+        # Repaint periodically while the background scan grows the tree
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(300)
+        self.refresh_timer.timeout.connect(self.refresh_view)
+        self.apply_dark_theme()
+
+    def start_scan(self):
+        root = self.dir_edit.text()
+        if not os.path.isdir(root):
+            QMessageBox.warning(self, "Disk Usage", "Please select a valid folder.")
+            return
+        from core.disk_usage import UsageTree
+        self.tree = UsageTree(root)
+        self.shown_path = self.tree.root
+        self.treemap.set_tree(self.tree)
+        self._run(self.tree.scan)
+
+    def start_rescan(self):
+        if self.tree is not None:
+            self._run(self.tree.rescan)
+
+    def _run(self, job):
+        self.scan_btn.setEnabled(False)
+        self.rescan_btn.setEnabled(False)
+        self.refresh_timer.start()
+        self.parent().task_runner.submit(job, on_done=self.on_scan_finished, on_error=self.on_scan_failed)
+
+    def on_scan_finished(self, result):
+        self.refresh_timer.stop()
+        self.scan_btn.setEnabled(True)
+        self.rescan_btn.setEnabled(True)
+        self.refresh_view()
+
+    def on_scan_failed(self, error):
+        self.on_scan_finished(None)
+        QMessageBox.critical(self, "Disk Usage", f"Scan failed: {error}")
+
+    def refresh_view(self):
+        if self.tree is None:
+            return
+        node = self.treemap.node
+        if not self.tree.is_live(node) or self.tree.path(node) != self.shown_path:
+            # A rescan removed the folder on show (its slot may now hold another one); show the nearest survivor
+            path = self.shown_path
+            while self.tree.find(path) is None and path != self.tree.root:
+                path = os.path.dirname(path)
+            node = self.tree.find(path) or 0
+            self.shown_path = self.tree.path(node)
+            self.treemap.set_tree(self.tree, node)
+        state = "Scanning..." if self.tree.scanning else "Done."
+        self.location_label.setText(self.tree.path(node))
+        self.summary_label.setText(
+            f"{state} {format_size(self.tree.total_size[node])} in {self.tree.total_files[node]} files, "
+            f"{len(self.tree)} folders indexed"
+        )
+        self.treemap.update()
+
+    def show_node(self, node):
+        self.shown_path = self.tree.path(node)
+        self.treemap.set_tree(self.tree, node)
+        self.refresh_view()
+
+    def go_up(self):
+        if self.tree is not None and self.treemap.node > 0:
+            parent = self.tree.parent[self.treemap.node]
+            # Detached folders have no parent (DEAD); fall back to the root
+            self.show_node(parent if parent >= 0 else 0)
+
+    def apply_dark_theme(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #2a2a2a; color: #ccc; }
+            QLabel { color: #ccc; }
+            QLineEdit {
+                background-color: #3a3a3a; color: #ccc;
+                border: 1px solid #555555; border-radius: 3px; padding: 5px;
+            }
+            QPushButton {
+                background-color: #333333; color: #ffd700;
+                border: 1px solid #555555; border-radius: 4px; padding: 8px 15px;
+            }
+            QPushButton:hover { background-color: #444444; border: 1px solid #ffd700; }
+            QPushButton:disabled {
+                background-color: #222222; color: #666666; border: 1px solid #444444;
+            }
+        """)
 
 
 class FilePropertiesDialog(QDialog):
+    """Shows a file's properties at once and fills in folder size, metadata and hash in the background"""
+
     def __init__(self, parent, path):
         super().__init__(parent)
         self.path = path
+        self.task_runner = parent.task_runner if hasattr(parent, 'task_runner') else TaskRunner(max_workers=2)
+        self._stop = threading.Event()
+        self._folder_totals = [0, 0, 0]  # bytes, files, folders; written by the size worker
+        self._folder_done = False
         self.setWindowTitle(f"{os.path.basename(path)} Properties")
-        self.setFixedSize(400, 500)
+        self.setFixedSize(420, 520)
         
         layout = QVBoxLayout()
         
@@ -1412,44 +3136,61 @@ class FilePropertiesDialog(QDialog):
         gen_layout = QFormLayout()
         gen_layout.setSpacing(10)
         
-        info = QFileInfo(path)
+        st = get_stat_cache().stat(path)
+        self.is_dir = st is not None and stat.S_ISDIR(st.st_mode)
         
         # Icon & Name
         name_label = QLabel(os.path.basename(path))
         name_label.setStyleSheet("font-size: 14pt; font-weight: bold; color: #ffd700;")
         gen_layout.addRow(QLabel("Name:"), name_label)
         
-        gen_layout.addRow(QLabel("Type:"), QLabel("File folder" if os.path.isdir(path) else "File"))
+        gen_layout.addRow(QLabel("Type:"), QLabel("File folder" if self.is_dir else "File"))
         gen_layout.addRow(QLabel("Location:"), QLabel(os.path.dirname(path)))
         
-        size = info.size()
-        size_str = self.format_size(size)
-        gen_layout.addRow(QLabel("Size:"), QLabel(size_str))
-        
-        created = info.created().toString("yyyy-MM-dd HH:mm:ss")
-        modified = info.lastModified().toString("yyyy-MM-dd HH:mm:ss")
-        accessed = info.lastRead().toString("yyyy-MM-dd HH:mm:ss")
+        self.size_label = QLabel("Calculating..." if self.is_dir else self.format_size(st.st_size if st else 0))
+        gen_layout.addRow(QLabel("Size:"), self.size_label)
+        if self.is_dir:
+            self.contains_label = QLabel("")
+            gen_layout.addRow(QLabel("Contains:"), self.contains_label)
         
-        gen_layout.addRow(QLabel("Created:"), QLabel(created))
-        gen_layout.addRow(QLabel("Modified:"), QLabel(modified))
-        gen_layout.addRow(QLabel("Accessed:"), QLabel(accessed))
+        if st is not None:
+            created = getattr(st, 'st_birthtime', st.st_ctime if os.name == 'nt' else None)
+            if created is not None:
+                gen_layout.addRow(QLabel("Created:"), QLabel(self.format_time(created)))
+            gen_layout.addRow(QLabel("Modified:"), QLabel(self.format_time(st.st_mtime)))
+            gen_layout.addRow(QLabel("Accessed:"), QLabel(self.format_time(st.st_atime)))
         
         # Attributes
         attrs = []
-        if info.isReadable(): attrs.append("Readable")
-        if info.isWritable(): attrs.append("Writable")
-        if info.isHidden(): attrs.append("Hidden")
+        if os.access(path, os.R_OK): attrs.append("Readable")
+        if os.access(path, os.W_OK): attrs.append("Writable")
+        hidden_flag = getattr(stat, 'FILE_ATTRIBUTE_HIDDEN', 0)
+        if os.path.basename(path).startswith('.') or (st is not None and getattr(st, 'st_file_attributes', 0) & hidden_flag):
+            attrs.append("Hidden")
         gen_layout.addRow(QLabel("Attributes:"), QLabel(", ".join(attrs)))
 
+        if not self.is_dir:
+            hash_row = QHBoxLayout()
+            self.hash_label = QLabel("")
+            self.hash_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            self.hash_label.setWordWrap(True)
+            self.hash_btn = QPushButton("Compute")
+            self.hash_btn.clicked.connect(self.compute_hash)
+            hash_row.addWidget(self.hash_label, 1)
+            hash_row.addWidget(self.hash_btn)
+            gen_layout.addRow(QLabel("BLAKE2b:"), hash_row)
+
         general_tab.setLayout(gen_layout)
         tabs.addTab(general_tab, "General")
         
-        # Details Tab (Placeholder)
+        # Details Tab, filled in by the metadata extractors
         details_tab = QWidget()
-        det_layout = QVBoxLayout()
-        det_layout.addWidget(QLabel("Additional details..."))
-        details_tab.setLayout(det_layout)
-        # tabs.addTab(details_tab, "Details") 
+        self.details_layout = QFormLayout()
+        self.details_layout.setSpacing(10)
+        self.details_status = QLabel("Reading..." if not self.is_dir else "No details for folders.")
+        self.details_layout.addRow(self.details_status)
+        details_tab.setLayout(self.details_layout)
+        tabs.addTab(details_tab, "Details")
         
         layout.addWidget(tabs)
         
@@ -1463,6 +3204,79 @@ class FilePropertiesDialog(QDialog):
         self.setLayout(layout)
         self.apply_dark_theme()
 
+        if self.is_dir:
+            self.size_timer = QTimer(self)
+            self.size_timer.setInterval(200)
+            self.size_timer.timeout.connect(self.update_folder_size)
+            self.size_timer.start()
+            self.task_runner.submit(self._measure_folder, on_done=self.on_folder_measured,
+                                    on_error=self.on_folder_measured)
+        elif st is not None:
+            self.task_runner.submit(self._read_details, on_done=self.show_details, on_error=self.show_details_error)
+
+    def _read_details(self):
+        """Runs on a worker: fields come from the shared metadata cache when this version was seen before"""
+        return describe(get_metadata_service().get_or_extract(self.path))
+
+    def _measure_folder(self):
+        """Runs on a worker: crawl the folder, publishing running totals for the timer to display"""
+        from core.scanner import ParallelScanner
+        totals = self._folder_totals
+        for listing in ParallelScanner().walk_dirs(self.path):
+            if self._stop.is_set():
+                break
+            totals[0] += sum(f.size for f in listing.files)
+            totals[1] += len(listing.files)
+            totals[2] += len(listing.subdirs)
+
+    def update_folder_size(self):
+        size, files, folders = self._folder_totals
+        suffix = "" if self._folder_done else " (counting...)"
+        self.size_label.setText(f"{self.format_size(size)} ({size:,} bytes){suffix}")
+        self.contains_label.setText(f"{files:,} Files, {folders:,} Folders")
+
+    def on_folder_measured(self, _result):
+        if self._stop.is_set():
+            return
+        self._folder_done = True
+        self.size_timer.stop()
+        self.update_folder_size()
+
+    def show_details(self, details):
+        if self._stop.is_set():
+            return
+        self.details_status.setText("" if details else "No details available.")
+        for label, value in details.items():
+            value_label = QLabel(str(value))
+            value_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            self.details_layout.addRow(QLabel(f"{label}:"), value_label)
+
+    def show_details_error(self, error):
+        if self._stop.is_set():
+            return
+        self.details_status.setText(f"Could not read details: {error}")
+
+    def compute_hash(self):
+        self.hash_btn.setEnabled(False)
+        from core.hash_cache import get_hash_cache
+        self.hash_label.setText("Hashing...")
+        self.task_runner.submit(get_hash_cache().digest, self.path,
+                                on_done=self.show_hash, on_error=lambda e: self.show_hash(None))
+
+    def show_hash(self, digest):
+        if self._stop.is_set():
+            return
+        self.hash_label.setText(digest or "Could not read file.")
+        self.hash_btn.setEnabled(True)
+
+    def done(self, result):
+        # Stop the folder crawl; results arriving after close are ignored
+        self._stop.set()
+        super().done(result)
+
+    def format_time(self, timestamp):
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
     def format_size(self, size_bytes):
         if size_bytes < 1024: return f"{size_bytes} bytes"
         elif size_bytes < 1024**2: return f"{size_bytes/1024:.2f} KB"
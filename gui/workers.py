@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class _ResultBridge(QObject):
+    """Carries worker results back to the GUI thread through a queued signal"""
+    result_ready = pyqtSignal(object, object)
+
+
+class TaskRunner:
+    """Runs callables on a thread pool and delivers results on the GUI thread"""
+
+    def __init__(self, max_workers: int = 4, name: str = "bb-worker"):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._bridge = _ResultBridge()
+        self._bridge.result_ready.connect(self._dispatch)
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Run fn(*args) in the background; callbacks run on the GUI thread"""
+        future = self._executor.submit(fn, *args)
+
+        def _done(f):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                self._bridge.result_ready.emit(on_error, error)
+            else:
+                self._bridge.result_ready.emit(on_done, f.result())
+
+        future.add_done_callback(_done)
+        return future
+
+    def _dispatch(self, callback, value):
+        if callback is not None:
+            callback(value)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
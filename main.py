@@ -1,5 +1,10 @@
+import time
+STARTED = time.perf_counter()
+
+import json
 import os
 import sys
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from gui.window import MainWindow
 
@@ -7,9 +12,26 @@ from gui.window import MainWindow
 def main():
     # Disable Qt accessibility logs that can spam the console on some setups
     os.environ.setdefault("QT_ACCESSIBILITY", "0")
+    # --eager-startup fills the tree and model before showing the window (the old behaviour);
+    # --startup-benchmark prints phase timings as JSON and exits once startup is done
+    eager = "--eager-startup" in sys.argv
+    benchmark = "--startup-benchmark" in sys.argv
+    argv = [a for a in sys.argv if a not in ("--eager-startup", "--startup-benchmark")]
+    imported = time.perf_counter()
+
+    app = QApplication(argv)
+    window = MainWindow(defer_startup=not eager)
+    if benchmark:
+        marks = {'imports_done': imported}
+
+        def report(timings):
+            # timings include first_paint, taken from the window's first paint event
+            marks.update(timings)
+            print(json.dumps({k: round((v - STARTED) * 1000, 1) for k, v in marks.items()}))
+            # Let the paint after the last step happen before quitting
+            QTimer.singleShot(0, app.quit)
 
-    app = QApplication(sys.argv)
-    window = MainWindow()
+        window.startup_finished.connect(report)
     window.show()
     sys.exit(app.exec_())
 
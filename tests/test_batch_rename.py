@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+import pytest
+from core.batch_rename import apply_plan, build_names, plan_renames
+
+
+def _touch(directory, *names):
+    paths = []
+    for name in names:
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(name)
+        paths.append(path)
+    return paths
+
+
+def _contents(directory):
+    result = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name)) as f:
+            result[name] = f.read()
+    return result
+
+
+def test_template_and_regex_names():
+    paths = ["/x/photo.jpg", "/x/scan.png"]
+    assert build_names(paths, "template", "{name}_{n:03}{ext}") == ["photo_001.jpg", "scan_002.png"]
+    assert build_names(paths, "regex", r"^(\w+)\.(\w+)$", r"\2-\1-{n}", start=5) == ["jpg-photo-5", "png-scan-6"]
+    # Every malformed pattern surfaces as ValueError, including attribute and index access
+    for pattern in ("{name.upper}", "{ext[0].x}", "{name:03d}", "{size}", "{name"):
+        with pytest.raises(ValueError):
+            build_names(paths, "template", pattern)
+    with pytest.raises(ValueError):
+        build_names(paths, "regex", "(", "x")
+
+
+def test_swap_cycle_is_resolved_with_temp_name():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        a, b, c = _touch(tmpdir, "a.txt", "b.txt", "c.txt")
+        # a -> b, b -> c, c -> a is a three-way cycle
+        plan = plan_renames([a, b, c], ["b.txt", "c.txt", "a.txt"])
+        assert plan.is_valid
+        assert len(plan.steps) == 4
+        result = apply_plan(plan)
+        assert not result.errors and result.renamed == 3
+        assert _contents(tmpdir) == {"b.txt": "a.txt", "c.txt": "b.txt", "a.txt": "c.txt"}
+
+
+def test_chain_is_ordered_without_temp_names():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = _touch(tmpdir, "1.txt", "2.txt", "3.txt")
+        plan = plan_renames(paths, ["2.txt", "3.txt", "4.txt"])
+        assert plan.is_valid and len(plan.steps) == 3
+        apply_plan(plan)
+        assert _contents(tmpdir) == {"2.txt": "1.txt", "3.txt": "2.txt", "4.txt": "3.txt"}
+
+
+def test_collisions_are_reported():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        a, b = _touch(tmpdir, "a.txt", "b.txt")
+        _touch(tmpdir, "taken.txt")
+        plan = plan_renames([a, b], ["same.txt", "same.txt"])
+        assert not plan.is_valid
+        plan = plan_renames([a], ["taken.txt"])
+        assert [c.reason for c in plan.conflicts] == ["target already exists"]
+        assert apply_plan(plan).errors
+        assert os.path.exists(a)
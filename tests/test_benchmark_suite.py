@@ -0,0 +1,39 @@
+import glob
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import suite  # noqa: E402
+from synthetic import SHAPES  # noqa: E402
+
+
+def _listing(root):
+    return sorted((os.path.relpath(os.path.join(r, n), root), os.path.getsize(os.path.join(r, n)))
+                  for r, _, files in os.walk(root) for n in files)
+
+
+def test_generators_are_deterministic():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for shape, generate in SHAPES.items():
+            a, b = os.path.join(tmpdir, shape + "_a"), os.path.join(tmpdir, shape + "_b")
+            stats = generate(a, 0.01)
+            generate(b, 0.01)
+            assert _listing(a) == _listing(b)
+            assert stats.files == len(_listing(a)) and stats.bytes == sum(s for _, s in _listing(a))
+
+
+def test_suite_stores_and_compares_runs(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        argv = ["--scale", "0.01", "--repeat", "1", "--only", "search.scan,copy,favorites",
+                "--shapes", "deep", "--results-dir", tmpdir]
+        assert suite.main(argv) == 0
+        assert suite.main(argv + ["--compare", "latest", "--no-save"]) == 0
+        runs = glob.glob(os.path.join(tmpdir, "*.json"))
+        assert len(runs) == 1
+        with open(runs[0]) as f:
+            run = json.load(f)
+        assert sorted(run["results"]) == ["copy[deep]", "favorites[deep]", "search.scan[deep]"]
+        assert "vs " in capsys.readouterr().out
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import cli
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _run(capsys, *argv):
+    code = cli.main(list(argv))
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return code, records
+
+
+def test_search_copy_and_index(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "root")
+        _write(os.path.join(root, "a.log"), b"x" * 2048)
+        _write(os.path.join(root, "sub", "b.log"), b"y")
+        _write(os.path.join(root, "sub", "c.txt"), b"z")
+
+        code, records = _run(capsys, "search", root, "*.log", "--min-size", "1k")
+        assert code == 0
+        assert [r["path"] for r in records if r["type"] == "match"] == [os.path.join(root, "a.log")]
+        assert records[-1] == {"type": "result", "matches": 1, "skipped": 0}
+
+        db = os.path.join(tmpdir, "index.db")
+        code, records = _run(capsys, "index", "build", root, "--db", db)
+        assert code == 0 and records[-1]["entries"] == 5
+        code, records = _run(capsys, "search", root, "LOG", "--index", "--db", db)
+        assert sorted(os.path.basename(r["path"]) for r in records if r["type"] == "match") == ["a.log", "b.log"]
+
+        dest = os.path.join(tmpdir, "dest")
+        os.makedirs(dest)
+        code, records = _run(capsys, "copy", os.path.join(root, "a.log"), os.path.join(root, "sub"), dest,
+                             "--journal-dir", os.path.join(tmpdir, "journals"))
+        assert code == 0 and records[-1] == {"type": "result", "completed": 2, "errors": 0}
+        assert os.path.isfile(os.path.join(dest, "sub", "c.txt"))
+
+
+def test_failures_set_exit_code(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        code, records = _run(capsys, "move", os.path.join(tmpdir, "missing"), tmpdir)
+        assert code == cli.EXIT_FAILED
+        assert records[0]["type"] == "error"
+
+
+def test_archive_tool_failure_is_an_error_record(capsys, monkeypatch):
+    import core.compress
+
+    def failing_run(cmd, check):
+        raise subprocess.CalledProcessError(1, cmd)
+
+    monkeypatch.setattr(core.compress.shutil, "which", lambda name: "powershell")
+    monkeypatch.setattr(core.compress.subprocess, "run", failing_run)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        code, records = _run(capsys, "compress", tmpdir, os.path.join(tmpdir, "out.zip"))
+    assert code == cli.EXIT_FAILED
+    assert records == [{"type": "error", "message": "Compress-Archive failed with exit code 1"}]
+
+
+def test_cli_does_not_import_qt():
+    script = ("import os, sys, cli; cli.main(['dedupe', sys.argv[1], '--hash-cache', "
+              "os.path.join(sys.argv[1], 'hashes.bin')]); print('QT' if 'PyQt5' in sys.modules else 'NOQT')")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out = subprocess.run([sys.executable, "-c", script, tmpdir], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout
+    assert out.splitlines()[-1] == "NOQT"
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+import core
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_core_package_imports_submodules_lazily():
+    script = "import sys, core; print(sorted(m for m in sys.modules if m.startswith('core.')))"
+    out = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_every_exported_name_resolves():
+    for name in core.__all__:
+        assert getattr(core, name) is not None
+    assert "FolderSync" in dir(core)
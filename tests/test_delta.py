@@ -0,0 +1,59 @@
+import os
+import random
+import tempfile
+import zlib
+
+from core.delta import delta_copy, roll
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_roll_matches_adler32():
+    data = os.urandom(3000)
+    weak = zlib.adler32(data[:1000])
+    for i in range(2000):
+        weak = roll(weak, data[i], data[i + 1000], 1000)
+        assert weak == zlib.adler32(data[i + 1:i + 1001])
+
+
+def test_in_place_rewrites_only_changed_blocks():
+    rng = random.Random(7)
+    old = rng.randbytes(400 * 1024)
+    new = bytearray(old)
+    new[100000:100010] = b"0123456789"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src, dst = os.path.join(tmpdir, "new.img"), os.path.join(tmpdir, "old.img")
+        _write(src, bytes(new))
+        _write(dst, old)
+        result = delta_copy(src, dst, in_place=True, block_size=4096)
+        assert _read(dst) == bytes(new)
+        assert result.written_bytes <= 4096
+        assert os.stat(dst).st_mtime_ns == os.stat(src).st_mtime_ns
+
+
+def test_shifted_data_is_reused_and_results_match():
+    rng = random.Random(11)
+    old = rng.randbytes(200 * 1024)
+    new = old[:50000] + b"inserted" * 100 + old[50000:150000] + old[160000:]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src, dst = os.path.join(tmpdir, "new.img"), os.path.join(tmpdir, "old.img")
+        _write(src, new)
+        for in_place in (False, True):
+            _write(dst, old)
+            result = delta_copy(src, dst, in_place=in_place, block_size=4096)
+            assert _read(dst) == new
+            assert not os.path.exists(dst + ".bbdelta-part")
+        assert result.literal_bytes < len(new)
+        basis = os.path.join(tmpdir, "basis.img")
+        _write(basis, old)
+        temp_result = delta_copy(src, os.path.join(tmpdir, "copy.img"), basis=basis, block_size=4096)
+        assert temp_result.matched_bytes > 0.9 * len(new)
+        assert _read(os.path.join(tmpdir, "copy.img")) == new
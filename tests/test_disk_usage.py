@@ -0,0 +1,76 @@
+import os
+import tempfile
+from core.disk_usage import UsageTree, squarify
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def _build(root):
+    _write(os.path.join(root, "top.bin"), 10)
+    _write(os.path.join(root, "a", "one.bin"), 100)
+    _write(os.path.join(root, "a", "deep", "two.bin"), 200)
+    _write(os.path.join(root, "b", "three.bin"), 50)
+
+
+def test_scan_aggregates_sizes_and_counts():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _build(tmpdir)
+        tree = UsageTree(tmpdir).scan()
+        assert tree.total_size[0] == 360
+        assert tree.total_files[0] == 4
+        kids = tree.children(0)
+        assert [tree.names[k] for k in kids] == ["a", "b"]
+        assert tree.total_size[kids[0]] == 300
+        assert tree.path(tree.children(kids[0])[0]) == os.path.join(tree.root, "a", "deep")
+
+
+def test_rescan_only_refreshes_changed_directories():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _build(tmpdir)
+        tree = UsageTree(tmpdir).scan()
+        assert tree.rescan() == 0
+        _write(os.path.join(tmpdir, "b", "new.bin"), 5)
+        _write(os.path.join(tmpdir, "c", "four.bin"), 7)
+        for name in ("two.bin",):
+            os.remove(os.path.join(tmpdir, "a", "deep", name))
+        os.rmdir(os.path.join(tmpdir, "a", "deep"))
+        assert tree.rescan() >= 3
+        assert tree.total_size[0] == 360 - 200 + 5 + 7
+        assert tree.total_files[0] == 5
+        assert sorted(tree.names[k] for k in tree.children(0)) == ["a", "b", "c"]
+        # Slots of removed folders are reused instead of growing the arrays on every rescan
+        slots = len(tree.names)
+        for _ in range(3):
+            os.rename(os.path.join(tmpdir, "c"), os.path.join(tmpdir, "d"))
+            tree.rescan()
+            os.rename(os.path.join(tmpdir, "d"), os.path.join(tmpdir, "c"))
+            tree.rescan()
+        assert len(tree.names) <= slots + 1 and len(tree) == 4
+        # Child lists are maintained as folders come and go, and agree with the parent links
+        for node in range(len(tree.names)):
+            expected = {k for k in range(1, len(tree.names)) if tree.parent[k] == node} if tree.is_live(node) else set()
+            assert set(tree.children(node)) == expected
+        assert tree.total_size[0] == 360 - 200 + 5 + 7
+        assert tree.path(tree.find(os.path.join(tmpdir, "c"))) == os.path.join(tree.root, "c")
+        assert tree.find(os.path.join(tmpdir, "d")) is None
+
+
+def test_node_budget_folds_deep_directories():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _build(tmpdir)
+        tree = UsageTree(tmpdir, max_nodes=2).scan()
+        assert len(tree) == 2
+        assert tree.total_size[0] == 360
+
+
+def test_squarify_fills_rectangle():
+    sizes = [6, 6, 4, 3, 2, 2, 1]
+    rects = squarify(sizes, 0, 0, 6, 4)
+    assert len(rects) == len(sizes)
+    for (x, y, w, h), size in zip(rects, sizes):
+        assert abs(w * h - size) < 1e-6
+        assert -1e-9 <= x and x + w <= 6 + 1e-9 and -1e-9 <= y and y + h <= 4 + 1e-9
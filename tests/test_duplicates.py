@@ -0,0 +1,53 @@
+import os
+import tempfile
+from core.duplicates import DuplicateFinder, PARTIAL_BYTES
+from core.hash_cache import HashCache
+from core.scanner import ParallelScanner
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_parallel_scanner_finds_nested_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rel in ("a.txt", "x/b.txt", "x/y/c.txt"):
+            _write(os.path.join(tmpdir, rel), b"data")
+        scanner = ParallelScanner(max_workers=3)
+        found = sorted(os.path.relpath(e.path, tmpdir) for e in scanner.walk(tmpdir))
+        assert found == sorted(["a.txt", os.path.join("x", "b.txt"), os.path.join("x", "y", "c.txt")])
+        assert scanner.dirs_scanned == 3
+
+
+def test_find_duplicates_staged():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        big = os.urandom(3 * PARTIAL_BYTES)
+        # Same head and tail as big but a different middle: only the full hash can tell them apart
+        near = big[:PARTIAL_BYTES] + os.urandom(PARTIAL_BYTES) + big[-PARTIAL_BYTES:]
+        _write(os.path.join(tmpdir, "a", "big1.bin"), big)
+        _write(os.path.join(tmpdir, "b", "big2.bin"), big)
+        _write(os.path.join(tmpdir, "b", "near.bin"), near)
+        _write(os.path.join(tmpdir, "s1.txt"), b"hello")
+        _write(os.path.join(tmpdir, "s2.txt"), b"hello")
+        _write(os.path.join(tmpdir, "unique.txt"), b"unique content")
+
+        finder = DuplicateFinder(hash_cache=HashCache())
+        report = finder.find(tmpdir)
+        names = sorted(sorted(os.path.basename(p) for p in g.paths) for g in report.groups)
+        assert names == [["big1.bin", "big2.bin"], ["s1.txt", "s2.txt"]]
+        assert report.wasted_bytes == len(big) + 5
+        assert report.full_hashed == 3
+
+        # Second run is served from the hash cache
+        assert finder.find(tmpdir).bytes_read == 0
+
+
+def test_distinct_sizes_are_never_read():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(20):
+            _write(os.path.join(tmpdir, f"f{i}.bin"), b"x" * (1000 + i))
+        report = DuplicateFinder(hash_cache=HashCache()).find(tmpdir)
+        assert report.groups == []
+        assert report.bytes_read == 0
@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+from core.excludes import ExcludeEngine, compile_rules
+from core.scanner import ParallelScanner
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("x")
+
+
+def _matches(rules, rel, is_dir=False):
+    result = False
+    for rule in rules:
+        if (is_dir or not rule.dir_only) and rule.regex.match(rel):
+            result = not rule.negate
+    return result
+
+
+def test_gitignore_syntax():
+    rules = compile_rules(["# comment", "*.log", "!keep.log", "/dist", "out/", "docs/**/draft?.md", ""])
+    assert _matches(rules, "a/b/debug.log")
+    assert not _matches(rules, "a/keep.log")
+    assert _matches(rules, "dist", is_dir=True) and not _matches(rules, "src/dist", is_dir=True)
+    assert _matches(rules, "src/out", is_dir=True) and not _matches(rules, "src/out")
+    assert _matches(rules, "docs/draft1.md") and _matches(rules, "docs/x/y/draft2.md")
+    assert not _matches(rules, "docs/draft10.md")
+
+
+def test_scanner_prunes_excluded_subtrees(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "repo")
+        for rel in ["main.py", "node_modules/pkg/index.js", ".git/HEAD", "build/out.o",
+                    "app/debug.log", "app/keep.log", "app/sub/trace.log", "app/sub/ok.txt"]:
+            _touch(os.path.join(root, rel))
+        with open(os.path.join(root, ".gitignore"), "w") as f:
+            f.write("build/\n*.log\n")
+        # A deeper ignore file can re-include what a shallower one excluded
+        with open(os.path.join(root, "app", ".gitignore"), "w") as f:
+            f.write("!keep.log\n")
+
+        engine = ExcludeEngine()
+        scanner = ParallelScanner(excludes=engine)
+        found = sorted(os.path.relpath(e.path, root) for e in scanner.walk(root))
+        assert found == sorted([".gitignore", "main.py", os.path.join("app", ".gitignore"),
+                                os.path.join("app", "keep.log"), os.path.join("app", "sub", "ok.txt")])
+        # node_modules, .git, build, app/debug.log, app/sub/trace.log
+        assert scanner.skipped == 5
+        assert sorted(os.path.relpath(e.path, root) for e in ParallelScanner().walk(root)) != found
+
+        assert engine.is_excluded(os.path.join(root, "node_modules", "pkg", "index.js"))
+        assert engine.is_excluded(os.path.join(root, "app", "sub", "trace.log"))
+        assert not engine.is_excluded(os.path.join(root, "app", "keep.log"))
+        listing = scanner.scan_dir(os.path.join(root, "app", "sub"))
+        assert [os.path.basename(f.path) for f in listing.files] == ["ok.txt"] and listing.skipped == 1
+
+        # A relative start below the repo still applies the repo's rules, and each ignore file only once
+        monkeypatch.chdir(tmpdir)
+        assert len(engine.context_for(os.path.join("repo", "app")).layers) == 1
+        relative = ParallelScanner(excludes=engine)
+        found = sorted(os.path.relpath(e.path, root) for e in relative.walk(os.path.join("repo", "app")))
+        assert found == [os.path.join("app", ".gitignore"), os.path.join("app", "keep.log"),
+                         os.path.join("app", "sub", "ok.txt")]
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+
+from core.file_index import FileIndex
+from core.scanner import ParallelScanner
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_build_and_search():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "root_1")
+        _write(os.path.join(root, "Report.LOG"), b"x" * 100)
+        _write(os.path.join(root, "sub", "notes.txt"), b"y" * 10)
+        _write(os.path.join(root, "sub", "app.log"), b"z" * 5)
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        assert index.build(root) == 5  # two directories, three files
+        assert index.roots() == [root]
+
+        logs = index.search(exts=["log"])
+        assert sorted(f.name for f in logs) == ["Report.LOG", "app.log"]
+        assert [f.name for f in index.search(name_contains="REPORT")] == ["Report.LOG"]
+        assert [f.name for f in index.search(exts=[".log"], min_size=50)] == ["Report.LOG"]
+        assert [f.name for f in index.search(name_glob="*.txt", under=os.path.join(root, "sub"))] == ["notes.txt"]
+        # '_' in the root name must not act as a LIKE wildcard
+        assert index.search(under=os.path.join(tmpdir, "rootX1")) == []
+        index.close()
+
+
+def test_folders_differing_only_in_case_stay_apart():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        upper = os.path.join(tmpdir, "Proj")
+        lower = os.path.join(tmpdir, "proj")
+        _write(os.path.join(upper, "a.txt"), b"a")
+        _write(os.path.join(lower, "b.txt"), b"b")
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        index.build(upper)
+        index.build(lower)
+        index.build(upper)  # rebuilding one root must not drop the other's entries
+        assert [f.name for f in index.search(name_glob="*.txt", under=upper)] == ["a.txt"]
+        assert [f.name for f in index.search(name_glob="*.txt", under=lower)] == ["b.txt"]
+        index.close()
+
+
+def test_refresh_reports_changes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "root")
+        _write(os.path.join(root, "keep.txt"), b"keep")
+        _write(os.path.join(root, "old", "gone.txt"), b"gone")
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        index.build(root)
+        changes = []
+        index.add_listener(changes.append)
+
+        os.remove(os.path.join(root, "old", "gone.txt"))
+        os.rmdir(os.path.join(root, "old"))
+        _write(os.path.join(root, "new", "fresh.txt"), b"fresh")
+        _write(os.path.join(root, "keep.txt"), b"kept longer")
+        os.utime(root, ns=(1, 1))  # force the mtime check to see the root as stale
+
+        assert index.refresh(root) >= 1
+        added = {p for c in changes for p in c.added}
+        removed = {p for c in changes for p in c.removed}
+        updated = {p for c in changes for p in c.updated}
+        assert os.path.join(root, "new", "fresh.txt") in added
+        assert os.path.join(root, "old", "gone.txt") in removed
+        assert os.path.join(root, "keep.txt") in updated
+        assert sorted(f.name for f in index.search()) == ["fresh.txt", "keep.txt"]
+        # New subfolders are indexed as part of the root, not registered as roots themselves
+        assert index.roots() == [root]
+        reopened = FileIndex(os.path.join(tmpdir, "index.db"))
+        assert reopened.roots() == [root]
+        reopened.close()
+        index.close()
+
+
+def test_reads_are_not_blocked_by_a_running_build():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first, second = os.path.join(tmpdir, "first"), os.path.join(tmpdir, "second")
+        _write(os.path.join(first, "a.txt"), b"a")
+        _write(os.path.join(second, "b.txt"), b"b")
+        crawling, resume = threading.Event(), threading.Event()
+
+        class PausingScanner(ParallelScanner):
+            def walk_dirs(self, roots):
+                for listing in super().walk_dirs(roots):
+                    yield listing
+                    crawling.set()
+                    assert resume.wait(5)
+
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        index.build(first)
+        index.scanner = PausingScanner()
+        builder = threading.Thread(target=index.build, args=(second,))
+        builder.start()
+        assert crawling.wait(5)
+        # Mid-crawl the lock is free: old entries stay searchable and roots() answers at once
+        assert index.roots() == [first]
+        assert [f.name for f in index.search()] == ["a.txt"]
+        resume.set()
+        builder.join(5)
+        assert index.roots() == [first, second]
+        assert sorted(f.name for f in index.search()) == ["a.txt", "b.txt"]
+        index.close()
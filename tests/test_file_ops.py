@@ -30,3 +30,170 @@ def test_move_file():
         file_ops.move_file(src, dst)
         assert not os.path.exists(src)
         assert os.path.exists(dst)
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+def test_run_batch_copies_and_moves_with_journal():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journals = os.path.join(tmpdir, "journals")
+        src_dir = os.path.join(tmpdir, "src")
+        dst_dir = os.path.join(tmpdir, "dst")
+        os.makedirs(os.path.join(src_dir, "tree"))
+        os.mkdir(dst_dir)
+        _write(os.path.join(src_dir, "a.txt"), "a")
+        _write(os.path.join(src_dir, "tree", "b.txt"), "b")
+        _write(os.path.join(dst_dir, "a.txt"), "old")
+        result = file_ops.run_batch([
+            ("copy", os.path.join(src_dir, "a.txt"), os.path.join(dst_dir, "a.txt")),
+            ("move", os.path.join(src_dir, "tree"), os.path.join(dst_dir, "tree")),
+            ("move", os.path.join(src_dir, "missing"), os.path.join(dst_dir, "missing")),
+        ], journal_dir=journals)
+        assert result.completed == 2 and len(result.errors) == 1
+        assert _read(os.path.join(dst_dir, "a.txt")) == "a"
+        assert _read(os.path.join(dst_dir, "tree", "b.txt")) == "b"
+        assert not os.path.exists(os.path.join(src_dir, "tree"))
+        assert file_ops.pending_journals(journals) == []
+        assert sorted(os.listdir(dst_dir)) == ["a.txt", "tree"]
+
+def _interrupted_batch(tmpdir):
+    """Plan three moves, perform two of them, but record only the first (lost fsync tail)"""
+    srcs = [os.path.join(tmpdir, f"f{i}.txt") for i in range(3)]
+    dst_dir = os.path.join(tmpdir, "dst")
+    os.mkdir(dst_dir)
+    for i, src in enumerate(srcs):
+        _write(src, str(i))
+    steps = [("move", src, os.path.join(dst_dir, os.path.basename(src))) for src in srcs]
+    journal_path = os.path.join(tmpdir, "j", "batch.journal")
+    journal = file_ops.OperationJournal(journal_path)
+    journal.begin(steps)
+    file_ops._execute_step(journal.steps[0])
+    journal.mark_done(0)
+    file_ops._execute_step(journal.steps[1])
+    journal.close()
+    return srcs, dst_dir, journal_path
+
+def test_resume_interrupted_batch():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        srcs, dst_dir, journal_path = _interrupted_batch(tmpdir)
+        result = file_ops.resume_batch(journal_path)
+        assert result.completed == 3 and not result.errors
+        assert sorted(os.listdir(dst_dir)) == ["f0.txt", "f1.txt", "f2.txt"]
+        assert not any(os.path.exists(src) for src in srcs)
+        assert not os.path.exists(journal_path)
+
+def test_rollback_interrupted_batch():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        srcs, dst_dir, journal_path = _interrupted_batch(tmpdir)
+        # Leftovers of a large-file copy interrupted in the third step
+        part = os.path.join(dst_dir, "f2.txt") + file_ops.COPY_PART_SUFFIX
+        _write(part, "partial")
+        _write(part + file_ops.CHECKPOINT_SUFFIX, "{}")
+        result = file_ops.rollback_batch(journal_path)
+        assert not result.errors
+        assert os.listdir(dst_dir) == []
+        assert [_read(src) for src in srcs] == ["0", "1", "2"]
+        assert not os.path.exists(journal_path)
+
+class _Interrupt(Exception):
+    pass
+
+def test_resumable_copy_survives_random_interruptions():
+    import random
+    rng = random.Random(1234)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "big.bin")
+        dst = os.path.join(tmpdir, "copy.bin")
+        data = os.urandom(64 * 1024 * 10 + 123)
+        with open(src, "wb") as f:
+            f.write(data)
+        first_progress = []
+        for _ in range(5):
+            stop_at = rng.randint(1, len(data) - 1)
+            def progress(done, total):
+                if done >= stop_at:
+                    raise _Interrupt()
+            try:
+                file_ops.copy_file_resumable(src, dst, chunk_size=64 * 1024, checkpoint_every=2, progress=progress)
+            except _Interrupt:
+                pass
+            assert not os.path.exists(dst)
+        file_ops.copy_file_resumable(src, dst, chunk_size=64 * 1024, checkpoint_every=2,
+                                     progress=lambda done, total: first_progress.append(done))
+        # The final run picked up from a checkpoint rather than byte zero
+        assert first_progress[0] > 64 * 1024
+        with open(dst, "rb") as f:
+            assert f.read() == data
+        assert sorted(os.listdir(tmpdir)) == ["big.bin", "copy.bin"]
+
+def test_resumable_copy_after_process_kill():
+    import random
+    import signal
+    import subprocess
+    import sys
+    import time
+    if not hasattr(signal, "SIGKILL"):
+        pytest.skip("needs SIGKILL")
+    rng = random.Random()
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import sys, time\n"
+        "from core import file_ops\n"
+        "file_ops.copy_file_resumable(sys.argv[1], sys.argv[2], chunk_size=32768, checkpoint_every=1,\n"
+        "                             progress=lambda d, t: time.sleep(0.002))\n"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "big.bin")
+        dst = os.path.join(tmpdir, "copy.bin")
+        data = os.urandom(32768 * 100 + 7)
+        with open(src, "wb") as f:
+            f.write(data)
+        for _ in range(3):
+            proc = subprocess.Popen([sys.executable, "-c", script, src, dst], cwd=repo_root)
+            time.sleep(rng.uniform(0.05, 0.2))
+            proc.send_signal(signal.SIGKILL)
+            proc.wait()
+        file_ops.copy_file_resumable(src, dst, chunk_size=32768, checkpoint_every=1)
+        with open(dst, "rb") as f:
+            assert f.read() == data
+
+def test_delete_tree_removes_nested_tree():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "node_modules")
+        for i in range(5):
+            sub = os.path.join(root, f"pkg{i}", "lib", "deep")
+            os.makedirs(sub)
+            for j in range(20):
+                _write(os.path.join(sub, f"f{j}.js"), "x")
+            _write(os.path.join(root, f"pkg{i}", "index.js"), "x")
+        outside = os.path.join(tmpdir, "keep.txt")
+        _write(outside, "keep")
+        os.symlink(outside, os.path.join(root, "link.txt"))
+        result = file_ops.delete_tree(root, workers=4)
+        assert not result.errors
+        assert result.files_deleted == 5 * 21 + 1
+        assert result.dirs_deleted == 1 + 5 * 3
+        assert os.listdir(tmpdir) == ["keep.txt"]
+        assert _read(outside) == "keep"
+
+def test_delete_tree_never_follows_directory_links():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = os.path.join(tmpdir, "target")
+        os.makedirs(target)
+        _write(os.path.join(target, "keep.txt"), "keep")
+        root = os.path.join(tmpdir, "tree")
+        os.makedirs(os.path.join(root, "sub"))
+        os.symlink(target, os.path.join(root, "sub", "linked"), target_is_directory=True)
+        # A folder that is no longer the one listed (e.g. swapped for a link) is refused
+        sub_stat = os.lstat(target)
+        with pytest.raises(OSError):
+            file_ops._unlink_entries(os.path.join(root, "sub"), (sub_stat.st_dev, sub_stat.st_ino))
+        result = file_ops.delete_tree(root, workers=2)
+        assert not result.errors
+        assert not os.path.exists(root)
+        assert _read(os.path.join(target, "keep.txt")) == "keep"
@@ -0,0 +1,52 @@
+import hashlib
+import os
+import tempfile
+from core.hash_cache import HashCache, DIGEST_SIZE
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_digest_matches_blake2b_and_counts_hits():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.bin")
+        data = os.urandom(300000)
+        _write(path, data)
+        cache = HashCache(chunk_size=4096)
+        expected = hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+        assert cache.digest(path) == expected
+        assert cache.digest(path) == expected
+        stats = cache.get_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert stats['bytes_hashed'] == len(data)
+
+
+def test_modified_file_is_rehashed():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.bin")
+        _write(path, b"one")
+        cache = HashCache()
+        first = cache.digest(path)
+        _write(path, b"two!")
+        assert cache.digest(path) != first
+        assert cache.get_stats()['misses'] == 2
+
+
+def test_store_persists_between_instances():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = os.path.join(tmpdir, "hashes.bin")
+        paths = []
+        for i in range(5):
+            path = os.path.join(tmpdir, f"f{i}.txt")
+            _write(path, str(i).encode())
+            paths.append(path)
+        cache = HashCache(store)
+        digests = cache.digest_many(paths)
+        assert cache.flush()
+
+        reopened = HashCache(store)
+        assert len(reopened) == 5
+        assert reopened.digest_many(paths) == digests
+        assert reopened.get_stats()['hits'] == 5
@@ -0,0 +1,52 @@
+import os
+import tempfile
+from core.listing_cache import DirectoryListingCache, scan_directory
+
+
+def _make_files(directory, count):
+    for i in range(count):
+        with open(os.path.join(directory, f"f{i}.txt"), "w") as f:
+            f.write("x" * i)
+
+
+def test_scan_directory_reports_entries():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_files(tmpdir, 3)
+        os.mkdir(os.path.join(tmpdir, "sub"))
+        snapshot = scan_directory(tmpdir)
+        by_name = {e.name: e for e in snapshot.entries}
+        assert len(snapshot) == 4
+        assert by_name["sub"].is_dir
+        assert by_name["f2.txt"].size == 2
+
+
+def test_lru_eviction_by_entry_budget():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dirs = []
+        for name in ("a", "b", "c"):
+            d = os.path.join(tmpdir, name)
+            os.mkdir(d)
+            _make_files(d, 4)
+            dirs.append(d)
+        cache = DirectoryListingCache(max_entries=8)
+        cache.load(dirs[0])
+        cache.load(dirs[1])
+        cache.get(dirs[0])  # a is now most recently used
+        cache.load(dirs[2])
+        assert dirs[0] in cache
+        assert dirs[1] not in cache
+        assert cache.total_entries == 8
+
+
+def test_revalidate_detects_directory_change():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_files(tmpdir, 2)
+        cache = DirectoryListingCache()
+        cache.load(tmpdir)
+        snapshot, changed = cache.revalidate(tmpdir)
+        assert not changed and len(snapshot) == 2
+        _make_files(tmpdir, 3)
+        snapshot = cache.get(tmpdir)
+        os.utime(tmpdir, ns=(snapshot.dir_mtime_ns + 10**9, snapshot.dir_mtime_ns + 10**9))
+        snapshot, changed = cache.revalidate(tmpdir)
+        assert changed and len(snapshot) == 3
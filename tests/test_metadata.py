@@ -0,0 +1,83 @@
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from core.metadata import MetadataService, MetadataStore, extract_details, extract_metadata, sniff_mime
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _wav(seconds, rate=8000):
+    data = b"\x00\x00" * rate * seconds
+    fmt = struct.pack("<HHIIHH", 1, 1, rate, rate * 2, 2, 16)
+    return (b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVE" + b"fmt " + struct.pack("<I", 16) + fmt
+            + b"data" + struct.pack("<I", len(data)) + data)
+
+
+def test_image_dimensions_from_headers():
+    png = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", 640, 480, 8, 2, 0, 0, 0)
+    jpeg = (b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+            + b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, 600, 800, 1) + b"\x01\x11\x00")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, data, mime, dims in [("a.dat", png, "image/png", "640 x 480"),
+                                       ("b.dat", jpeg, "image/jpeg", "800 x 600")]:
+            path = os.path.join(tmpdir, name)
+            _write(path, data)
+            assert extract_details(path) == {"MIME type": mime, "Dimensions": dims}
+
+
+def test_audio_and_pdf_fields():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav = os.path.join(tmpdir, "tone.wav")
+        _write(wav, _wav(3))
+        fields = extract_metadata(wav)[2]
+        assert fields["duration"] == 3.0 and fields["sample_rate"] == 8000
+        pdf = os.path.join(tmpdir, "doc")
+        _write(pdf, b"%PDF-1.7\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+                    b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 12 >> endobj\n%%EOF")
+        assert extract_metadata(pdf)[2] == {"mime": "application/pdf", "pdf_version": "1.7", "pages": 12}
+        text = os.path.join(tmpdir, "notes")
+        _write(text, "plain text".encode())
+        assert sniff_mime(text) == "text/plain"
+
+
+def test_service_persists_results_by_size_and_mtime():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = os.path.join(tmpdir, "metadata.db")
+        wav = os.path.join(tmpdir, "tone.wav")
+        _write(wav, _wav(2))
+        service = MetadataService(MetadataStore(db), use_processes=True)
+        size, mtime_ms, _ = extract_metadata(wav)
+        assert service.get(wav, size, mtime_ms) is None
+        ready = threading.Event()
+        assert service.request([(wav, size, mtime_ms)], lambda path, fields: ready.set()) == 1
+        assert ready.wait(30)
+        service.shutdown()
+
+        reopened = MetadataService(MetadataStore(db), use_processes=False)
+        assert reopened.get(wav, size, mtime_ms)["duration"] == 2.0
+        assert reopened.get(wav, size + 1, mtime_ms) is None
+        assert reopened.peek(wav, size, mtime_ms) is not None
+        fresh = MetadataService(MetadataStore(db), use_processes=False)
+        assert fresh.peek(wav, size, mtime_ms) is None  # memory only, never the store
+        assert list(fresh.get_many([(wav, size, mtime_ms), (wav + "x", 1, 1)])) == [wav]
+        fresh.shutdown()
+        reopened.shutdown()
+
+
+def test_failed_extraction_is_retried_once_the_file_changes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        missing = os.path.join(tmpdir, "gone.bin")
+        service = MetadataService(MetadataStore(os.path.join(tmpdir, "metadata.db")), use_processes=False)
+        assert service.request([(missing, 10, 1000)]) == 1
+        deadline = time.time() + 10
+        while (missing, 10, 1000) not in service._failed and time.time() < deadline:
+            time.sleep(0.01)
+        assert service.request([(missing, 10, 1000)]) == 0
+        assert service.request([(missing, 12, 2000)]) == 1
+        service.shutdown()
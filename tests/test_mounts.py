@@ -0,0 +1,51 @@
+import os
+import tempfile
+import threading
+
+from core.mounts import MountService, parse_mountinfo
+
+MOUNTINFO = """\
+23 28 0:22 / /proc rw,relatime - proc proc rw
+25 28 0:6 / /dev rw,relatime - devtmpfs devtmpfs rw,mode=755
+28 1 254:0 / / rw,relatime - ext4 /dev/vda rw
+31 28 0:27 / /run/user/1000 rw - tmpfs tmpfs rw
+40 28 8:17 / /media/usb\\040stick rw,nosuid shared:5 - vfat /dev/sdb1 rw
+41 28 0:50 / /mnt/share rw - cifs //server/share rw
+"""
+
+
+def test_parse_mountinfo_keeps_user_volumes():
+    mounts = parse_mountinfo(MOUNTINFO)
+    assert [m.path for m in mounts] == ["/", "/media/usb stick", "/mnt/share"]
+    usb, share = mounts[1], mounts[2]
+    assert usb.label == "usb stick" and usb.is_removable and not usb.is_remote
+    assert share.is_remote and share.device == "//server/share"
+
+
+def test_usage_and_change_notification():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        info = os.path.join(tmpdir, "mountinfo")
+        with open(info, "w") as f:
+            f.write(MOUNTINFO.replace("/ / rw", f"/ {tmpdir} rw"))
+        service = MountService(mountinfo_path=info)
+        mount = next(m for m in service.list_mounts() if m.path == tmpdir)
+
+        results = {}
+        done = threading.Event()
+
+        def on_result(mount, usage):
+            results[mount.path] = usage
+            done.set()
+
+        service.probe_usage([mount], on_result)
+        assert done.wait(5)
+        assert results[tmpdir].total > 0 and service.usage(tmpdir) == results[tmpdir]
+
+        changed = threading.Event()
+        service.add_listener(lambda new_mounts: changed.set())
+        service.start_watching(interval=0.05)
+        with open(info, "a") as f:
+            f.write("42 28 8:33 / /media/backup rw - ext4 /dev/sdc1 rw\n")
+        assert changed.wait(5)
+        service.stop_watching()
+        assert "/media/backup" in [m.path for m in service.list_mounts()]
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import time
+from core.listing_cache import DirectoryListingCache
+from core.navigation import NavigationHistory
+from core.prefetch import DirectoryPrefetcher
+
+
+def _wait_idle(prefetcher, timeout=5.0):
+    deadline = time.time() + timeout
+    while prefetcher.get_stats()['pending'] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_prefetch_warms_cache_and_counts_hits():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sub = os.path.join(tmpdir, "sub")
+        other = os.path.join(tmpdir, "other")
+        os.mkdir(sub)
+        os.mkdir(other)
+        cache = DirectoryListingCache()
+        prefetcher = DirectoryPrefetcher(cache)
+        assert prefetcher.prefetch([sub]) == 1
+        _wait_idle(prefetcher)
+        assert sub in cache
+        assert prefetcher.record_access(sub)
+        assert not prefetcher.record_access(other)
+        assert prefetcher.hit_rate() == 0.5
+        prefetcher.shutdown()
+
+
+def test_prefetch_waits_for_foreground_work():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = DirectoryListingCache()
+        prefetcher = DirectoryPrefetcher(cache)
+        with prefetcher.foreground():
+            prefetcher.prefetch([tmpdir])
+            time.sleep(0.05)
+            assert tmpdir not in cache
+        _wait_idle(prefetcher)
+        assert tmpdir in cache
+        prefetcher.shutdown()
+
+
+def test_forward_paths():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dirs = [os.path.join(tmpdir, n) for n in "abc"]
+        history = NavigationHistory()
+        for d in dirs:
+            os.mkdir(d)
+            history.add_to_history(d)
+        history.go_back()
+        history.go_back()
+        assert history.get_forward_paths() == dirs[1:]
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+
+import pytest
+
+from core import query as query_module
+from core.file_index import FileIndex
+from core.query import QueryError, parse_query, run_query
+
+
+def _write(path, data, age_days=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    if age_days:
+        when = time.time() - age_days * 86400
+        os.utime(path, (when, when))
+
+
+def test_parse_query():
+    now = time.time()
+    q = parse_query('ext:log,.TXT size:>100MB modified:<7d "request timeout" Report*', now=now)
+    assert q.exts == ("log", "txt")
+    assert q.min_size == 100 * 1024 ** 2 + 1 and q.max_size is None
+    assert q.modified_after_ns == int((now - 7 * 86400) * 1e9)
+    assert q.content == ("request timeout",)
+    assert q.name_globs == ("report*",)
+    assert parse_query("size:1k..2k").max_size == 2048
+    assert parse_query("modified:>30d", now=now).modified_before_ns == int((now - 30 * 86400) * 1e9)
+    for bad in ("size:>12XB", "owner:me", "modified:=7d", 'content:""'):
+        with pytest.raises(QueryError):
+            parse_query(bad)
+
+
+def test_content_is_scanned_only_in_metadata_survivors(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "root")
+        _write(os.path.join(root, "new.log"), b"x" * 2048 + b" timeout")
+        _write(os.path.join(root, "old.log"), b"x" * 2048 + b" timeout", age_days=30)
+        _write(os.path.join(root, "tiny.log"), b"timeout")
+        _write(os.path.join(root, "sub", "big.txt"), b"x" * 4096 + b" timeout")
+        _write(os.path.join(root, "sub", "quiet.log"), b"x" * 4096)
+        reads = []
+        real = query_module.file_contains
+        monkeypatch.setattr(query_module, "file_contains", lambda path, text: reads.append(path) or real(path, text))
+
+        q = parse_query('ext:log size:>1k modified:<7d "TIMEOUT"')
+        result = run_query(q, root)
+        assert [os.path.basename(h.path) for h in result.hits] == ["new.log"]
+        assert sorted(os.path.basename(p) for p in reads) == ["new.log", "quiet.log"]
+        assert result.plan[0].startswith("crawl") and result.plan[-1].startswith("content scan")
+
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        index.build(root)
+        reads.clear()
+        indexed = run_query(q, root, index=index)
+        assert indexed.hits == result.hits
+        assert indexed.plan[0].startswith("index lookup")
+        assert indexed.stats == {'candidates': 2, 'content_reads': 2, 'matches': 1, 'skipped': 0}
+        index.close()
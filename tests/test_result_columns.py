@@ -0,0 +1,32 @@
+from core.query import SearchHit
+from core.results import UNKNOWN, ResultColumns, inverse_order
+
+
+def _columns():
+    return ResultColumns.from_hits([
+        SearchHit("/data/b/report.txt", 300, 20, 1.0),
+        SearchHit("/data/a/Zeta.log", 100, 30, 3.0),
+        SearchHit("/data/c/alpha.txt", 200, 10, 1.0),
+    ])
+
+
+def test_sort_order_is_a_permutation_per_column():
+    columns = _columns()
+    assert list(columns.sort_order("name")) == [2, 0, 1]
+    assert list(columns.sort_order("folder")) == [1, 0, 2]
+    assert list(columns.sort_order("size", descending=True)) == [0, 2, 1]
+    assert list(columns.sort_order("modified")) == [2, 0, 1]
+    # Equal scores keep their original order either way
+    assert list(columns.sort_order("score")) == [0, 2, 1]
+    assert list(columns.sort_order("score", descending=True)) == [1, 0, 2]
+    assert columns.row(1).path == "/data/a/Zeta.log"
+
+
+def test_inverse_order_maps_rows_back_to_view_positions():
+    columns = ResultColumns.from_paths(["/x/c", "/x/a", "/x/b"])
+    assert columns.row(0).size == UNKNOWN and len(columns) == 3
+    order = columns.sort_order("name")
+    inverse = inverse_order(order, len(columns))
+    assert [columns.paths[row] for row in order] == ["/x/a", "/x/b", "/x/c"]
+    assert all(order[inverse[row]] == row for row in range(len(columns)))
+    assert list(inverse_order(None, 3)) == [0, 1, 2]
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+
+from core.file_index import FileIndex
+from core.smart_folders import SavedSearch, SmartFolderManager
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_smart_folder_updates_incrementally():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "root")
+        _write(os.path.join(root, "a.log"), b"request timeout after 30s")
+        _write(os.path.join(root, "b.log"), b"all good")
+        _write(os.path.join(root, "c.txt"), b"timeout")
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        index.build(root)
+        manager = SmartFolderManager(index, os.path.join(tmpdir, "smart.json"))
+        manager.save(SavedSearch("Timeouts", root, exts=("log",), content="TIMEOUT"))
+        changed = []
+        manager.add_listener(changed.append)
+
+        assert manager.is_indexed("Timeouts")
+        assert [f.name for f in manager.results("Timeouts")] == ["a.log"]
+
+        time.sleep(0.01)
+        _write(os.path.join(root, "b.log"), b"now a timeout too")
+        os.remove(os.path.join(root, "a.log"))
+        index.update_directory(root)
+        assert changed == ["Timeouts"]
+        assert [f.name for f in manager.results("Timeouts")] == ["b.log"]
+
+        # Saved searches survive a restart
+        reloaded = SmartFolderManager(index, os.path.join(tmpdir, "smart.json"))
+        assert reloaded.searches() == manager.searches()
+        manager.close()
+        reloaded.close()
+        index.close()
+
+
+def test_size_and_age_predicates():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "root")
+        _write(os.path.join(root, "big.bin"), b"x" * 4096)
+        _write(os.path.join(root, "small.bin"), b"x" * 10)
+        _write(os.path.join(root, "old.bin"), b"x" * 4096)
+        week_ago = time.time() - 8 * 86400
+        os.utime(os.path.join(root, "old.bin"), (week_ago, week_ago))
+        index = FileIndex(os.path.join(tmpdir, "index.db"))
+        index.build(root)
+        manager = SmartFolderManager(index, os.path.join(tmpdir, "smart.json"))
+        manager.save(SavedSearch("Recent big", root, min_size=1024, modified_within_days=7))
+        assert [f.name for f in manager.results("Recent big")] == ["big.bin"]
+        manager.save(SavedSearch("Outside", tmpdir, name_glob="*.BIN"))
+        assert not manager.is_indexed("Outside")
+        manager.close()
+        index.close()
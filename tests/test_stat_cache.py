@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from core.stat_cache import StatCache
+
+
+def test_repeated_questions_cost_one_syscall():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = StatCache(ttl=60)
+        assert cache.exists(tmpdir) and cache.isdir(tmpdir) and not cache.isfile(tmpdir)
+        assert cache.stat(tmpdir).st_mode == os.stat(tmpdir).st_mode
+        assert cache.get_stats()['syscalls'] == 1
+        assert cache.get_stats()['saved'] == 3
+        missing = os.path.join(tmpdir, "missing")
+        assert not cache.exists(missing) and not cache.exists(missing)
+        assert cache.get_stats()['syscalls'] == 2
+
+
+def test_stat_many_and_invalidation():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = StatCache(ttl=60)
+        paths = [os.path.join(tmpdir, f"f{i}") for i in range(5)]
+        for path in paths[:3]:
+            open(path, "w").close()
+        found = cache.stat_many(paths)
+        assert [found[p] is not None for p in paths] == [True, True, True, False, False]
+        open(paths[3], "w").close()
+        assert not cache.exists(paths[3])
+        cache.invalidate(tmpdir)
+        assert cache.exists(paths[3])
+
+
+def test_entries_expire():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = StatCache(ttl=0)
+        path = os.path.join(tmpdir, "late")
+        assert not cache.exists(path)
+        open(path, "w").close()
+        assert cache.exists(path)
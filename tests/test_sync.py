@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+from core.hash_cache import HashCache
+from core.sync import FolderSync
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_sync_copies_only_changes_and_deletes_extras():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "src")
+        dst = os.path.join(tmpdir, "dst")
+        _write(os.path.join(src, "a.txt"), b"alpha")
+        _write(os.path.join(src, "sub", "b.txt"), b"bravo")
+        _write(os.path.join(src, "sub", "deep", "c.txt"), b"charlie")
+
+        first = FolderSync(src, dst).run()
+        assert (first.copied, first.skipped, first.errors) == (3, 0, [])
+        assert first.bytes_transferred == 17
+
+        _write(os.path.join(src, "a.txt"), b"alpha2")
+        _write(os.path.join(dst, "extra.txt"), b"junk")
+        _write(os.path.join(dst, "old", "gone.txt"), b"junk")
+        second = FolderSync(src, dst, delete_extras=True).run()
+        assert (second.updated, second.skipped, second.deleted) == (1, 2, 2)
+        assert second.bytes_transferred == 6 and second.bytes_skipped == 12
+        assert not os.path.exists(os.path.join(dst, "old"))
+        with open(os.path.join(dst, "a.txt"), "rb") as f:
+            assert f.read() == b"alpha2"
+
+
+def test_hash_mode_skips_touched_but_identical_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "src")
+        dst = os.path.join(tmpdir, "dst")
+        _write(os.path.join(src, "same.bin"), b"x" * 100)
+        _write(os.path.join(src, "diff.bin"), b"y" * 100)
+        FolderSync(src, dst).run()
+        _write(os.path.join(dst, "diff.bin"), b"z" * 100)
+        for name in ("same.bin", "diff.bin"):
+            os.utime(os.path.join(dst, name), ns=(0, 10**9))
+
+        preview = FolderSync(src, dst, use_hash=True, hash_cache=HashCache()).run(dry_run=True)
+        assert (preview.updated, preview.skipped) == (1, 1)
+        with open(os.path.join(dst, "diff.bin"), "rb") as f:
+            assert f.read() == b"z" * 100
+
+
+def test_file_and_folder_with_the_same_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "src")
+        dst = os.path.join(tmpdir, "dst")
+        _write(os.path.join(src, "was_dir"), b"now a file")
+        _write(os.path.join(src, "was_file", "inner.txt"), b"now a folder")
+        _write(os.path.join(dst, "was_dir", "old.txt"), b"old")
+        _write(os.path.join(dst, "was_file"), b"old")
+
+        # Without deletions nothing of the destination is destroyed; both paths are reported
+        kept = FolderSync(src, dst).run()
+        assert kept.conflicts == 2 and len(kept.errors) == 2 and kept.copied == 0
+        assert os.path.isfile(os.path.join(dst, "was_dir", "old.txt"))
+
+        mirrored = FolderSync(src, dst, delete_extras=True).run()
+        assert mirrored.errors == [] and mirrored.copied == 2 and mirrored.deleted == 2
+        with open(os.path.join(dst, "was_dir"), "rb") as f:
+            assert f.read() == b"now a file"
+        with open(os.path.join(dst, "was_file", "inner.txt"), "rb") as f:
+            assert f.read() == b"now a folder"
+        assert {a.kind for a in FolderSync(src, dst, delete_extras=True).compare()} == {'skip'}
@@ -0,0 +1,38 @@
+import json
+import os
+import tempfile
+
+from core.tracing import Tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("navigate", path="/tmp") as span:
+        span.set(rows=3)
+    tracer.record("model_load", 0, 1000)
+    assert tracer.get_stats() == {} and tracer.event_count() == 0
+
+
+def test_spans_feed_histograms_and_chrome_trace():
+    tracer = Tracer(enabled=True)
+    for duration_us in (100, 200, 300, 5000):
+        tracer.record("search", 1_000_000, 1_000_000 + duration_us * 1000)
+    try:
+        with tracer.span("copy", src="a"):
+            raise OSError("disk full")
+    except OSError:
+        pass
+
+    stats = tracer.get_stats()
+    assert stats["search"]["count"] == 4
+    assert stats["search"]["max_ms"] == 5.0
+    assert 0.2 <= stats["search"]["p50_ms"] <= 0.512
+    assert stats["copy"]["count"] == 1
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "trace.json")
+        assert tracer.export_chrome_trace(path) == 5
+        with open(path) as f:
+            events = [e for e in json.load(f)["traceEvents"] if e["ph"] == "X"]
+    assert {e["name"] for e in events} == {"search", "copy"}
+    assert next(e for e in events if e["name"] == "copy")["args"] == {"src": "a", "error": "OSError"}
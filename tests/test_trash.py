@@ -0,0 +1,94 @@
+import os
+import tempfile
+import time
+import pytest
+from core.trash import TrashStore
+
+
+def _write(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_trash_and_restore_roundtrip():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = TrashStore(base_dir=os.path.join(tmpdir, "app"))
+        path = os.path.join(tmpdir, "docs", "note.txt")
+        _write(path, b"hello")
+        item = store.trash(path)
+        assert not os.path.exists(path)
+        assert [i.item_id for i in store.list_items()] == [item.item_id]
+        assert store.find_by_original(path)[0].size == 5
+        _write(path, b"new")
+        with pytest.raises(FileExistsError):
+            store.restore(item.item_id)
+        os.remove(path)
+        assert store.restore(item.item_id) == path
+        with open(path, "rb") as f:
+            assert f.read() == b"hello"
+        assert store.list_items() == []
+        store.close()
+
+
+def test_purge_by_age_and_budget():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = TrashStore(base_dir=os.path.join(tmpdir, "app"))
+        folder = os.path.join(tmpdir, "folder")
+        _write(os.path.join(folder, "a.bin"), b"x" * 100)
+        _write(os.path.join(folder, "b.bin"), b"x" * 50)
+        old = store.trash(folder)
+        assert old.size == -1
+        time.sleep(0.01)
+        small = os.path.join(tmpdir, "small.bin")
+        _write(small, b"x" * 10)
+        store.trash(small)
+        assert store.purge_to_budget(100) == 1
+        assert store.get_item(old.item_id) is None
+        assert not os.path.exists(old.trash_path)
+        assert store.purge_older_than(0) == 1
+        assert store.list_items() == []
+        store.close()
+
+
+def test_purge_keeps_items_it_could_not_delete(monkeypatch):
+    from core import trash as trash_module
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = TrashStore(base_dir=os.path.join(tmpdir, "app"))
+        folder = os.path.join(tmpdir, "folder")
+        _write(os.path.join(folder, "a.bin"), b"x")
+        item = store.trash(folder)
+        # rmtree(ignore_errors=True) that leaves everything in place, as with a locked file
+        monkeypatch.setattr(trash_module.shutil, "rmtree", lambda path, ignore_errors=False: None)
+        assert store.purge(item.item_id) is False
+        assert store.empty() == 0
+        assert store.get_item(item.item_id) is not None
+        monkeypatch.undo()
+        assert store.purge(item.item_id) is True
+        assert store.list_items() == [] and not os.path.exists(item.trash_path)
+        store.close()
+
+
+def test_only_cross_volume_renames_fall_back_to_copying(monkeypatch):
+    import errno
+    from core import trash as trash_module
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = TrashStore(base_dir=os.path.join(tmpdir, "app"))
+        path = os.path.join(tmpdir, "locked.txt")
+        _write(path, b"in use")
+        real_rename = os.rename
+
+        def failing_rename(code):
+            def rename(src, dst):
+                raise OSError(code, os.strerror(code), src)
+            return rename
+        monkeypatch.setattr(trash_module.os, "rename", failing_rename(errno.EACCES))
+        with pytest.raises(PermissionError):
+            store.trash(path)
+        assert os.path.exists(path) and os.listdir(store.home_trash) == []
+
+        monkeypatch.setattr(trash_module.os, "rename", failing_rename(errno.EXDEV))
+        item = store.trash(path)
+        monkeypatch.setattr(trash_module.os, "rename", real_rename)
+        assert not os.path.exists(path) and os.path.exists(item.trash_path)
+        store.close()
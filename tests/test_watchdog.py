@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from core.watchdog import EventLoopWatchdog
+
+
+def _slow_handler():
+    time.sleep(0.4)
+
+
+def test_stall_is_logged_with_blocking_function():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_path = os.path.join(tmpdir, "stalls.log")
+        reported = threading.Event()
+        watchdog = EventLoopWatchdog(threshold=0.1, interval=0.02, log_path=log_path,
+                                     on_stall=lambda stall: reported.set())
+        watchdog.start()
+        try:
+            watchdog.beat()
+            _slow_handler()
+            watchdog.beat()
+            assert reported.wait(2)
+        finally:
+            watchdog.stop()
+
+        stall = watchdog.recent[-1]
+        assert stall.function.startswith("_slow_handler")
+        assert 0.35 < stall.duration < 1.0
+        with open(log_path) as f:
+            record = json.loads(f.readline())
+        assert record['function'] == stall.function
+        assert any("_slow_handler" in line for line in record['stack'])
+
+
+def test_beats_on_time_are_not_stalls():
+    watchdog = EventLoopWatchdog(threshold=0.1, interval=0.01, log_path="")
+    watchdog.start()
+    try:
+        for _ in range(20):
+            watchdog.beat()
+            time.sleep(0.01)
+    finally:
+        watchdog.stop()
+    summary = watchdog.latency_summary()
+    assert summary['stalls'] == 0
+    assert summary['count'] == 19